@@ -0,0 +1,154 @@
+"""
+Micro-benchmarks for the alert cycle's hot paths
+
+Timings only compare on the same machine, so baselines are not committed.
+Save one before a change and compare against it afterwards; the second run
+fails when a median regresses by more than the given tolerance:
+
+    pytest benchmarks/bench_hot_paths.py --benchmark-save=baseline
+    pytest benchmarks/bench_hot_paths.py --benchmark-compare --benchmark-compare-fail=median:25%
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from api_alert_system.core.models import AlertEvent, Quote, render_alert_events
+from api_alert_system.core.stock_monitor import StockMonitor
+from api_alert_system.notifications.base import BaseNotifier
+from api_alert_system.notifications.ntfy import NTFYNotifier
+from api_alert_system.notifications.telegram import TelegramNotifier
+from api_alert_system.notifications.webhook import WebhookNotifier
+from api_alert_system.providers.synthetic import SyntheticProvider, make_tickers
+
+from .support import SQLiteDatabaseManager
+
+SIZES = [10, 1000, 10000]
+TIMESTAMP = datetime(2025, 1, 6, 15, 0, 0)
+
+
+def make_market(size: int):
+    """Create a watchlist and prices where roughly a third of the tickers breach a threshold"""
+    rng = np.random.default_rng(size)
+    tickers = make_tickers(size)
+    base = 10 ** rng.uniform(0, 3, size)
+    prices = dict(zip(tickers, (base * rng.uniform(0.9, 1.1, size)).tolist()))
+    watchlist = {
+        ticker: {"upper": round(price * 1.05, 4), "lower": round(price * 0.95, 4)}
+        for ticker, price in zip(tickers, base.tolist())
+    }
+    return watchlist, prices
+
+
+def make_monitor() -> StockMonitor:
+    return StockMonitor(provider=SyntheticProvider(seed=0))
+
+
+class DiscardingNotifier(BaseNotifier):
+    """Has Telegram's capabilities but drops the prepared message instead of sending it"""
+
+    name = "discarding"
+    supports_markdown = True
+    max_message_length = 4096
+
+    def send_message(self, message: str) -> bool:
+        return bool(message)
+
+
+def make_events(size: int):
+    watchlist, prices = make_market(size)
+    events = make_monitor().build_alert_events(watchlist, prices, TIMESTAMP)
+    return events
+
+
+@pytest.fixture
+def database():
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    db_manager.init_tables()
+    yield db_manager
+    db_manager.disconnect()
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_check_all_thresholds(benchmark, size):
+    watchlist, prices = make_market(size)
+    monitor = make_monitor()
+    alerts = benchmark(monitor.check_all_thresholds, watchlist, prices)
+    assert alerts
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_format_price_message(benchmark, size):
+    _, prices = make_market(size)
+    monitor = make_monitor()
+    message = benchmark(monitor.format_price_message, prices, TIMESTAMP)
+    assert message.count("\n") >= size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_deliver_events(benchmark, size):
+    events = make_events(size)
+    notifier = DiscardingNotifier()
+
+    def deliver():
+        # Render fresh events each round so the per-event render cache doesn't hide the cost
+        fresh = [AlertEvent(Quote(e.ticker, e.price, e.timestamp), e.alert_type, e.threshold) for e in events]
+        return notifier.deliver_events(fresh)
+
+    assert benchmark(deliver)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_insert_price_per_row(benchmark, database, size):
+    _, prices = make_market(size)
+
+    def insert_each():
+        for ticker, price in prices.items():
+            database.insert_price(ticker, price, TIMESTAMP)
+
+    benchmark(insert_each)
+    assert database.count("price_history") >= size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_insert_prices_bulk(benchmark, database, size):
+    _, prices = make_market(size)
+    rows = [(ticker, price, TIMESTAMP) for ticker, price in prices.items()]
+    assert benchmark(database.insert_prices, rows)
+    assert database.count("price_history") >= size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_telegram_alert_payload(benchmark, size):
+    events = make_events(size)
+    notifier = TelegramNotifier("bench-token", "1")
+
+    def build():
+        # Render fresh events each round so the per-event render cache doesn't hide the cost
+        fresh = [AlertEvent(Quote(e.ticker, e.price, e.timestamp), e.alert_type, e.threshold) for e in events]
+        return notifier.prepare_message(render_alert_events(fresh, markdown=True, timestamp=TIMESTAMP))
+
+    assert benchmark(build)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_ntfy_alert_payload(benchmark, size):
+    events = make_events(size)
+    notifier = NTFYNotifier("bench")
+
+    def build():
+        fresh = [AlertEvent(Quote(e.ticker, e.price, e.timestamp), e.alert_type, e.threshold) for e in events]
+        return notifier.prepare_message(render_alert_events(fresh, markdown=False, timestamp=TIMESTAMP))
+
+    assert benchmark(build)
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_webhook_payload(benchmark, size):
+    events = [event.to_dict() for event in make_events(size)]
+    notifier = WebhookNotifier(["http://127.0.0.1:9/hook"], secret="bench-secret")
+    body, headers = benchmark(notifier.build_request, events)
+    assert body and "X-Signature-256" in headers
+    notifier.close()
@@ -0,0 +1,168 @@
+"""
+End-to-end tick-to-notification latency benchmark
+
+Runs AlertBot check cycles against a seeded synthetic market, a SQLite
+stand-in (or the configured Postgres) database and local stub Telegram and
+ntfy servers, for growing watchlist sizes. For each size it reports cycle
+duration, throughput and the latency from the moment a batch of quotes is
+fetched to the moment its alert reaches each notification endpoint.
+
+Usage:
+    python -m benchmarks.e2e_latency
+    python -m benchmarks.e2e_latency --sizes 10 1000 50000 --cycles 20 --output results.json
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, List, Optional
+from urllib.parse import unquote_plus
+
+import numpy as np
+
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.database import DatabaseManager
+from api_alert_system.core.models import Quote
+from api_alert_system.notifications.ntfy import NTFYNotifier
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.notifications.telegram import TelegramNotifier
+from api_alert_system.providers.base import QuoteProvider
+from api_alert_system.providers.synthetic import SyntheticProvider, make_tickers
+from api_alert_system.utils import config
+
+from .support import SQLiteDatabaseManager, StubHTTPServer, summarize, write_results
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 50000]
+
+
+class TimedProvider(QuoteProvider):
+    """Wraps a provider and records when the latest batch of quotes was fetched"""
+
+    def __init__(self, provider: QuoteProvider):
+        self.provider = provider
+        self.name = provider.name
+        self.fetched_at: Optional[float] = None
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        return self.get_quotes([ticker])[ticker]
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        quotes = self.provider.get_quotes(tickers)
+        self.fetched_at = time.perf_counter()
+        return quotes
+
+
+def build_market(size: int, band: float, seed: int):
+    """Create base prices and a watchlist with thresholds `band` either side of them"""
+    rng = np.random.default_rng(seed)
+    tickers = make_tickers(size)
+    base_prices = dict(zip(tickers, (10 ** rng.uniform(0, 3, size)).tolist()))
+    watchlist = {
+        ticker: {"upper": round(price * (1 + band), 4), "lower": round(price * (1 - band), 4)}
+        for ticker, price in base_prices.items()
+    }
+    return base_prices, watchlist
+
+
+def create_database(kind: str) -> DatabaseManager:
+    """Create the benchmark database: an in-memory SQLite stand-in or the configured Postgres"""
+    if kind == "postgres":
+        return DatabaseManager(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DB,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    return db_manager
+
+
+def is_alert(body: bytes) -> bool:
+    """Whether a recorded notification request carries an alert rather than a price update"""
+    return "Price Alert" in unquote_plus(body.decode("utf-8", errors="replace"))
+
+
+def run_size(size: int, cycles: int, band: float, seed: int, database: str,
+             telegram: StubHTTPServer, ntfy: StubHTTPServer) -> Dict:
+    """Benchmark AlertBot check cycles for one watchlist size"""
+    base_prices, watchlist = build_market(size, band, seed)
+    provider = TimedProvider(SyntheticProvider(base_prices, seed=seed))
+    notifiers = NotifierRegistry([
+        TelegramNotifier("bench-token", "1", api_url=telegram.url),
+        NTFYNotifier("bench", server=ntfy.url),
+    ])
+    bot = AlertBot(watchlist=watchlist, db_manager=create_database(database), provider=provider, notifiers=notifiers)
+
+    # Warm up connections and caches
+    bot.check_prices_and_send_alerts()
+    telegram.take_requests()
+    ntfy.take_requests()
+
+    cycle_seconds = []
+    latencies_ms = []
+    alert_messages = 0
+    for _ in range(cycles):
+        started = time.perf_counter()
+        bot.check_prices_and_send_alerts()
+        cycle_seconds.append(time.perf_counter() - started)
+
+        for arrived, _, body in telegram.take_requests() + ntfy.take_requests():
+            if is_alert(body):
+                alert_messages += 1
+                latencies_ms.append((arrived - provider.fetched_at) * 1000)
+
+    bot.notifiers.close()
+    bot.db_manager.disconnect()
+
+    cycle = summarize(cycle_seconds)
+    return {
+        "watchlist_size": size,
+        "cycles": cycles,
+        "cycle_seconds": cycle,
+        "tick_to_alert_ms": summarize(latencies_ms),
+        "alert_messages": alert_messages,
+        "throughput_tickers_per_second": size / cycle["mean"],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the end-to-end latency benchmark"""
+    parser = argparse.ArgumentParser(description="End-to-end tick-to-notification latency benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Watchlist sizes to run")
+    parser.add_argument("--cycles", type=int, default=10, help="Measured check cycles per size")
+    parser.add_argument("--band", type=float, default=0.02, help="Threshold distance from the base price")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--output", default="benchmarks/results/e2e_latency.json")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args(argv)
+
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    telegram = StubHTTPServer()
+    ntfy = StubHTTPServer()
+    results = []
+    try:
+        for size in args.sizes:
+            result = run_size(size, args.cycles, args.band, args.seed, args.database, telegram, ntfy)
+            results.append(result)
+            latency = result["tick_to_alert_ms"]
+            print(
+                f"{size:>7} tickers | cycle p50 {result['cycle_seconds']['p50'] * 1000:9.1f} ms"
+                f" p99 {result['cycle_seconds']['p99'] * 1000:9.1f} ms"
+                f" | tick→alert p50 {latency.get('p50', float('nan')):8.1f} ms"
+                f" p99 {latency.get('p99', float('nan')):8.1f} ms"
+                f" | {result['throughput_tickers_per_second']:10.0f} tickers/s"
+            )
+    finally:
+        telegram.close()
+        ntfy.close()
+
+    write_results(args.output, "e2e_latency", results, database=args.database, seed=args.seed, band=args.band)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Startup-time benchmark for the command-line and MCP entry points
+
+Each entry point module is imported in a fresh interpreter, repeatedly, and
+the benchmark reports the import time (the delay before `main` can run),
+the whole process wall time and which heavy dependencies the import loaded.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 20 --entry-points alert-bot mcp-stdio
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .support import summarize, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Entry point name -> module imported before its main() runs
+ENTRY_POINTS = {
+    "alert-bot": "api_alert_system.core.alert_bot",
+    "setup-db": "scripts.setup_db",
+    "inspect-db": "scripts.inspect_db",
+    "mcp-stdio": "stock_alert_mcp_server",
+}
+
+HEAVY_MODULES = ["numpy", "pandas", "yfinance", "requests", "psycopg2", "fastmcp", "asyncio"]
+
+PROBE = """
+import importlib, json, sys, time
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+print(json.dumps({"import_seconds": elapsed, "loaded": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def measure_import(module: str) -> Dict:
+    """Import a module in a fresh interpreter and time it"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(REPO_ROOT, "src"), REPO_ROOT, env.get("PYTHONPATH")]))
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, module, *HEAVY_MODULES],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {completed.stderr.strip().splitlines()[-1:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["wall_seconds"] = wall
+    return result
+
+
+def run_entry_point(name: str, runs: int) -> Dict:
+    """Benchmark one entry point"""
+    module = ENTRY_POINTS[name]
+    samples = [measure_import(module) for _ in range(runs)]
+    return {
+        "entry_point": name,
+        "module": module,
+        "import_ms": summarize([sample["import_seconds"] * 1000 for sample in samples]),
+        "wall_ms": summarize([sample["wall_seconds"] * 1000 for sample in samples]),
+        "loaded": samples[-1]["loaded"],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the startup benchmark"""
+    parser = argparse.ArgumentParser(description="Startup time of the entry points")
+    parser.add_argument("--entry-points", nargs="+", choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per entry point")
+    parser.add_argument("--output", default="benchmarks/results/startup.json")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.entry_points:
+        try:
+            result = run_entry_point(name, args.runs)
+        except RuntimeError as e:
+            print(f"{name:>11} | skipped: {e}")
+            continue
+        results.append(result)
+        print(
+            f"{name:>11} | import p50 {result['import_ms']['p50']:7.1f} ms"
+            f" | process p50 {result['wall_ms']['p50']:7.1f} ms"
+            f" | loads {', '.join(result['loaded']) or '-'}"
+        )
+
+    write_results(args.output, "startup", results, runs=args.runs)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
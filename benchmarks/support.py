@@ -0,0 +1,182 @@
+"""
+Shared benchmark fixtures: SQLite database stand-in, stub HTTP servers and result output
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from api_alert_system.core.database import DatabaseManager
+
+
+class _SQLiteCursor:
+    """Cursor adapter that accepts the psycopg2-style %s placeholders DatabaseManager uses"""
+
+    def __init__(self, cursor: sqlite3.Cursor):
+        self.cursor = cursor
+
+    @staticmethod
+    def _adapt(params):
+        return tuple(value.isoformat(sep=" ") if isinstance(value, datetime) else value for value in params)
+
+    def execute(self, query: str, params: Sequence = ()):
+        return self.cursor.execute(query.replace("%s", "?"), self._adapt(params))
+
+    def executemany(self, query: str, rows):
+        return self.cursor.executemany(query.replace("%s", "?"), (self._adapt(row) for row in rows))
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def close(self):
+        self.cursor.close()
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """DatabaseManager backed by SQLite, standing in for Postgres in benchmarks"""
+
+    def __init__(self, path: str = ":memory:"):
+        """Initialize the SQLite database manager"""
+        super().__init__(host="", port="", database=path, user="", password="")
+        self.path = path
+
+    def connect(self):
+        """Open the SQLite database"""
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.cursor = _SQLiteCursor(self.connection.cursor())
+        return True
+
+    def init_tables(self):
+        """Create the price, alert, watchlist and subscription tables"""
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS price_history (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker      TEXT NOT NULL,
+                fetched_at  TIMESTAMP NOT NULL,
+                price       REAL NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS alert_history (
+                id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker      TEXT NOT NULL,
+                alert_type  TEXT NOT NULL,
+                price       REAL NOT NULL,
+                threshold   REAL NOT NULL,
+                sent_at     TIMESTAMP NOT NULL
+            )
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS price_history_ticker_time_idx ON price_history (ticker, fetched_at)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS alert_history_time_idx ON alert_history (sent_at)")
+        self.init_watchlist_tables()
+        self.init_subscription_tables()
+        self.connection.commit()
+        return True
+
+    def _insert_many(self, query: str, rows) -> None:
+        """Insert many rows with executemany, SQLite's equivalent of execute_values"""
+        placeholders = ", ".join(["%s"] * len(rows[0]))
+        self.cursor.executemany(query.replace("VALUES %s", f"VALUES ({placeholders})"), rows)
+
+    def count(self, table: str) -> int:
+        """Count the rows in a table"""
+        self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        return self.cursor.fetchone()[0]
+
+
+class StubHTTPServer:
+    """Local HTTP server that accepts any POST and records when it arrived
+
+    Stands in for the Telegram Bot API and ntfy. Each request is recorded as
+    (perf_counter arrival time, path, body) so latency can be measured against
+    timestamps taken in the same process.
+    """
+
+    def __init__(self, response: bytes = b'{"ok": true}'):
+        """Initialize and start the stub server on a free local port"""
+        self.requests: List[tuple] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                arrived = time.perf_counter()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with stub._lock:
+                    stub.requests.append((arrived, self.path, body))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def take_requests(self) -> List[tuple]:
+        """Return and clear the recorded requests"""
+        with self._lock:
+            taken, self.requests = self.requests, []
+        return taken
+
+    def close(self) -> None:
+        """Stop the stub server"""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Summarize samples as count, mean, p50, p99 and max"""
+    if len(values) == 0:
+        return {"count": 0}
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        "count": int(array.size),
+        "mean": float(array.mean()),
+        "p50": float(np.percentile(array, 50)),
+        "p99": float(np.percentile(array, 99)),
+        "max": float(array.max()),
+    }
+
+
+def environment() -> Dict[str, str]:
+    """Describe where the benchmark ran, for comparing results"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, benchmark: str, results, **extra) -> None:
+    """Write benchmark results as JSON"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"benchmark": benchmark, "environment": environment(), **extra, "results": results}, f, indent=2)
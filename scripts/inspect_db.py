@@ -89,5 +89,9 @@ def inspect_database():
     except FileNotFoundError:
         print("❌ Database file 'alerts.db' not found. Run the alert system first.")
 
+def main():
+    """Entry point for the inspect-db command"""
+    inspect_database()
+
 if __name__ == "__main__":
-    inspect_database() 
\ No newline at end of file
+    main()
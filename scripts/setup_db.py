@@ -6,9 +6,10 @@ This script creates the database and tables if they don't exist.
 
 import psycopg2
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-import config
 import sys
 
+from api_alert_system.utils import config
+
 def create_database():
     """Create the database if it doesn't exist"""
     try:
@@ -74,6 +75,52 @@ def create_tables():
                 sent_at     TIMESTAMP NOT NULL
             )
         """)
+        cur.execute("CREATE INDEX IF NOT EXISTS price_history_ticker_time_idx ON price_history (ticker, fetched_at)")
+        cur.execute("CREATE INDEX IF NOT EXISTS alert_history_time_idx ON alert_history (sent_at)")
+        
+        # Create the watchlist table and its version counter
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS watchlist (
+                ticker      VARCHAR(10) PRIMARY KEY,
+                settings    TEXT NOT NULL,
+                version     BIGINT NOT NULL,
+                deleted     BOOLEAN NOT NULL DEFAULT FALSE,
+                updated_at  TIMESTAMP NOT NULL
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS watchlist_version_idx ON watchlist (version)")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS watchlist_version (
+                id          INTEGER PRIMARY KEY,
+                version     BIGINT NOT NULL
+            )
+        """)
+        cur.execute("INSERT INTO watchlist_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+        
+        # Create the per-user subscription tables
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS subscribers (
+                user_id     VARCHAR(64) PRIMARY KEY,
+                channels    TEXT NOT NULL
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                user_id          VARCHAR(64) NOT NULL,
+                ticker           VARCHAR(10) NOT NULL,
+                upper_threshold  DECIMAL(10,2),
+                lower_threshold  DECIMAL(10,2),
+                PRIMARY KEY (user_id, ticker)
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS subscriptions_ticker_idx ON subscriptions (ticker)")
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS subscriptions_version (
+                id          INTEGER PRIMARY KEY,
+                version     BIGINT NOT NULL
+            )
+        """)
+        cur.execute("INSERT INTO subscriptions_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
         
         conn.commit()
         print("✅ Tables created successfully!")
@@ -85,7 +132,8 @@ def create_tables():
         print(f"❌ Error creating tables: {e}")
         sys.exit(1)
 
-if __name__ == "__main__":
+def main():
+    """Entry point for the setup-db command"""
     print("🚀 Setting up PostgreSQL database for Stock Alert System...")
     print("=" * 60)
     
@@ -93,4 +141,8 @@ if __name__ == "__main__":
     create_tables()
     
     print("\n✅ Database setup completed successfully!")
-    print("You can now run the alert bot with: python alert_bot.py") 
\ No newline at end of file
+    print("You can now run the alert bot with: uv run alert-bot")
+
+if __name__ == "__main__":
+    main()
+ 
\ No newline at end of file
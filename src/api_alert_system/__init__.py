@@ -5,8 +5,10 @@ API Alert System - Stock Price Monitoring with Telegram Notifications and MCP In
 __version__ = "0.1.0"
 __author__ = "API Alert System Team"
 
-from .core.alert_bot import AlertBot
 from .utils.config import *
+from .utils.lazy import make_lazy_getattr
+
+_LAZY_IMPORTS = {"AlertBot": ".core.alert_bot"}
 
 __all__ = [
     "AlertBot",
@@ -26,4 +28,72 @@ __all__ = [
     "POSTGRES_DB",
     "POSTGRES_USER",
     "POSTGRES_PASSWORD",
-] 
\ No newline at end of file
+    "PRICE_UPDATE_MODE",
+    "PRICE_DELTA_TICK",
+    "PRICE_DELTA_PERCENT",
+    "FULL_SNAPSHOT_INTERVAL",
+    "NOTIFIERS",
+    "NOTIFIER_MAX_WORKERS",
+    "WEBHOOK_URLS",
+    "WEBHOOK_SECRET",
+    "WEBHOOK_BATCH_SIZE",
+    "WEBHOOK_GZIP",
+    "MARKET_HOURS_AWARE",
+    "OFF_HOURS_INTERVAL",
+    "PRIORITY_INTERVALS",
+    "ADAPTIVE_POLLING",
+    "ADAPTIVE_MIN_INTERVAL",
+    "ADAPTIVE_MAX_INTERVAL",
+    "ADAPTIVE_SAFETY_FACTOR",
+    "QUOTE_PROVIDER",
+    "REPLAY_SOURCE",
+    "REPLAY_SPEEDUP",
+    "INGESTION_MODE",
+    "FEED_HOST",
+    "FEED_PORT",
+    "STREAM_QUEUE_SIZE",
+    "YFINANCE_LIGHTWEIGHT_QUOTES",
+    "BAR_CACHE_DIR",
+    "BAR_CACHE_RETENTION_DAYS",
+    "CIRCUIT_BREAKER_ENABLED",
+    "CIRCUIT_FAILURE_THRESHOLD",
+    "CIRCUIT_BASE_BACKOFF",
+    "CIRCUIT_MAX_BACKOFF",
+    "SYNTHETIC_SEED",
+    "SYNTHETIC_VOLATILITY",
+    "SYNTHETIC_CORRELATION",
+    "SYNTHETIC_JUMP_INTENSITY",
+    "SYNTHETIC_STEP_DAYS",
+    "TELEGRAM_API_URL",
+    "METRICS_SINK",
+    "METRICS_REPORT_INTERVAL",
+    "STATUS_SERVER_ENABLED",
+    "STATUS_HOST",
+    "STATUS_PORT",
+    "HEALTH_MAX_CYCLE_AGE",
+    "PROFILE_ENABLED",
+    "PROFILE_EVERY_N",
+    "PROFILE_SLOW_CYCLE_SECONDS",
+    "PROFILE_SAMPLE_INTERVAL",
+    "PROFILE_MAX_FILES",
+    "PROFILE_DIR",
+    "TRACE_EXPORTER",
+    "TRACE_FILE",
+    "MCP_FAST_START",
+    "WATCHLIST_SOURCE",
+    "WATCHLIST_SYNC_INTERVAL",
+    "SUBSCRIPTIONS_ENABLED",
+    "SHARDING_ENABLED",
+    "SHARD_PARTITIONS",
+    "SHARD_LEASE_SECONDS",
+    "SHARD_HEARTBEAT_INTERVAL",
+    "WORKER_ID",
+    "HA_MODE",
+    "LEADER_LEASE_SECONDS",
+    "LEADER_HEARTBEAT_INTERVAL",
+    "RESUME_LOOKBACK_HOURS",
+]
+
+
+# AlertBot is imported on first use so `import api_alert_system` stays cheap
+__getattr__ = make_lazy_getattr(__name__, _LAZY_IMPORTS)
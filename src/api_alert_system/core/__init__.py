@@ -2,8 +2,18 @@
 Core components of the API Alert System
 """
 
-from .alert_bot import AlertBot
-from .database import DatabaseManager
-from .stock_monitor import StockMonitor
+from ..utils.lazy import make_lazy_getattr
 
-__all__ = ["AlertBot", "DatabaseManager", "StockMonitor"] 
\ No newline at end of file
+from .models import AlertEvent, Quote
+
+_LAZY_IMPORTS = {
+    "AlertBot": ".alert_bot",
+    "DatabaseManager": ".database",
+    "StockMonitor": ".stock_monitor",
+}
+
+__all__ = ["AlertBot", "DatabaseManager", "StockMonitor", "AlertEvent", "Quote"]
+
+
+# The bot and database modules pull in providers, notifiers and psycopg2; import them on first use
+__getattr__ = make_lazy_getattr(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,47 @@
+"""
+Proximity-driven adaptive poll intervals
+"""
+
+import math
+from typing import Dict, Optional
+
+
+def threshold_distance(price: float, thresholds: Dict) -> Optional[float]:
+    """Log distance from a price to its nearest threshold, 0 if already beyond one
+
+    Returns None when the ticker has no thresholds.
+    """
+    distances = []
+    upper = thresholds.get("upper")
+    lower = thresholds.get("lower")
+
+    if upper:
+        distances.append(max(0.0, math.log(upper / price)))
+    if lower:
+        distances.append(max(0.0, math.log(price / lower)))
+
+    return min(distances) if distances else None
+
+
+def adaptive_interval(price: float, thresholds: Dict, volatility: Optional[float], base_interval: float,
+                      min_interval: float, max_interval: float, safety_factor: float = 3.0) -> float:
+    """Compute the next poll interval for a ticker from its distance to a threshold
+
+    `volatility` is the per-second standard deviation of log returns. Treating
+    the price as a random walk, a move of `safety_factor` standard deviations
+    takes `(distance / (safety_factor * volatility)) ** 2` seconds to cover the
+    distance to the nearest threshold, so polling at that interval keeps the
+    chance of a crossing going unnoticed small. Tickers already beyond a
+    threshold, or without enough history, keep `base_interval` so alerts are not
+    repeated faster than normal.
+    """
+    distance = threshold_distance(price, thresholds)
+    if distance is None:
+        return max_interval
+    if distance == 0 or volatility is None:
+        return min(max(base_interval, min_interval), max_interval)
+    if volatility <= 0:
+        return max_interval
+
+    seconds = (distance / (safety_factor * volatility)) ** 2
+    return min(max(seconds, min_interval), max_interval)
@@ -2,57 +2,190 @@
 Main Alert Bot for the API Alert System
 """
 
+import asyncio
+import signal
 import time
 import schedule
 import logging
-from datetime import datetime
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 
 from ..utils.config import *
 from ..utils.helpers import setup_logging, validate_config
 from .database import DatabaseManager
+from .adaptive import adaptive_interval
+from .metrics import MetricsSink, create_metrics, set_metrics
+from .profiling import CycleProfiler
+from .tracing import Tracer, create_tracer, set_tracer
+from .models import AlertEvent
+from ..providers.circuit_breaker import CircuitBreakerProvider, format_breaker_status
+from ..providers.factory import create_provider
+from .leader import LeaderElection
+from .scheduler import PollScheduler
+from .sharding import ShardCoordinator
+from .streaming import StreamingAlertEngine
 from .stock_monitor import StockMonitor
-from ..notifications.telegram import TelegramNotifier
-from ..notifications.ntfy import NTFYNotifier
-from ..notifications.console import ConsoleNotifier
+from .subscriptions import Subscriptions
+from .watchlist import WatchlistSync
+from ..notifications.registry import NotifierRegistry
+
+if TYPE_CHECKING:
+    from .status_server import StatusServer
 
-# Setup logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 class AlertBot:
     """Main alert bot that coordinates all components"""
     
-    def __init__(self):
-        """Initialize the alert bot with all components"""
+    def __init__(self, watchlist: Optional[Dict] = None, db_manager: Optional[DatabaseManager] = None,
+                 provider=None, notifiers: Optional[NotifierRegistry] = None,
+                 metrics: Optional[MetricsSink] = None, tracer=None,
+                 subscriptions: Optional[Subscriptions] = None):
+        """Initialize the alert bot with all components
+        
+        Components default to the ones described by the config; pass them in to
+        run the bot against other sources or sinks, e.g. in benchmarks.
+        """
         self.config_status = validate_config()
+        # The configured watchlist is loaded from the database below when WATCHLIST_SOURCE says so
+        self.watchlist = dict(WATCHLIST) if watchlist is None else watchlist
+        self.watchlist_sync: Optional[WatchlistSync] = None
+        
+        # Every component reports stage timings to the process-wide metrics sink
+        self.metrics = set_metrics(metrics if metrics is not None else create_metrics(METRICS_SINK))
+        # ...and one trace per cycle to the process-wide tracer
+        self.tracer = set_tracer(tracer if tracer is not None else self._create_tracer())
         
         # Initialize components
-        self.db_manager = DatabaseManager(
-            host=POSTGRES_HOST,
-            port=POSTGRES_PORT,
-            database=POSTGRES_DB,
-            user=POSTGRES_USER,
-            password=POSTGRES_PASSWORD
+        if db_manager is None:
+            db_manager = DatabaseManager(
+                host=POSTGRES_HOST,
+                port=POSTGRES_PORT,
+                database=POSTGRES_DB,
+                user=POSTGRES_USER,
+                password=POSTGRES_PASSWORD
+            )
+        self.db_manager = db_manager
+        
+        self.stock_monitor = StockMonitor(
+            demo_mode=DEMO_MODE,
+            provider=provider if provider is not None else self._create_provider(),
+            delta_tick=PRICE_DELTA_TICK,
+            delta_percent=PRICE_DELTA_PERCENT,
+            full_snapshot_interval=FULL_SNAPSHOT_INTERVAL
         )
         
-        self.stock_monitor = StockMonitor(demo_mode=DEMO_MODE)
+        self.scheduler = PollScheduler(
+            in_session_interval=POLL_INTERVAL,
+            off_hours_interval=OFF_HOURS_INTERVAL,
+            market_hours_aware=MARKET_HOURS_AWARE,
+            priority_intervals=PRIORITY_INTERVALS
+        )
         
         # Initialize notifiers
-        self.telegram_notifier = TelegramNotifier(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID) if ENABLE_TELEGRAM else None
-        self.ntfy_notifier = NTFYNotifier(NTFY_TOPIC, NTFY_SERVER, NTFY_ENABLED) if ENABLE_NTFY else None
-        self.console_notifier = ConsoleNotifier(CONSOLE_NOTIFICATIONS)
+        if notifiers is None:
+            notifiers = NotifierRegistry.from_config(NOTIFIERS, max_workers=NOTIFIER_MAX_WORKERS)
+        self.notifiers = notifiers
+        self.console_notifier = self.notifiers.get("console")
+        
+        # Health: when the bot started, when a cycle last succeeded or failed, and when nothing was due
+        self.started_at = time.monotonic()
+        self.last_cycle_at: Optional[float] = None
+        self.last_failed_cycle_at: Optional[float] = None
+        self.last_idle_at: Optional[float] = None
+        self.stream_engine: Optional[StreamingAlertEngine] = None
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+        self.status_server: Optional["StatusServer"] = None
+        
+        # Opt-in cycle profiling; SIGUSR1 toggles it while running
+        self.profiler = CycleProfiler(
+            output_dir=PROFILE_DIR,
+            every=PROFILE_EVERY_N,
+            slow_threshold=PROFILE_SLOW_CYCLE_SECONDS,
+            max_files=PROFILE_MAX_FILES,
+            sample_interval=PROFILE_SAMPLE_INTERVAL,
+            enabled=PROFILE_ENABLED
+        )
         
         # Initialize database
         self._init_database()
+        if watchlist is None and WATCHLIST_SOURCE == "database":
+            self._load_watchlist()
+        
+        # Per-user rules, evaluated against the same fetched prices
+        self.subscriptions = subscriptions
+        self._subscriber_only: Set[str] = set()
+        if subscriptions is None and SUBSCRIPTIONS_ENABLED:
+            self._load_subscriptions()
+        self._track_subscribed_tickers()
+        
+        # In a sharded deployment this worker polls only the partitions it leases
+        self.shards: Optional[ShardCoordinator] = None
+        if SHARDING_ENABLED:
+            self._start_sharding()
+        
+        # With redundant replicas only the lease holder fetches and notifies
+        self.leader: Optional[LeaderElection] = None
+        self.resumed_breaches: Dict[str, frozenset] = {}
+        if HA_MODE == "active-standby":
+            if self.shards is not None:
+                logger.warning("⚠️  HA_MODE is ignored with sharding; workers already take over each other's partitions")
+            else:
+                self.leader = LeaderElection(self.db_manager, worker_id=WORKER_ID or None,
+                                             lease_seconds=LEADER_LEASE_SECONDS)
+                self.check_leadership()
         
         logger.info("Alert Bot initialized successfully")
     
+    def _create_provider(self):
+        """Create the configured quote provider"""
+        name = "synthetic" if DEMO_MODE else QUOTE_PROVIDER
+        if name == "feed" and INGESTION_MODE != "stream":
+            # The feed only has quotes it was pushed; polling it would miss on every cycle
+            raise ValueError("QUOTE_PROVIDER=feed needs INGESTION_MODE=stream")
+        if name == "replay" and REPLAY_SOURCE == "database" and self.db_manager.connection is None:
+            self.db_manager.connect()
+        provider = create_provider(
+            name,
+            replay_source=REPLAY_SOURCE,
+            replay_speedup=REPLAY_SPEEDUP,
+            db_manager=self.db_manager,
+            feed_host=FEED_HOST,
+            feed_port=FEED_PORT,
+            yfinance_lightweight=YFINANCE_LIGHTWEIGHT_QUOTES,
+            synthetic_options={
+                "seed": SYNTHETIC_SEED,
+                "volatility": SYNTHETIC_VOLATILITY,
+                "correlation": SYNTHETIC_CORRELATION,
+                "jump_intensity": SYNTHETIC_JUMP_INTENSITY,
+                "dt": SYNTHETIC_STEP_DAYS / 252
+            }
+        )
+        logger.info(f"📡 Quote provider: {provider.name}")
+        if CIRCUIT_BREAKER_ENABLED:
+            provider = CircuitBreakerProvider(
+                provider,
+                failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+                base_backoff=CIRCUIT_BASE_BACKOFF,
+                max_backoff=CIRCUIT_MAX_BACKOFF
+            )
+        return provider
+    
+    def _create_tracer(self):
+        """Create the configured tracer, falling back to no tracing"""
+        try:
+            return create_tracer(TRACE_EXPORTER, TRACE_FILE)
+        except Exception as e:
+            logger.error(f"❌ Failed to set up {TRACE_EXPORTER} tracing: {e}")
+            return Tracer()
+    
     def _init_database(self):
         """Initialize database connection and tables"""
         try:
-            if self.db_manager.connect():
+            if self.db_manager.connection is not None or self.db_manager.connect():
                 self.db_manager.init_tables()
                 logger.info("Database initialized successfully")
             else:
@@ -60,84 +193,307 @@ class AlertBot:
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
     
-    def check_prices_and_send_alerts(self):
-        """Main function to check prices and send alerts"""
+    def _load_watchlist(self):
+        """Load the watchlist from the database, keeping the configured one if that fails"""
+        sync = WatchlistSync(self.db_manager, self.watchlist)
+        if sync.load(seed=WATCHLIST):
+            self.watchlist_sync = sync
+        else:
+            logger.warning("⚠️  Using the configured watchlist; edits made through the MCP server will not be picked up")
+    
+    def _load_subscriptions(self):
+        """Load the per-user subscriptions from the database"""
+        subscriptions = Subscriptions()
+        if subscriptions.load(self.db_manager):
+            self.subscriptions = subscriptions
+        else:
+            logger.warning("⚠️  Subscriptions could not be loaded; only the watchlist is checked")
+    
+    def sync_subscriptions(self):
+        """Reload the per-user subscriptions after they were edited in the database"""
+        if self.subscriptions is not None and self.subscriptions.poll(self.db_manager):
+            self._track_subscribed_tickers()
+    
+    def _track_subscribed_tickers(self):
+        """Poll every subscribed ticker, tracking the ones missing from the watchlist without thresholds"""
+        if self.subscriptions is None:
+            return
+        subscribed = set(self.subscriptions.rules.tickers())
+        added = {ticker: {"upper": None, "lower": None} for ticker in subscribed if ticker not in self.watchlist}
+        dropped = [ticker for ticker in self._subscriber_only if ticker not in subscribed]
+        if not added and not dropped:
+            return
+        for ticker in dropped:
+            del self.watchlist[ticker]
+        self.watchlist.update(added)
+        self._subscriber_only.difference_update(dropped)
+        self._subscriber_only.update(added)
+        self.scheduler.apply_changes(self.watchlist, added, dropped)
+        self._resubscribe_stream()
+    
+    def _start_sharding(self):
+        """Join the worker pool and lease a first share of partitions"""
+        self.shards = ShardCoordinator(
+            self.db_manager,
+            worker_id=WORKER_ID or None,
+            partitions=SHARD_PARTITIONS,
+            lease_seconds=SHARD_LEASE_SECONDS
+        )
+        if not self.shards.start():
+            # Polling everything would duplicate the other workers' alerts; own nothing and retry
+            logger.error("❌ Could not join the worker pool yet; retrying every heartbeat")
+    
+    def rebalance_shards(self):
+        """Renew partition leases and pick up or hand back partitions"""
+        if self.shards is not None and self.shards.rebalance():
+            self._resubscribe_stream()
+    
+    def _resubscribe_stream(self):
+        """Point the stream at this bot's tickers when they were added or dropped"""
+        engine = self.stream_engine
+        if engine is None:
+            return
+        tickers = self._stream_tickers()
+        if set(tickers) != set(engine.tickers):
+            engine.resubscribe(tickers)
+    
+    def _stream_tickers(self) -> List[str]:
+        """Tickers this worker subscribes to in streaming mode"""
+        if self.shards is None:
+            return list(self.watchlist)
+        return self.shards.owned_tickers(self.watchlist)
+    
+    def is_active(self) -> bool:
+        """Whether this bot should fetch prices and send notifications"""
+        return self.leader is None or self.leader.is_leader()
+    
+    def check_leadership(self) -> bool:
+        """Renew or try to take the leader lease, resuming from stored state on takeover"""
+        if self.leader is None:
+            return True
+        was_leader = self.leader.is_leader()
+        leader = self.leader.heartbeat()
+        if leader and not was_leader:
+            logger.info(f"👑 {self.leader.worker_id} is now the active replica")
+            self.resume_state()
+        elif was_leader and not leader:
+            logger.warning(f"⏸️  {self.leader.worker_id} lost the leader lease; standing by")
+        if not leader:
+            self.last_idle_at = time.monotonic()
+        return leader
+    
+    def resume_state(self):
+        """Pick up where the previous active replica left off, from the prices and alerts it stored
+        
+        Delta price updates continue from the last stored prices and every
+        ticker is polled right away. In streaming mode a ticker whose last price
+        breaches a threshold does not alert again if that alert is already in
+        the alert history; one that was never recorded is raised again.
+        Only the last RESUME_LOOKBACK_HOURS of history are read.
+        """
+        since = datetime.utcnow() - timedelta(hours=RESUME_LOOKBACK_HOURS)
+        self.resumed_breaches = {}
+        latest = self.db_manager.get_latest_prices(since)
+        alerted = self.db_manager.get_recent_alert_types(since) or {}
+        if latest:
+            prices = {ticker: row['price'] for ticker, row in latest.items() if ticker in self.watchlist}
+            self.stock_monitor.last_sent_prices.update(prices)
+            for ticker, price in prices.items():
+                breached = frozenset(self.stock_monitor.check_thresholds(ticker, price, self.watchlist[ticker]))
+                breached &= alerted.get(ticker, set())
+                if breached:
+                    self.resumed_breaches[ticker] = breached
+            logger.info(f"↩️  Resumed from stored prices of {len(prices)} tickers, {len(self.resumed_breaches)} in breach")
+        self.scheduler.apply_changes(self.watchlist, dict(self.watchlist), [])
+    
+    def sync_watchlist(self):
+        """Apply watchlist edits made in the database since the last check"""
+        if self.watchlist_sync is not None:
+            self._apply_watchlist_changes(*self.watchlist_sync.poll())
+    
+    def _apply_watchlist_changes(self, changed: Dict, removed: List[str]):
+        """Update the scheduler and stream subscription for edited tickers"""
+        if not changed and not removed:
+            return
+        self.scheduler.apply_changes(self.watchlist, changed, removed)
+        # A ticker added to the watchlist is no longer tracked for subscribers alone
+        self._subscriber_only.difference_update(changed)
+        self._track_subscribed_tickers()
+        engine = self.stream_engine
+        if engine is not None:
+            # Breach state belongs to the old thresholds; start over so edited tickers can alert again
+            for ticker in [*changed, *removed]:
+                engine.breaches.pop(ticker, None)
+            self._resubscribe_stream()
+        self.metrics.increment("watchlist.changes", len(changed) + len(removed))
+        logger.info(
+            f"📋 Watchlist updated to version {self.watchlist_sync.version}: "
+            f"{len(changed)} added or changed, {len(removed)} removed"
+        )
+    
+    def check_prices_and_send_alerts(self, tickers: Optional[List[str]] = None):
+        """Main function to check prices and send alerts
+        
+        Checks every ticker in the watchlist, or only `tickers` when given.
+        """
         now = datetime.utcnow()
         logger.info(f"📊 Checking prices at {now}")
         
+        if tickers is None:
+            watchlist = self.watchlist
+        else:
+            watchlist = {ticker: self.watchlist[ticker] for ticker in tickers if ticker in self.watchlist}
+        
+        with self.tracer.start_as_current_span("poll_cycle", attributes={"tickers": len(watchlist)}) as span:
+            prices = self._run_cycle(watchlist, now)
+            span.set_attribute("prices", sum(1 for price in prices.values() if price is not None))
+        
+        # Show console summary
+        if self.console_notifier:
+            self.console_notifier.print_price_table(prices)
+        
+        self.show_circuit_status()
+    
+    @contextmanager
+    def _stage(self, stage: str, attributes: Optional[Dict] = None):
+        """Time a cycle stage and trace it as a child span of the cycle"""
+        with self.tracer.start_as_current_span(stage, attributes=attributes) as span, \
+                self.metrics.timer("stage.seconds", {"stage": stage}):
+            yield span
+    
+    def _run_cycle(self, watchlist: Dict, now: datetime) -> Dict[str, Optional[float]]:
+        """Fetch, persist, evaluate and notify for one cycle and return the prices"""
+        metrics = self.metrics
+        cycle_started = time.perf_counter()
+        
         # Get prices for all tickers
-        prices = self.stock_monitor.get_prices_for_watchlist(WATCHLIST)
+        with self._stage("fetch"):
+            prices = self.stock_monitor.get_prices_for_watchlist(watchlist)
         
         # Store prices in database
-        for ticker, price in prices.items():
-            if price is not None:
-                self.db_manager.insert_price(ticker, price, now)
+        rows = [(ticker, price, now) for ticker, price in prices.items() if price is not None]
+        with self._stage("db_insert", {"rows": len(rows)}) as span:
+            span.set_attribute("outcome", "ok" if self.db_manager.insert_prices(rows) else "error")
+        
+        if ADAPTIVE_POLLING:
+            self._reschedule_adaptive(watchlist, prices, now)
         
         # Check for threshold alerts
-        alerts = self.stock_monitor.check_all_thresholds(WATCHLIST, prices)
+        with self._stage("evaluate") as span:
+            alert_events = self.stock_monitor.build_alert_events(watchlist, prices, now)
+            span.set_attribute("alerts", len(alert_events))
+        metrics.increment("alerts.raised", len(alert_events))
+        
+        # Check the same prices against every user's rules
+        user_events = {}
+        if self.subscriptions is not None and len(self.subscriptions.rules):
+            with self._stage("evaluate_subscriptions") as span:
+                user_events = self.subscriptions.build_alert_events(prices, now)
+                span.set_attribute("users", len(user_events))
         
         # Send price updates
         if any(price is not None for price in prices.values()):
-            price_message = self.stock_monitor.format_price_message(prices, now)
-            self._send_price_update(price_message)
+            with self._stage("notify_prices"):
+                price_message = self.stock_monitor.format_price_message(
+                    prices, now, delta=PRICE_UPDATE_MODE == "delta"
+                )
+                if price_message:
+                    if self._send_price_update(price_message):
+                        self.stock_monitor.mark_sent()
+                else:
+                    logger.info("No significant price changes, skipping price update")
         
         # Send alerts if any thresholds are crossed
-        if alerts:
-            alert_message = self.stock_monitor.format_alert_message(alerts, prices, WATCHLIST)
-            self._send_alert(alert_message)
+        if alert_events:
+            with self._stage("notify_alerts", {"tickers": ",".join(sorted({e.ticker for e in alert_events}))}):
+                self._send_alert_events(alert_events)
             
             # Store alerts in database
-            for ticker, alert_types in alerts.items():
-                price = prices.get(ticker)
-                thresholds = WATCHLIST.get(ticker, {})
-                
-                for alert_type in alert_types:
-                    if alert_type == 'UPPER':
-                        threshold = thresholds.get('upper', 0)
-                        self.db_manager.insert_alert(ticker, 'UPPER', price, threshold, now)
-                    elif alert_type == 'LOWER':
-                        threshold = thresholds.get('lower', 0)
-                        self.db_manager.insert_alert(ticker, 'LOWER', price, threshold, now)
-        
-        # Show console summary
-        self.console_notifier.print_price_table(prices)
-    
-    def _send_price_update(self, message: str):
-        """Send price update to all configured notifiers"""
-        success_count = 0
+            with self._stage("db_insert_alerts", {"rows": len(alert_events)}) as span:
+                span.set_attribute("outcome", "ok" if self._store_alert_events(alert_events) else "error")
         
-        if self.telegram_notifier:
-            if self.telegram_notifier.send_price_update(message):
-                success_count += 1
-        
-        if self.ntfy_notifier:
-            if self.ntfy_notifier.send_price_update(message):
-                success_count += 1
-        
-        if self.console_notifier:
-            if self.console_notifier.send_price_update(message):
-                success_count += 1
+        # Route each user's alerts to their own channels
+        if user_events:
+            with self._stage("notify_subscribers", {"users": len(user_events)}) as span:
+                sent = self.notifiers.deliver_routed(self.subscriptions.routes(user_events))
+                span.set_attribute("sent", sent)
+            metrics.increment("alerts.routed", sent)
+            logger.info(f"👥 Alerts for {len(user_events)} subscriber(s) sent to {sent} destination(s)")
         
+        metrics.timing("cycle.seconds", time.perf_counter() - cycle_started)
+        metrics.increment("cycle.tickers", len(watchlist))
+        if not watchlist or any(price is not None for price in prices.values()):
+            self.last_cycle_at = time.monotonic()
+        else:
+            self.last_failed_cycle_at = time.monotonic()
+        return prices
+    
+    def _reschedule_adaptive(self, watchlist: Dict, prices: Dict[str, Optional[float]], now: datetime):
+        """Schedule each ticker's next poll from its distance to the nearest threshold"""
+        for ticker, price in prices.items():
+            if price is None:
+                continue
+            settings = watchlist[ticker]
+            interval = adaptive_interval(
+                price,
+                self._nearest_thresholds(ticker, settings),
+                self.stock_monitor.get_volatility(ticker),
+                base_interval=self.scheduler.interval_for(settings),
+                min_interval=ADAPTIVE_MIN_INTERVAL,
+                max_interval=ADAPTIVE_MAX_INTERVAL,
+                safety_factor=ADAPTIVE_SAFETY_FACTOR
+            )
+            next_poll = self.scheduler.next_poll_time(ticker, settings, now, interval)
+            self.scheduler.schedule(ticker, next_poll, settings, interval)
+    
+    def _nearest_thresholds(self, ticker: str, settings: Dict) -> Dict:
+        """Combine a ticker's own thresholds with its subscribers' nearest ones"""
+        if self.subscriptions is None:
+            return settings
+        nearest = self.subscriptions.rules.nearest(ticker)
+        combined = dict(settings)
+        for side, pick in (("upper", min), ("lower", max)):
+            values = [value for value in (settings.get(side), nearest[side]) if value is not None]
+            combined[side] = pick(values) if values else None
+        return combined
+    
+    def _store_alert_events(self, events: List[AlertEvent]) -> bool:
+        """Store alert events in the database"""
+        return self.db_manager.insert_alerts([
+            (event.ticker, event.alert_type, event.price, event.threshold, event.timestamp) for event in events
+        ])
+    
+    def poll_due_tickers(self):
+        """Check prices for the tickers the scheduler says are due"""
+        if not self.is_active():
+            self.last_idle_at = time.monotonic()
+            return
+        due = self.scheduler.due_tickers(self.watchlist)
+        if self.shards is not None:
+            # Other workers poll the rest; keep them scheduled so a partition taken over is polled on time
+            due = self.shards.owned_tickers(due)
+        if due:
+            with self.profiler.profile():
+                self.check_prices_and_send_alerts(due)
+        else:
+            self.last_idle_at = time.monotonic()
+    
+    def _send_price_update(self, message: str) -> int:
+        """Send price update to all configured notifiers and return the success count"""
+        success_count = self.notifiers.broadcast("price_update", message)
         logger.info(f"Price update sent to {success_count} notifiers")
+        return success_count
     
     def _send_alert(self, message: str):
         """Send alert to all configured notifiers"""
-        success_count = 0
-        
-        if self.telegram_notifier:
-            if self.telegram_notifier.send_alert(message):
-                success_count += 1
-        
-        if self.ntfy_notifier:
-            if self.ntfy_notifier.send_alert(message):
-                success_count += 1
-        
-        if self.console_notifier:
-            if self.console_notifier.send_alert(message):
-                success_count += 1
-        
+        success_count = self.notifiers.broadcast("alert", message)
         logger.info(f"Alert sent to {success_count} notifiers")
     
+    def _send_alert_events(self, events: List[AlertEvent]):
+        """Send alert events to all configured notifiers, rendered per channel"""
+        success_count = self.notifiers.broadcast_events(events)
+        logger.info(f"{len(events)} alert(s) sent to {success_count} notifiers")
+    
     def show_recent_history(self, limit: int = 5):
         """Show recent price and alert history"""
         logger.info(f"📈 Recent Price History (Last {limit} entries):")
@@ -158,6 +514,78 @@ class AlertBot:
             threshold = alert_data['threshold']
             sent_at = alert_data['sent_at']
             logger.info(f"{ticker:6} | {alert_type:5} | ${price:8.2f} | ${threshold:8.2f} | {sent_at}")
+        
+        self.show_circuit_status()
+    
+    def show_circuit_status(self):
+        """Log open circuit breakers"""
+        open_breakers = getattr(self.stock_monitor.provider, "open_breakers", None)
+        if open_breakers is None:
+            return
+        status = format_breaker_status(open_breakers())
+        if status:
+            logger.info(f"🔌 Circuit breakers:\n{status}")
+    
+    def log_metrics(self):
+        """Log a summary of the collected stage timings and counters"""
+        report = self.metrics.report()
+        if report:
+            logger.info(f"⏱️  Metrics:\n{report}")
+    
+    def render_metrics(self) -> str:
+        """Update the point-in-time gauges and render all metrics for Prometheus"""
+        metrics = self.metrics
+        now = time.monotonic()
+        metrics.gauge("uptime.seconds", now - self.started_at)
+        if self.last_cycle_at is not None:
+            metrics.gauge("cycle.last_success_age.seconds", now - self.last_cycle_at)
+        metrics.gauge("watchlist.tickers", len(self.watchlist))
+        metrics.gauge("notify.queue_depth", self.notifiers.queue_depth())
+        if self.stream_engine is not None:
+            metrics.gauge("stream.queue_depth", self.stream_engine.queue.qsize())
+        # The bot holds a single database connection; report it like a pool of one
+        connection = self.db_manager.connection
+        connected = connection is not None and not getattr(connection, "closed", False)
+        metrics.gauge("db.connections", 1 if connected else 0)
+        if self._db_executor is not None:
+            metrics.gauge("db.queue_depth", self._db_executor._work_queue.qsize())
+        open_breakers = getattr(self.stock_monitor.provider, "open_breakers", None)
+        if open_breakers is not None:
+            metrics.gauge("circuit.open_breakers", len(open_breakers()))
+        if self.leader is not None:
+            metrics.gauge("leader", 1 if self.leader.is_leader() else 0)
+        if self.shards is not None:
+            metrics.gauge("shard.partitions_owned", len(self.shards.owned))
+            metrics.gauge("shard.live_workers", len(self.shards.live_workers))
+        return metrics.prometheus()
+    
+    def check_health(self):
+        """Whether a cycle succeeded, or the scheduler had nothing due, within HEALTH_MAX_CYCLE_AGE seconds
+        
+        Idle ticks only count while the last cycle that ran succeeded, so a bot
+        whose every fetch fails turns unhealthy even though it keeps ticking.
+        """
+        now = time.monotonic()
+        activity = [self.started_at, self.last_cycle_at]
+        if self.last_failed_cycle_at is None or (
+                self.last_cycle_at is not None and self.last_cycle_at > self.last_failed_cycle_at):
+            activity.append(self.last_idle_at)
+        last_activity = max(t for t in activity if t is not None)
+        age = now - last_activity
+        details = {
+            "last_cycle_age": None if self.last_cycle_at is None else round(now - self.last_cycle_at, 3),
+            "last_activity_age": round(age, 3),
+            "uptime": round(now - self.started_at, 3),
+        }
+        return age <= HEALTH_MAX_CYCLE_AGE, details
+    
+    def start_status_server(self):
+        """Serve /metrics and /healthz in the background"""
+        from .status_server import StatusServer
+        try:
+            self.status_server = StatusServer(self.render_metrics, self.check_health, host=STATUS_HOST, port=STATUS_PORT)
+        except OSError as e:
+            logger.error(f"❌ Failed to start status endpoint on port {STATUS_PORT}: {e}")
     
     def test_notifications(self):
         """Test all notification systems"""
@@ -165,47 +593,221 @@ class AlertBot:
         
         logger.info("Testing notification systems...")
         
-        if self.telegram_notifier:
-            if self.telegram_notifier.test_connection():
-                self.telegram_notifier.send_message(test_message)
+        for notifier in self.notifiers.active:
+            if notifier.test_connection():
+                notifier.deliver("message", test_message)
+    
+    async def run_streaming(self):
+        """Ingest pushed quotes and check thresholds per tick
         
-        if self.ntfy_notifier:
-            if self.ntfy_notifier.test_connection():
-                self.ntfy_notifier.send_message(test_message)
+        Prices are persisted and price updates sent every POLL_INTERVAL seconds
+        from the latest streamed quotes. Database work runs on a single worker
+        thread so the event loop never blocks on it and the connection is never
+        shared between threads.
+        """
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+        reporter = asyncio.create_task(self._log_metrics_periodically()) if METRICS_REPORT_INTERVAL > 0 else None
+        syncer = asyncio.create_task(self._sync_watchlist_periodically()) if self.watchlist_sync is not None else None
+        subscriber = asyncio.create_task(self._sync_subscriptions_periodically()) if self.subscriptions is not None else None
+        balancer = asyncio.create_task(self._rebalance_shards_periodically()) if self.shards is not None else None
         
-        if self.console_notifier:
-            self.console_notifier.send_message(test_message)
+        try:
+            if self.leader is None:
+                await self._stream_quotes()
+            else:
+                await self._stream_quotes_while_leader()
+        finally:
+            for task in (reporter, syncer, subscriber, balancer):
+                if task is not None:
+                    task.cancel()
+            self._db_executor.shutdown(wait=True)
+    
+    async def _stream_quotes(self):
+        """Run a streaming engine until the provider's stream ends"""
+        engine = StreamingAlertEngine(
+            self.stock_monitor,
+            self.watchlist,
+            self._handle_stream_alerts,
+            queue_size=STREAM_QUEUE_SIZE,
+            subscriptions=self.subscriptions,
+            on_user_alerts=self._handle_stream_user_alerts
+        )
+        engine.breaches.update(self.resumed_breaches)
+        self.stream_engine = engine
+        publisher = asyncio.create_task(self._publish_stream_prices_periodically(engine))
+        
+        try:
+            await engine.run(self.stock_monitor.provider, self._stream_tickers(), interval=POLL_INTERVAL)
+        finally:
+            publisher.cancel()
+            await self._publish_stream_prices(engine)
+            self.stream_engine = None
+    
+    async def _stream_quotes_while_leader(self):
+        """Stand by until this replica holds the leader lease, stream while it does, and repeat"""
+        while True:
+            if not await self._run_db(self.check_leadership):
+                await asyncio.sleep(LEADER_HEARTBEAT_INTERVAL)
+                continue
+            
+            stream = asyncio.create_task(self._stream_quotes())
+            while not stream.done():
+                await asyncio.wait({stream}, timeout=LEADER_HEARTBEAT_INTERVAL)
+                if not stream.done() and not await self._run_db(self.check_leadership):
+                    stream.cancel()
+                    await asyncio.gather(stream, return_exceptions=True)
+            if not stream.cancelled():
+                return stream.result()
+    
+    async def _run_db(self, func, *args):
+        """Run a database call on the database worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(self._db_executor, func, *args)
+    
+    async def _handle_stream_alerts(self, events: List[AlertEvent]):
+        """Send and store alerts raised by the streaming engine"""
+        success_count = await self.notifiers.async_broadcast_events(events)
+        logger.info(f"{len(events)} alert(s) sent to {success_count} notifiers")
+        await self._run_db(self._store_alert_events, events)
+    
+    async def _handle_stream_user_alerts(self, events_by_user: Dict[str, List[AlertEvent]]):
+        """Route alerts raised by the streaming engine to each subscriber's channels"""
+        sent = await self.notifiers.async_deliver_routed(self.subscriptions.routes(events_by_user))
+        self.metrics.increment("alerts.routed", sent)
+        logger.info(f"👥 Alerts for {len(events_by_user)} subscriber(s) sent to {sent} destination(s)")
+    
+    async def _publish_stream_prices_periodically(self, engine: StreamingAlertEngine):
+        """Persist streamed prices and send price updates every POLL_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            await self._publish_stream_prices(engine)
+    
+    async def _log_metrics_periodically(self):
+        """Log the metrics summary every METRICS_REPORT_INTERVAL seconds"""
+        while True:
+            await asyncio.sleep(METRICS_REPORT_INTERVAL)
+            self.log_metrics()
+    
+    async def _sync_watchlist_periodically(self):
+        """Apply watchlist edits every WATCHLIST_SYNC_INTERVAL seconds
+        
+        The database read runs on the database thread; the edits are applied on
+        the event loop so the engine never sees the watchlist mid-update.
+        """
+        while True:
+            await asyncio.sleep(WATCHLIST_SYNC_INTERVAL)
+            fetched = await self._run_db(self.watchlist_sync.fetch)
+            self._apply_watchlist_changes(*self.watchlist_sync.apply(fetched))
+    
+    async def _sync_subscriptions_periodically(self):
+        """Reload edited subscriptions every WATCHLIST_SYNC_INTERVAL seconds
+        
+        The database read runs on the database thread; newly subscribed tickers
+        are tracked on the event loop, which resubscribes the stream.
+        """
+        while True:
+            await asyncio.sleep(WATCHLIST_SYNC_INTERVAL)
+            if await self._run_db(self.subscriptions.poll, self.db_manager):
+                self._track_subscribed_tickers()
+    
+    async def _rebalance_shards_periodically(self):
+        """Renew partition leases every SHARD_HEARTBEAT_INTERVAL seconds and resubscribe when they move"""
+        while True:
+            await asyncio.sleep(SHARD_HEARTBEAT_INTERVAL)
+            if await self._run_db(self.shards.rebalance):
+                self._resubscribe_stream()
+    
+    async def _publish_stream_prices(self, engine: StreamingAlertEngine):
+        """Persist the quotes that ticked since the last publish and send a price update"""
+        # Tickers dropped from the subscription may still have quotes queued or cached
+        subscribed = set(engine.tickers)
+        updates = {ticker: quote for ticker, quote in engine.take_updates().items() if ticker in subscribed}
+        if not updates or not self.is_active():
+            self.last_idle_at = time.monotonic()
+            return
+        self.last_cycle_at = time.monotonic()
+        
+        rows = [(quote.ticker, quote.price, quote.timestamp) for quote in updates.values()]
+        await self._run_db(self.db_manager.insert_prices, rows)
+        
+        prices = {ticker: quote.price for ticker, quote in engine.latest.items() if ticker in subscribed}
+        price_message = self.stock_monitor.format_price_message(
+            prices, datetime.utcnow(), delta=PRICE_UPDATE_MODE == "delta"
+        )
+        if price_message and await self.notifiers.async_broadcast("price_update", price_message):
+            self.stock_monitor.mark_sent()
+    
+    def _run_polling(self):
+        """Poll prices on the scheduler's cadence"""
+        logger.info(f"⏰ Polling interval: {POLL_INTERVAL} seconds")
+        
+        if MARKET_HOURS_AWARE:
+            off_hours = f"every {OFF_HOURS_INTERVAL} seconds" if OFF_HOURS_INTERVAL > 0 else "paused"
+            logger.info(f"🕰️  Market-hours aware polling (off-hours: {off_hours})")
+        
+        # The scheduler decides per ticker when it is due; check for due tickers every second
+        schedule.every(1).seconds.do(self.poll_due_tickers)
+        if METRICS_REPORT_INTERVAL > 0:
+            schedule.every(METRICS_REPORT_INTERVAL).seconds.do(self.log_metrics)
+        if self.watchlist_sync is not None:
+            schedule.every(WATCHLIST_SYNC_INTERVAL).seconds.do(self.sync_watchlist)
+        if self.subscriptions is not None:
+            schedule.every(WATCHLIST_SYNC_INTERVAL).seconds.do(self.sync_subscriptions)
+        if self.shards is not None:
+            schedule.every(SHARD_HEARTBEAT_INTERVAL).seconds.do(self.rebalance_shards)
+        if self.leader is not None:
+            schedule.every(LEADER_HEARTBEAT_INTERVAL).seconds.do(self.check_leadership)
+        
+        # Run initial check
+        self.poll_due_tickers()
+        
+        while True:
+            schedule.run_pending()
+            time.sleep(1)
     
     def run(self):
         """Run the alert bot continuously"""
         logger.info("🚀 Starting Alert Bot...")
-        logger.info(f"📊 Monitoring {len(WATCHLIST)} tickers")
-        logger.info(f"⏰ Polling interval: {POLL_INTERVAL} seconds")
+        logger.info(f"📊 Monitoring {len(self.watchlist)} tickers")
         
         if DEMO_MODE:
             logger.info("🎬 Running in DEMO MODE with mock data")
         
-        # Schedule the price checking
-        schedule.every(POLL_INTERVAL).seconds.do(self.check_prices_and_send_alerts)
+        if STATUS_SERVER_ENABLED:
+            self.start_status_server()
         
-        # Run initial check
-        self.check_prices_and_send_alerts()
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.profiler.toggle())
+        if self.profiler.enabled:
+            logger.info(f"🔬 Cycle profiling enabled, writing to {PROFILE_DIR}")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            if INGESTION_MODE == "stream":
+                logger.info("📡 Streaming ingestion: thresholds checked per tick")
+                asyncio.run(self.run_streaming())
+            else:
+                self._run_polling()
         except KeyboardInterrupt:
             logger.info("🛑 Alert Bot stopped by user")
         except Exception as e:
             logger.error(f"❌ Alert Bot error: {e}")
         finally:
+            self.log_metrics()
+            if self.status_server is not None:
+                self.status_server.close()
+            if isinstance(self.tracer, Tracer):
+                self.tracer.shutdown()
+            if self.shards is not None:
+                self.shards.stop()
+            if self.leader is not None:
+                self.leader.release()
+            self.notifiers.close()
             self.db_manager.disconnect()
             logger.info("👋 Alert Bot shutdown complete")
 
 
 def main():
     """Main entry point"""
+    setup_logging()
     bot = AlertBot()
     bot.run()
 
@@ -2,10 +2,9 @@
 Database management for the API Alert System
 """
 
-import psycopg2
-from psycopg2.extras import DictCursor
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +26,8 @@ class DatabaseManager:
     def connect(self):
         """Create a new database connection"""
         try:
+            # Imported here so commands that never touch the database start faster
+            import psycopg2
             self.connection = psycopg2.connect(
                 host=self.host,
                 port=self.port,
@@ -74,6 +75,12 @@ class DatabaseManager:
                 )
             """)
             
+            # Latest-price and recent-alert lookups, e.g. when a standby takes over
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS price_history_ticker_time_idx ON price_history (ticker, fetched_at)")
+            self.cursor.execute("CREATE INDEX IF NOT EXISTS alert_history_time_idx ON alert_history (sent_at)")
+            
+            self.init_watchlist_tables()
+            self.init_subscription_tables()
             self.connection.commit()
             logger.info("Database tables initialized")
             return True
@@ -81,6 +88,115 @@ class DatabaseManager:
             logger.error(f"Failed to initialize tables: {e}")
             return False
     
+    def init_watchlist_tables(self):
+        """Create the watchlist table and its version counter
+        
+        Every write bumps the single-row version counter and stamps the rows it
+        touches with the new version; removed tickers stay behind as deleted
+        rows. Readers find edits with one cheap counter read and then fetch only
+        the rows newer than the version they last saw.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS watchlist (
+                ticker      VARCHAR(10) PRIMARY KEY,
+                settings    TEXT NOT NULL,
+                version     BIGINT NOT NULL,
+                deleted     BOOLEAN NOT NULL DEFAULT FALSE,
+                updated_at  TIMESTAMP NOT NULL
+            )
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS watchlist_version_idx ON watchlist (version)")
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS watchlist_version (
+                id          INTEGER PRIMARY KEY,
+                version     BIGINT NOT NULL
+            )
+        """)
+        self.cursor.execute("INSERT INTO watchlist_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+    
+    def init_subscription_tables(self):
+        """Create the per-user subscription tables
+        
+        `subscribers` holds each user's channels as JSON, e.g.
+        {"telegram": chat_id, "ntfy": topic}; `subscriptions` holds one row of
+        thresholds per user and ticker. Every write bumps the version counter in
+        `subscriptions_version`, so bots reload only after an edit.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subscribers (
+                user_id     VARCHAR(64) PRIMARY KEY,
+                channels    TEXT NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                user_id          VARCHAR(64) NOT NULL,
+                ticker           VARCHAR(10) NOT NULL,
+                upper_threshold  DECIMAL(10,2),
+                lower_threshold  DECIMAL(10,2),
+                PRIMARY KEY (user_id, ticker)
+            )
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS subscriptions_ticker_idx ON subscriptions (ticker)")
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subscriptions_version (
+                id          INTEGER PRIMARY KEY,
+                version     BIGINT NOT NULL
+            )
+        """)
+        self.cursor.execute("INSERT INTO subscriptions_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+    
+    def init_shard_tables(self, partitions: int) -> bool:
+        """Create the worker and partition lease tables used for sharding, with one row per partition"""
+        try:
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS shard_workers (
+                    worker_id   VARCHAR(128) PRIMARY KEY,
+                    last_seen   TIMESTAMP NOT NULL
+                )
+            """)
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS shard_leases (
+                    shard       INTEGER PRIMARY KEY,
+                    owner       VARCHAR(128),
+                    expires_at  TIMESTAMP
+                )
+            """)
+            for shard in range(partitions):
+                self.cursor.execute(
+                    "INSERT INTO shard_leases (shard, owner, expires_at) VALUES (%s, NULL, NULL) ON CONFLICT (shard) DO NOTHING",
+                    (shard,)
+                )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to initialize shard tables: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def init_leader_table(self, name: str) -> bool:
+        """Create the leader lease table and the row for one named lease"""
+        try:
+            self.cursor.execute("""
+                CREATE TABLE IF NOT EXISTS leader_leases (
+                    name        VARCHAR(64) PRIMARY KEY,
+                    owner       VARCHAR(128),
+                    expires_at  TIMESTAMP
+                )
+            """)
+            self.cursor.execute(
+                "INSERT INTO leader_leases (name, owner, expires_at) VALUES (%s, NULL, NULL) ON CONFLICT (name) DO NOTHING",
+                (name,)
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to initialize leader lease table: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
     def insert_price(self, ticker: str, price: float, timestamp: datetime = None):
         """Insert a new price record"""
         if timestamp is None:
@@ -113,6 +229,349 @@ class DatabaseManager:
             logger.error(f"Failed to insert alert for {ticker}: {e}")
             return False
     
+    def _insert_many(self, query: str, rows: List[Tuple]) -> None:
+        """Insert many rows with one multi-row statement per page"""
+        from psycopg2.extras import execute_values
+        execute_values(self.cursor, query, rows, page_size=1000)
+    
+    def insert_prices(self, rows: List[Tuple[str, float, datetime]]) -> bool:
+        """Insert many (ticker, price, timestamp) records in one transaction"""
+        if not rows:
+            return True
+        
+        try:
+            self._insert_many("INSERT INTO price_history (ticker, price, fetched_at) VALUES %s", rows)
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to insert {len(rows)} prices: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def insert_alerts(self, rows: List[Tuple[str, str, float, float, datetime]]) -> bool:
+        """Insert many (ticker, alert_type, price, threshold, timestamp) records in one transaction"""
+        if not rows:
+            return True
+        
+        try:
+            self._insert_many(
+                "INSERT INTO alert_history (ticker, alert_type, price, threshold, sent_at) VALUES %s", rows
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to insert {len(rows)} alerts: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def _bump_watchlist_version(self) -> int:
+        """Increment the watchlist version; the row lock serializes writers until commit"""
+        self.cursor.execute("UPDATE watchlist_version SET version = version + 1 WHERE id = 1 RETURNING version")
+        return self.cursor.fetchone()[0]
+    
+    def _write_watchlist_entries(self, watchlist: Dict[str, Dict]) -> None:
+        """Upsert watchlist entries stamped with a new version"""
+        version = self._bump_watchlist_version()
+        now = datetime.utcnow()
+        for ticker, settings in watchlist.items():
+            self.cursor.execute(
+                """INSERT INTO watchlist (ticker, settings, version, deleted, updated_at) VALUES (%s, %s, %s, FALSE, %s)
+                   ON CONFLICT (ticker) DO UPDATE SET settings = EXCLUDED.settings, version = EXCLUDED.version,
+                   deleted = FALSE, updated_at = EXCLUDED.updated_at""",
+                (ticker, json.dumps(settings), version, now)
+            )
+    
+    def upsert_watchlist_entry(self, ticker: str, settings: Dict) -> bool:
+        """Add a ticker to the watchlist or replace its settings"""
+        try:
+            self._write_watchlist_entries({ticker: settings})
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save watchlist entry for {ticker}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def remove_watchlist_entry(self, ticker: str) -> bool:
+        """Remove a ticker from the watchlist"""
+        try:
+            version = self._bump_watchlist_version()
+            self.cursor.execute(
+                "UPDATE watchlist SET deleted = TRUE, version = %s, updated_at = %s WHERE ticker = %s",
+                (version, datetime.utcnow(), ticker)
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to remove watchlist entry for {ticker}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def seed_watchlist(self, watchlist: Dict[str, Dict]) -> bool:
+        """Fill the watchlist table from `watchlist` if it has never been written"""
+        try:
+            self.cursor.execute("SELECT COUNT(*) FROM watchlist")
+            if self.cursor.fetchone()[0] == 0 and watchlist:
+                self._write_watchlist_entries(watchlist)
+                logger.info(f"Seeded watchlist table with {len(watchlist)} tickers")
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to seed watchlist: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def get_watchlist_version(self) -> Optional[int]:
+        """Get the version of the latest watchlist edit"""
+        try:
+            self.cursor.execute("SELECT version FROM watchlist_version WHERE id = 1")
+            result = self.cursor.fetchone()
+            return int(result[0]) if result else 0
+        except Exception as e:
+            logger.error(f"Failed to get watchlist version: {e}")
+            return None
+    
+    def get_watchlist_changes(self, since: int = 0) -> Optional[List[Dict]]:
+        """Get the watchlist rows written after version `since`, oldest first
+        
+        Removed tickers come back with `deleted` set. With `since=0` this is the
+        whole watchlist history, one row per ticker.
+        """
+        try:
+            self.cursor.execute(
+                "SELECT ticker, settings, version, deleted FROM watchlist WHERE version > %s ORDER BY version ASC",
+                (since,)
+            )
+            return [
+                {'ticker': row[0], 'settings': json.loads(row[1]), 'version': int(row[2]), 'deleted': bool(row[3])}
+                for row in self.cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"Failed to get watchlist changes: {e}")
+            return None
+    
+    def _bump_subscriptions_version(self) -> int:
+        """Increment the subscriptions version; the row lock serializes writers until commit"""
+        self.cursor.execute("UPDATE subscriptions_version SET version = version + 1 WHERE id = 1 RETURNING version")
+        return self.cursor.fetchone()[0]
+    
+    def get_subscriptions_version(self) -> Optional[int]:
+        """Get the version of the latest subscriber or subscription edit"""
+        try:
+            self.cursor.execute("SELECT version FROM subscriptions_version WHERE id = 1")
+            result = self.cursor.fetchone()
+            return int(result[0]) if result else 0
+        except Exception as e:
+            logger.error(f"Failed to get subscriptions version: {e}")
+            return None
+    
+    def upsert_subscriber(self, user_id: str, channels: Dict[str, str]) -> bool:
+        """Add a subscriber or replace their channels"""
+        try:
+            self._bump_subscriptions_version()
+            self.cursor.execute(
+                """INSERT INTO subscribers (user_id, channels) VALUES (%s, %s)
+                   ON CONFLICT (user_id) DO UPDATE SET channels = EXCLUDED.channels""",
+                (user_id, json.dumps(channels))
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save subscriber {user_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def upsert_subscription(self, user_id: str, ticker: str, upper: Optional[float] = None,
+                            lower: Optional[float] = None) -> bool:
+        """Subscribe a user to a ticker or replace their thresholds for it"""
+        try:
+            self._bump_subscriptions_version()
+            self.cursor.execute(
+                """INSERT INTO subscriptions (user_id, ticker, upper_threshold, lower_threshold) VALUES (%s, %s, %s, %s)
+                   ON CONFLICT (user_id, ticker) DO UPDATE SET upper_threshold = EXCLUDED.upper_threshold,
+                   lower_threshold = EXCLUDED.lower_threshold""",
+                (user_id, ticker, upper, lower)
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save subscription of {user_id} to {ticker}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def remove_subscription(self, user_id: str, ticker: str) -> bool:
+        """Unsubscribe a user from a ticker"""
+        try:
+            self._bump_subscriptions_version()
+            self.cursor.execute("DELETE FROM subscriptions WHERE user_id = %s AND ticker = %s", (user_id, ticker))
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to remove subscription of {user_id} to {ticker}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def get_subscribers(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Get every subscriber's channels keyed by user id"""
+        try:
+            self.cursor.execute("SELECT user_id, channels FROM subscribers")
+            return {row[0]: json.loads(row[1]) for row in self.cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Failed to get subscribers: {e}")
+            return None
+    
+    def get_subscriptions(self) -> Optional[List[Dict]]:
+        """Get every subscription"""
+        try:
+            self.cursor.execute("SELECT user_id, ticker, upper_threshold, lower_threshold FROM subscriptions")
+            return [
+                {
+                    'user_id': row[0],
+                    'ticker': row[1],
+                    'upper': float(row[2]) if row[2] is not None else None,
+                    'lower': float(row[3]) if row[3] is not None else None
+                }
+                for row in self.cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"Failed to get subscriptions: {e}")
+            return None
+    
+    def heartbeat_worker(self, worker_id: str, now: datetime, stale_before: datetime) -> Optional[List[str]]:
+        """Record that a worker is alive, forget workers not seen since `stale_before` and return the live ones"""
+        try:
+            self.cursor.execute(
+                """INSERT INTO shard_workers (worker_id, last_seen) VALUES (%s, %s)
+                   ON CONFLICT (worker_id) DO UPDATE SET last_seen = EXCLUDED.last_seen""",
+                (worker_id, now)
+            )
+            self.cursor.execute("DELETE FROM shard_workers WHERE last_seen < %s", (stale_before,))
+            self.cursor.execute("SELECT worker_id FROM shard_workers ORDER BY worker_id")
+            workers = [row[0] for row in self.cursor.fetchall()]
+            self.connection.commit()
+            return workers
+        except Exception as e:
+            logger.error(f"Failed to record heartbeat of worker {worker_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return None
+    
+    def renew_shard_leases(self, worker_id: str, partitions: int, now: datetime,
+                           expires_at: datetime) -> Optional[List[int]]:
+        """Extend the worker's unexpired leases and return the partitions it still holds"""
+        try:
+            self.cursor.execute(
+                """UPDATE shard_leases SET expires_at = %s
+                   WHERE owner = %s AND shard < %s AND expires_at >= %s RETURNING shard""",
+                (expires_at, worker_id, partitions, now)
+            )
+            shards = sorted(row[0] for row in self.cursor.fetchall())
+            self.connection.commit()
+            return shards
+        except Exception as e:
+            logger.error(f"Failed to renew shard leases of worker {worker_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return None
+    
+    def claim_shard_leases(self, worker_id: str, partitions: int, count: int, now: datetime,
+                           expires_at: datetime) -> Optional[List[int]]:
+        """Take up to `count` free or expired partitions and return the ones this worker got
+        
+        The ownership condition is checked again on the row being updated, so
+        when two workers race for a partition only one of them gets it.
+        """
+        try:
+            self.cursor.execute(
+                """UPDATE shard_leases SET owner = %s, expires_at = %s
+                   WHERE shard IN (
+                       SELECT shard FROM shard_leases
+                       WHERE shard < %s AND (owner IS NULL OR expires_at < %s)
+                       ORDER BY shard LIMIT %s
+                   ) AND (owner IS NULL OR expires_at < %s) RETURNING shard""",
+                (worker_id, expires_at, partitions, now, count, now)
+            )
+            shards = sorted(row[0] for row in self.cursor.fetchall())
+            self.connection.commit()
+            return shards
+        except Exception as e:
+            logger.error(f"Failed to claim shard leases for worker {worker_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return None
+    
+    def release_shard_leases(self, worker_id: str, shards: Optional[List[int]] = None) -> bool:
+        """Give up some (or, without `shards`, all) of a worker's partitions"""
+        try:
+            if shards is None:
+                self.cursor.execute(
+                    "UPDATE shard_leases SET owner = NULL, expires_at = NULL WHERE owner = %s", (worker_id,)
+                )
+            for shard in shards or []:
+                self.cursor.execute(
+                    "UPDATE shard_leases SET owner = NULL, expires_at = NULL WHERE owner = %s AND shard = %s",
+                    (worker_id, shard)
+                )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to release shard leases of worker {worker_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def acquire_leader_lease(self, name: str, owner: str, now: datetime, expires_at: datetime) -> Optional[bool]:
+        """Take or renew a named lease if it is free, expired or already ours; None if the database failed"""
+        try:
+            self.cursor.execute(
+                """UPDATE leader_leases SET owner = %s, expires_at = %s
+                   WHERE name = %s AND (owner IS NULL OR owner = %s OR expires_at < %s) RETURNING owner""",
+                (owner, expires_at, name, owner, now)
+            )
+            acquired = self.cursor.fetchone() is not None
+            self.connection.commit()
+            return acquired
+        except Exception as e:
+            logger.error(f"Failed to acquire leader lease {name}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return None
+    
+    def release_leader_lease(self, name: str, owner: str) -> bool:
+        """Give up a named lease if we hold it"""
+        try:
+            self.cursor.execute(
+                "UPDATE leader_leases SET owner = NULL, expires_at = NULL WHERE name = %s AND owner = %s",
+                (name, owner)
+            )
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to release leader lease {name}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
+    def remove_worker(self, worker_id: str) -> bool:
+        """Forget a worker that is shutting down"""
+        try:
+            self.cursor.execute("DELETE FROM shard_workers WHERE worker_id = %s", (worker_id,))
+            self.connection.commit()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to remove worker {worker_id}: {e}")
+            if self.connection:
+                self.connection.rollback()
+            return False
+    
     def get_recent_prices(self, ticker: str = None, limit: int = 10) -> List[Dict]:
         """Get recent price history"""
         try:
@@ -167,6 +626,59 @@ class DatabaseManager:
             logger.error(f"Failed to get recent alerts: {e}")
             return []
     
+    def get_price_history(self, tickers: List[str] = None, since: datetime = None) -> List[Dict]:
+        """Get price history in chronological order, optionally filtered by ticker and start time"""
+        try:
+            query = "SELECT ticker, fetched_at, price FROM price_history"
+            conditions = []
+            params = []
+            if tickers:
+                conditions.append("ticker = ANY(%s)")
+                params.append(list(tickers))
+            if since:
+                conditions.append("fetched_at >= %s")
+                params.append(since)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += " ORDER BY fetched_at ASC"
+            
+            self.cursor.execute(query, tuple(params))
+            return [
+                {'ticker': row[0], 'fetched_at': row[1], 'price': float(row[2])}
+                for row in self.cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"Failed to get price history: {e}")
+            return []
+    
+    def get_latest_prices(self, since: datetime) -> Optional[Dict[str, Dict]]:
+        """Get the most recent price stored since `since` for every ticker"""
+        try:
+            self.cursor.execute("""
+                SELECT p.ticker, p.fetched_at, p.price FROM price_history p
+                JOIN (SELECT ticker, MAX(fetched_at) AS fetched_at FROM price_history
+                      WHERE fetched_at >= %s GROUP BY ticker) latest
+                ON p.ticker = latest.ticker AND p.fetched_at = latest.fetched_at
+            """, (since,))
+            return {row[0]: {'fetched_at': row[1], 'price': float(row[2])} for row in self.cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Failed to get latest prices: {e}")
+            return None
+    
+    def get_recent_alert_types(self, since: datetime) -> Optional[Dict[str, Set[str]]]:
+        """Get the alert types recorded for each ticker since `since`"""
+        try:
+            self.cursor.execute(
+                "SELECT DISTINCT ticker, alert_type FROM alert_history WHERE sent_at >= %s", (since,)
+            )
+            alerted: Dict[str, Set[str]] = {}
+            for ticker, alert_type in self.cursor.fetchall():
+                alerted.setdefault(ticker, set()).add(alert_type)
+            return alerted
+        except Exception as e:
+            logger.error(f"Failed to get recent alerts: {e}")
+            return None
+    
     def get_latest_price(self, ticker: str) -> Optional[float]:
         """Get the latest price for a specific ticker"""
         try:
@@ -0,0 +1,63 @@
+"""
+Active-standby leader election for the API Alert System
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+import logging
+
+from .database import DatabaseManager
+from .sharding import default_worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """Picks one active bot among redundant replicas through a lease in the database
+
+    Every replica calls `heartbeat` periodically. The leader renews the lease;
+    a standby takes it over only once it is free or has expired, in one
+    conditional UPDATE, so at most one replica holds it. A leader that cannot
+    renew steps down as soon as its own lease runs out, before a standby can
+    claim it, and a clean shutdown releases the lease so a standby takes over
+    on its next heartbeat.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, name: str = "alert-bot", worker_id: Optional[str] = None,
+                 lease_seconds: float = 15.0):
+        """Initialize the election for one replica"""
+        self.db_manager = db_manager
+        self.name = name
+        self.worker_id = worker_id or default_worker_id()
+        self.lease = timedelta(seconds=lease_seconds)
+        self.lease_until: Optional[datetime] = None
+        self.ready = False
+
+    def is_leader(self, now: Optional[datetime] = None) -> bool:
+        """Whether this replica holds an unexpired lease"""
+        if self.lease_until is None:
+            return False
+        return self.lease_until > (now if now is not None else datetime.utcnow())
+
+    def heartbeat(self, now: Optional[datetime] = None) -> bool:
+        """Renew or try to take the lease and return whether this replica is now the leader"""
+        if now is None:
+            now = datetime.utcnow()
+        if not self.ready:
+            self.ready = self.db_manager.init_leader_table(self.name)
+            if not self.ready:
+                return False
+        expires_at = now + self.lease
+        acquired = self.db_manager.acquire_leader_lease(self.name, self.worker_id, now, expires_at)
+        if acquired:
+            self.lease_until = expires_at
+        elif acquired is False:
+            self.lease_until = None
+        # On a database error keep the current lease until it runs out
+        return self.is_leader(now)
+
+    def release(self) -> None:
+        """Give up leadership"""
+        if self.lease_until is not None:
+            self.db_manager.release_leader_lease(self.name, self.worker_id)
+            self.lease_until = None
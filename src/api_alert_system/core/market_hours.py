@@ -0,0 +1,122 @@
+"""
+Trading calendars for market-hours-aware polling
+
+Calendar data is kept locally so the scheduler never needs the network to
+decide whether a symbol is trading.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, Optional
+from zoneinfo import ZoneInfo
+
+# NYSE/Nasdaq full-day closures
+US_EQUITY_HOLIDAYS = frozenset(date.fromisoformat(day) for day in (
+    "2025-01-01", "2025-01-09", "2025-01-20", "2025-02-17", "2025-04-18", "2025-05-26",
+    "2025-06-19", "2025-07-04", "2025-09-01", "2025-11-27", "2025-12-25",
+    "2026-01-01", "2026-01-19", "2026-02-16", "2026-04-03", "2026-05-25", "2026-06-19",
+    "2026-07-03", "2026-09-07", "2026-11-26", "2026-12-25",
+    "2027-01-01", "2027-01-18", "2027-02-15", "2027-03-26", "2027-05-31", "2027-06-18",
+    "2027-07-05", "2027-09-06", "2027-11-25", "2027-12-24",
+))
+
+# NYSE/Nasdaq early closes (13:00 New York time)
+US_EQUITY_EARLY_CLOSES = {
+    date.fromisoformat(day): time(13, 0) for day in (
+        "2025-07-03", "2025-11-28", "2025-12-24",
+        "2026-11-27", "2026-12-24",
+        "2027-11-26",
+    )
+}
+
+# Quote currencies that mark a Yahoo ticker as a crypto pair (e.g. "BTC-USD")
+CRYPTO_QUOTE_CURRENCIES = ("USD", "USDT", "USDC", "EUR", "BTC", "ETH")
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive datetimes as UTC, matching datetime.utcnow() elsewhere"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+class TradingCalendar:
+    """Regular trading session for an exchange"""
+
+    def __init__(self, name: str, tz: str = "UTC", open_time: time = time(0, 0),
+                 close_time: time = time(0, 0), weekdays: FrozenSet[int] = frozenset(range(5)),
+                 holidays: FrozenSet[date] = frozenset(), early_closes: Dict[date, time] = None,
+                 always_open: bool = False):
+        """Initialize the calendar"""
+        self.name = name
+        self.tz = ZoneInfo(tz)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.weekdays = weekdays
+        self.holidays = holidays
+        self.early_closes = early_closes or {}
+        self.always_open = always_open
+
+    def is_trading_day(self, day: date) -> bool:
+        """Check whether the exchange has a session on the given local date"""
+        return day.weekday() in self.weekdays and day not in self.holidays
+
+    def session_for(self, day: date) -> Optional[tuple]:
+        """Get the (open, close) UTC datetimes for a local date, or None if closed"""
+        if not self.is_trading_day(day):
+            return None
+        close_time = self.early_closes.get(day, self.close_time)
+        opens = datetime.combine(day, self.open_time, tzinfo=self.tz).astimezone(timezone.utc)
+        closes = datetime.combine(day, close_time, tzinfo=self.tz).astimezone(timezone.utc)
+        return opens, closes
+
+    def is_open(self, moment: datetime) -> bool:
+        """Check whether the market is in session at the given moment"""
+        if self.always_open:
+            return True
+        moment = _as_utc(moment)
+        session = self.session_for(moment.astimezone(self.tz).date())
+        return session is not None and session[0] <= moment < session[1]
+
+    def next_open(self, moment: datetime) -> datetime:
+        """Get the next session open at or after the given moment (UTC)"""
+        moment = _as_utc(moment)
+        if self.always_open:
+            return moment
+
+        day = moment.astimezone(self.tz).date()
+        for offset in range(15):
+            session = self.session_for(day + timedelta(days=offset))
+            if session is not None and session[1] > moment:
+                return max(session[0], moment)
+
+        # Outside the bundled holiday data, fall back to checking again in a day
+        return moment + timedelta(days=1)
+
+
+NYSE = TradingCalendar(
+    "nyse",
+    tz="America/New_York",
+    open_time=time(9, 30),
+    close_time=time(16, 0),
+    holidays=US_EQUITY_HOLIDAYS,
+    early_closes=US_EQUITY_EARLY_CLOSES,
+)
+
+CRYPTO = TradingCalendar("crypto", always_open=True)
+
+CALENDARS: Dict[str, TradingCalendar] = {calendar.name: calendar for calendar in (NYSE, CRYPTO)}
+
+
+def calendar_for(ticker: str, settings: Optional[Dict] = None) -> TradingCalendar:
+    """Get the trading calendar for a ticker
+
+    A watchlist entry can name its calendar explicitly (`"calendar": "crypto"`);
+    otherwise crypto pairs such as "BTC-USD" trade 24/7 and everything else
+    follows the NYSE session.
+    """
+    if settings and settings.get("calendar"):
+        return CALENDARS[settings["calendar"]]
+
+    if "-" in ticker and ticker.rsplit("-", 1)[1] in CRYPTO_QUOTE_CURRENCIES:
+        return CRYPTO
+    return NYSE
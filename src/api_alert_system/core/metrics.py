@@ -0,0 +1,226 @@
+"""
+Lightweight metrics for the API Alert System
+"""
+
+import importlib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Tags = Tuple[Tuple[str, str], ...]
+
+
+def _tag_key(tags: Optional[Dict[str, str]]) -> Tags:
+    return tuple(sorted((key, str(value)) for key, value in tags.items())) if tags else ()
+
+
+def format_series(name: str, tags: Tags) -> str:
+    """Format a metric name with its tags, e.g. notify.seconds{notifier=telegram}"""
+    if not tags:
+        return name
+    return f"{name}{{{','.join(f'{key}={value}' for key, value in tags)}}}"
+
+
+def prometheus_name(name: str, prefix: str = "alertbot") -> str:
+    """Convert a dotted metric name to a Prometheus metric name"""
+    return f"{prefix}_{name}".replace(".", "_").replace("-", "_")
+
+
+def prometheus_labels(tags: Tags, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    """Format tags as a Prometheus label set"""
+    labels = tags + extra
+    if not labels:
+        return ""
+    escape = lambda value: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+
+
+class MetricsSink:
+    """Interface for metrics backends
+
+    Instrumented code reports durations, counters and gauges through these
+    methods; a backend decides what to keep. The base class discards everything,
+    so instrumentation costs almost nothing when metrics are off.
+    """
+
+    name = "none"
+
+    def timing(self, name: str, seconds: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """Record a duration in seconds"""
+
+    def increment(self, name: str, value: float = 1, tags: Optional[Dict[str, str]] = None) -> None:
+        """Add to a counter"""
+
+    def gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """Set a gauge to its current value"""
+
+    @contextmanager
+    def timer(self, name: str, tags: Optional[Dict[str, str]] = None) -> Iterator[None]:
+        """Time the enclosed block with the monotonic clock"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timing(name, time.perf_counter() - started, tags)
+
+    def report(self) -> str:
+        """Human-readable summary of the collected metrics"""
+        return ""
+
+    def prometheus(self) -> str:
+        """The collected metrics in the Prometheus text exposition format"""
+        return ""
+
+
+class InProcessMetrics(MetricsSink):
+    """Keeps counters, gauges and recent timing samples in memory
+
+    Each timing series keeps its last `reservoir_size` samples, from which
+    percentiles are computed on demand, plus an all-time count and sum.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, reservoir_size: int = 2048):
+        """Initialize empty metrics"""
+        self.reservoir_size = reservoir_size
+        self.counters: Dict[Tuple[str, Tags], float] = {}
+        self.gauges: Dict[Tuple[str, Tags], float] = {}
+        self.samples: Dict[Tuple[str, Tags], Deque[float]] = {}
+        self.totals: Dict[Tuple[str, Tags], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def timing(self, name: str, seconds: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """Record a duration in seconds"""
+        key = (name, _tag_key(tags))
+        with self._lock:
+            samples = self.samples.get(key)
+            if samples is None:
+                samples = self.samples[key] = deque(maxlen=self.reservoir_size)
+            samples.append(seconds)
+            count, total = self.totals.get(key, (0, 0.0))
+            self.totals[key] = (count + 1, total + seconds)
+
+    def increment(self, name: str, value: float = 1, tags: Optional[Dict[str, str]] = None) -> None:
+        """Add to a counter"""
+        key = (name, _tag_key(tags))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name: str, value: float, tags: Optional[Dict[str, str]] = None) -> None:
+        """Set a gauge to its current value"""
+        with self._lock:
+            self.gauges[(name, _tag_key(tags))] = value
+
+    def percentiles(self, name: str, tags: Optional[Dict[str, str]] = None,
+                    quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99)) -> Dict[str, float]:
+        """Percentiles of the recent samples of a timing series"""
+        with self._lock:
+            samples = sorted(self.samples.get((name, _tag_key(tags)), ()))
+        if not samples:
+            return {}
+        return {
+            f"p{round(q * 100):d}": samples[min(len(samples) - 1, int(q * len(samples)))]
+            for q in quantiles
+        }
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """All metrics as plain dictionaries keyed by series name"""
+        with self._lock:
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+            totals = dict(self.totals)
+            keys = list(self.samples)
+
+        timings = {}
+        for name, tags in keys:
+            count, total = totals[(name, tags)]
+            timings[format_series(name, tags)] = {
+                "count": count,
+                "sum": total,
+                **self.percentiles(name, dict(tags)),
+            }
+        return {
+            "counters": {format_series(name, tags): value for (name, tags), value in counters.items()},
+            "gauges": {format_series(name, tags): value for (name, tags), value in gauges.items()},
+            "timings": timings,
+        }
+
+    def report(self) -> str:
+        """Human-readable summary of counters and timing percentiles"""
+        snapshot = self.snapshot()
+        lines = []
+        for series, stats in sorted(snapshot["timings"].items()):
+            lines.append(
+                f"{series:45} n={stats['count']:<7} p50={stats['p50'] * 1000:8.2f}ms "
+                f"p90={stats['p90'] * 1000:8.2f}ms p99={stats['p99'] * 1000:8.2f}ms"
+            )
+        for series, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{series:45} {value:g}")
+        for series, value in sorted(snapshot["gauges"].items()):
+            lines.append(f"{series:45} {value:g}")
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Counters, gauges and timing summaries in the Prometheus text exposition format"""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            gauges = sorted(self.gauges.items())
+            totals = sorted(self.totals.items())
+
+        lines = []
+        typed = set()
+
+        def declare(metric: str, kind: str):
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} {kind}")
+
+        for (name, tags), value in counters:
+            metric = prometheus_name(name) + "_total"
+            declare(metric, "counter")
+            lines.append(f"{metric}{prometheus_labels(tags)} {value:g}")
+        for (name, tags), value in gauges:
+            metric = prometheus_name(name)
+            declare(metric, "gauge")
+            lines.append(f"{metric}{prometheus_labels(tags)} {value:g}")
+        for (name, tags), (count, total) in totals:
+            metric = prometheus_name(name)
+            declare(metric, "summary")
+            for quantile, value in zip(("0.5", "0.9", "0.99"), self.percentiles(name, dict(tags)).values()):
+                lines.append(f"{metric}{prometheus_labels(tags, (('quantile', quantile),))} {value:.6g}")
+            lines.append(f"{metric}_sum{prometheus_labels(tags)} {total:.6g}")
+            lines.append(f"{metric}_count{prometheus_labels(tags)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+_metrics: MetricsSink = InProcessMetrics()
+
+
+def get_metrics() -> MetricsSink:
+    """Get the process-wide metrics sink"""
+    return _metrics
+
+
+def set_metrics(sink: MetricsSink) -> MetricsSink:
+    """Replace the process-wide metrics sink"""
+    global _metrics
+    _metrics = sink
+    return sink
+
+
+def create_metrics(name: str) -> MetricsSink:
+    """Create a metrics sink by config name ("inprocess", "none" or "module:Class")"""
+    if name == "inprocess":
+        return InProcessMetrics()
+    if name == "none":
+        return MetricsSink()
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), class_name)()
+    raise ValueError(f"Unknown metrics sink: {name}")
@@ -0,0 +1,99 @@
+"""
+Data models for quotes and alert events
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+class Quote:
+    """A single price observation for a ticker"""
+
+    __slots__ = ("ticker", "price", "timestamp")
+
+    def __init__(self, ticker: str, price: float, timestamp: datetime = None):
+        """Initialize the quote"""
+        self.ticker = ticker
+        self.price = price
+        self.timestamp = timestamp if timestamp is not None else datetime.utcnow()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the quote to a JSON-serializable dict"""
+        return {"ticker": self.ticker, "price": self.price, "timestamp": self.timestamp.isoformat()}
+
+    def __repr__(self) -> str:
+        return f"Quote({self.ticker!r}, {self.price!r}, {self.timestamp!r})"
+
+
+class AlertEvent:
+    """A threshold breach, created once and rendered lazily per channel
+
+    Renderings are cached on the event, so every channel that asks for the
+    same style reuses the same string.
+    """
+
+    __slots__ = ("quote", "alert_type", "threshold", "_rendered")
+
+    def __init__(self, quote: Quote, alert_type: str, threshold: float):
+        """Initialize the alert event"""
+        self.quote = quote
+        self.alert_type = alert_type
+        self.threshold = threshold
+        self._rendered: Optional[Dict[str, str]] = None
+
+    @property
+    def ticker(self) -> str:
+        return self.quote.ticker
+
+    @property
+    def price(self) -> float:
+        return self.quote.price
+
+    @property
+    def timestamp(self) -> datetime:
+        return self.quote.timestamp
+
+    def render(self, markdown: bool = True) -> str:
+        """Render the event as message text, caching the result"""
+        style = "markdown" if markdown else "plain"
+        if self._rendered is None:
+            self._rendered = {}
+        elif style in self._rendered:
+            return self._rendered[style]
+
+        ticker = f"*{self.ticker}*" if markdown else self.ticker
+        if self.alert_type == "UPPER":
+            detail = f"  ⬆️  Above upper threshold: ${self.threshold}"
+        else:
+            detail = f"  ⬇️  Below lower threshold: ${self.threshold}"
+
+        text = f"{ticker}: ${self.price}\n{detail}\n"
+        self._rendered[style] = text
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a JSON-serializable dict"""
+        return {
+            "type": "alert",
+            "ticker": self.ticker,
+            "alert_type": self.alert_type,
+            "price": self.price,
+            "threshold": self.threshold,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+    def __repr__(self) -> str:
+        return f"AlertEvent({self.ticker!r}, {self.alert_type!r}, {self.price!r}, {self.threshold!r})"
+
+
+def render_alert_events(events: List[AlertEvent], markdown: bool = True, timestamp: datetime = None) -> str:
+    """Render a batch of alert events into a single alert message"""
+    if not events:
+        return ""
+
+    if timestamp is None:
+        timestamp = events[0].timestamp
+
+    title = "🚨 *Price Alert*" if markdown else "🚨 Price Alert"
+    stamp = f"`{timestamp}`" if markdown else f"{timestamp}"
+    return f"{title}\n{stamp}\n\n" + "\n".join(event.render(markdown) for event in events) + "\n"
@@ -0,0 +1,164 @@
+"""
+Opt-in profiling of alert cycles
+"""
+
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def format_stack(frame) -> str:
+    """Collapse a frame's call stack, outermost first, as module:function;module:function"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's call stack on a background thread
+
+    Costs one stack walk every `interval` seconds instead of a callback per
+    function call, so it can run on every cycle. Samples are counted per
+    collapsed stack, the input format of flame graph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """Initialize the sampler for a thread"""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[format_stack(frame)] += 1
+
+    def start(self) -> "StackSampler":
+        """Start sampling"""
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the sample counts"""
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+class CycleProfiler:
+    """Profiles every Nth cycle with cProfile and keeps samples of slow cycles
+
+    While enabled, every `every`-th cycle runs under cProfile and is written
+    as a .prof file (open with pstats or snakeviz). All other cycles run under
+    a low-overhead stack sampler when `slow_threshold` is set, and a cycle that
+    takes at least that many seconds is written as collapsed stacks (.folded,
+    for flamegraph.pl or speedscope). Only the newest `max_files` profiles are
+    kept in `output_dir`.
+    """
+
+    def __init__(self, output_dir: str = "data/profiles", every: int = 100, slow_threshold: float = 0.0,
+                 max_files: int = 20, sample_interval: float = 0.005, enabled: bool = False):
+        """Initialize the profiler"""
+        self.output_dir = output_dir
+        self.every = every
+        self.slow_threshold = slow_threshold
+        self.max_files = max_files
+        self.sample_interval = sample_interval
+        self.enabled = enabled
+        self.cycles = 0
+        self.last_profile: Optional[str] = None
+
+    def toggle(self) -> bool:
+        """Switch profiling on or off and return the new state"""
+        self.enabled = not self.enabled
+        logger.info(f"🔬 Cycle profiling {'enabled' if self.enabled else 'disabled'}")
+        return self.enabled
+
+    @contextmanager
+    def profile(self, label: str = "cycle") -> Iterator[None]:
+        """Profile the enclosed cycle if it is due or turns out slow"""
+        if not self.enabled:
+            yield
+            return
+
+        self.cycles += 1
+        profiler = None
+        sampler = None
+        if self.every > 0 and self.cycles % self.every == 0:
+            profiler = cProfile.Profile()
+        elif self.slow_threshold > 0:
+            sampler = StackSampler(threading.get_ident(), self.sample_interval)
+
+        started = time.perf_counter()
+        try:
+            if profiler is not None:
+                profiler.enable()
+            elif sampler is not None:
+                sampler.start()
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler is not None:
+                profiler.disable()
+                self._write_profile(profiler, label, elapsed)
+            elif sampler is not None:
+                samples = sampler.stop()
+                if elapsed >= self.slow_threshold:
+                    self._write_samples(samples, label, elapsed)
+
+    def _path(self, label: str, elapsed: float, extension: str) -> str:
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        return os.path.join(self.output_dir, f"{label}_{stamp}_{self.cycles}_{elapsed * 1000:.0f}ms.{extension}")
+
+    def _write_profile(self, profiler: cProfile.Profile, label: str, elapsed: float) -> None:
+        """Write a cProfile profile"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = self._path(label, elapsed, "prof")
+            profiler.dump_stats(path)
+            self._written(path, elapsed)
+        except Exception as e:
+            logger.error(f"❌ Failed to write profile: {e}")
+
+    def _write_samples(self, samples: Counter, label: str, elapsed: float) -> None:
+        """Write sampled stacks of a slow cycle in collapsed format"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = self._path(label, elapsed, "folded")
+            with open(path, "w") as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            self._written(path, elapsed)
+        except Exception as e:
+            logger.error(f"❌ Failed to write profile samples: {e}")
+
+    def _written(self, path: str, elapsed: float) -> None:
+        """Log a new profile and delete the oldest ones beyond max_files"""
+        logger.info(f"🔬 Profiled cycle {self.cycles} ({elapsed:.3f}s): {path}")
+        self.last_profile = path
+        profiles = sorted(
+            (os.path.join(self.output_dir, name) for name in os.listdir(self.output_dir)
+             if name.endswith((".prof", ".folded"))),
+            key=lambda profile: (os.path.getmtime(profile), profile)
+        )
+        for old in profiles[:max(0, len(profiles) - self.max_files)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
@@ -0,0 +1,154 @@
+"""
+Per-ticker poll scheduling for the API Alert System
+"""
+
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import logging
+
+from .market_hours import calendar_for
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_RANKS = {"high": 0, "normal": 1, "low": 2}
+
+
+class PollScheduler:
+    """Decides which tickers are due for a price fetch
+
+    Tickers sit in a heap keyed on their next-due time (ties go to the higher
+    priority tier), so finding due work only touches the tickers that are due.
+    A ticker's in-session interval comes from its watchlist entry: an explicit
+    `interval` in seconds, else the interval of its `priority` tier, else
+    `in_session_interval`. Off-hours it is polled every `off_hours_interval`
+    seconds, or paused until the next session open when that is 0. Every
+    ticker is polled once when first seen so the bot starts with a full set of
+    prices.
+    """
+
+    def __init__(self, in_session_interval: float, off_hours_interval: float = 0,
+                 market_hours_aware: bool = True, priority_intervals: Dict[str, float] = None):
+        """Initialize the scheduler"""
+        self.in_session_interval = in_session_interval
+        self.off_hours_interval = off_hours_interval
+        self.market_hours_aware = market_hours_aware
+        self.priority_intervals = priority_intervals or {}
+        self.next_due: Dict[str, datetime] = {}
+        self.intervals: Dict[str, float] = {}
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+
+    def interval_for(self, settings: Dict) -> float:
+        """Get the in-session polling interval for a watchlist entry"""
+        if settings.get("interval"):
+            return float(settings["interval"])
+        return float(self.priority_intervals.get(settings.get("priority", "normal"), self.in_session_interval))
+
+    def next_poll_time(self, ticker: str, settings: Dict, now: datetime, interval: float = None) -> datetime:
+        """Compute when a ticker should next be polled after polling it at `now`"""
+        if interval is None:
+            interval = self.interval_for(settings)
+        in_session = now + timedelta(seconds=interval)
+        if not self.market_hours_aware:
+            return in_session
+
+        calendar = calendar_for(ticker, settings)
+        if calendar.is_open(in_session):
+            return in_session
+
+        next_open = calendar.next_open(in_session).replace(tzinfo=None)
+        if self.off_hours_interval > 0:
+            return min(now + timedelta(seconds=self.off_hours_interval), next_open)
+        return next_open
+
+    def schedule(self, ticker: str, when: datetime, settings: Dict = None, interval: float = None) -> None:
+        """Set the next poll time for a ticker, replacing any earlier schedule"""
+        settings = settings or {}
+        self.next_due[ticker] = when
+        self.intervals[ticker] = interval if interval is not None else self.interval_for(settings)
+        rank = PRIORITY_RANKS.get(settings.get("priority", "normal"), 1)
+        heapq.heappush(self._heap, (when, rank, next(self._counter), ticker))
+
+    def unschedule(self, ticker: str) -> None:
+        """Stop polling a ticker"""
+        self.next_due.pop(ticker, None)
+        self.intervals.pop(ticker, None)
+
+    def sync(self, watchlist: Dict, now: datetime = None) -> None:
+        """Add new watchlist tickers (due immediately) and drop removed ones"""
+        if now is None:
+            now = datetime.utcnow()
+
+        for ticker in list(self.next_due):
+            if ticker not in watchlist:
+                self.unschedule(ticker)
+        for ticker, settings in watchlist.items():
+            if ticker not in self.next_due:
+                self.schedule(ticker, now, settings)
+
+        self._compact()
+
+    def apply_changes(self, watchlist: Dict, changed: Dict, removed: List[str], now: datetime = None) -> None:
+        """Apply watchlist edits without a full sync
+
+        Added and edited tickers are polled immediately with their new
+        settings; removed tickers are dropped.
+        """
+        if now is None:
+            now = datetime.utcnow()
+        for ticker in removed:
+            self.unschedule(ticker)
+        for ticker, settings in changed.items():
+            self.schedule(ticker, now, settings)
+        self._compact()
+
+    def _compact(self) -> None:
+        """Drop stale heap entries once they dominate the heap"""
+        if len(self._heap) > 2 * len(self.next_due) + 64:
+            self._heap = [(due, rank, seq, ticker) for due, rank, seq, ticker in self._heap
+                          if self.next_due.get(ticker) == due]
+            heapq.heapify(self._heap)
+
+    def due_tickers(self, watchlist: Dict, now: datetime = None) -> List[str]:
+        """Get the tickers due for polling and schedule their next poll"""
+        if now is None:
+            now = datetime.utcnow()
+        # Scheduled tickers mirror the watchlist; any membership change needs a sync
+        if self.next_due.keys() != watchlist.keys():
+            self.sync(watchlist, now)
+
+        due = []
+        seen = set()
+        while self._heap and self._heap[0][0] <= now:
+            when, _, _, ticker = heapq.heappop(self._heap)
+            if self.next_due.get(ticker) != when or ticker in seen:
+                continue  # Stale entry left behind by a reschedule or removal
+            seen.add(ticker)
+            if ticker not in watchlist:
+                self.unschedule(ticker)
+                continue
+            due.append(ticker)
+
+        for ticker in due:
+            settings = watchlist[ticker]
+            self.schedule(ticker, self.next_poll_time(ticker, settings, now), settings)
+        return due
+
+    def seconds_until_next(self, now: datetime = None) -> Optional[float]:
+        """Seconds until the earliest scheduled poll, or None if nothing is scheduled"""
+        if not self.next_due:
+            return None
+        if now is None:
+            now = datetime.utcnow()
+        return max(0.0, (min(self.next_due.values()) - now).total_seconds())
+
+    def paused_tickers(self, now: datetime = None) -> List[str]:
+        """Tickers whose next poll is further away than their own interval"""
+        if now is None:
+            now = datetime.utcnow()
+        return [
+            ticker for ticker, due in self.next_due.items()
+            if due > now + timedelta(seconds=self.intervals.get(ticker, self.in_session_interval))
+        ]
@@ -0,0 +1,136 @@
+"""
+Watchlist sharding across bot workers for the API Alert System
+"""
+
+import math
+import os
+import socket
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from .database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+    """A worker id unique per container and process"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def partition_for(ticker: str, partitions: int) -> int:
+    """Map a ticker to its partition; stable across processes and restarts"""
+    return zlib.crc32(ticker.encode("utf-8")) % partitions
+
+
+class ShardCoordinator:
+    """Splits the watchlist between bot workers through leases in the database
+
+    Tickers hash into a fixed number of partitions. Every worker heartbeats
+    into `shard_workers` and holds time-limited leases in `shard_leases` on its
+    fair share of the partitions: ceil(partitions / live workers). On each
+    heartbeat a worker renews its leases, hands back partitions beyond its
+    share so a worker that just joined can take them, and claims free or
+    expired partitions up to its share, which also takes over the partitions
+    of a worker that stopped once their leases lapse.
+
+    A lease is only claimed when it is free or expired, in one conditional
+    UPDATE, and a worker only polls a partition until its own lease expires,
+    so each ticker is polled by exactly one worker at a time (given clocks
+    that agree to well within the lease length). A worker that cannot reach
+    the lease tables owns nothing and keeps retrying on each heartbeat.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, worker_id: Optional[str] = None, partitions: int = 64,
+                 lease_seconds: float = 30.0):
+        """Initialize the coordinator for one worker"""
+        self.db_manager = db_manager
+        self.worker_id = worker_id or default_worker_id()
+        self.partitions = max(1, partitions)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.owned: Dict[int, datetime] = {}
+        self.live_workers: List[str] = []
+        self.ready = False
+        self.connected = False
+
+    def start(self) -> bool:
+        """Create the lease rows and claim a first share; return whether the leases were reached"""
+        self.rebalance()
+        if self.connected:
+            logger.info(f"🧩 Worker {self.worker_id} holds {len(self.owned)}/{self.partitions} partitions")
+        return self.connected
+
+    def partition_for(self, ticker: str) -> int:
+        """Get the partition a ticker belongs to"""
+        return partition_for(ticker, self.partitions)
+
+    def fair_share(self) -> int:
+        """How many partitions this worker should hold"""
+        return math.ceil(self.partitions / max(1, len(self.live_workers)))
+
+    def rebalance(self, now: Optional[datetime] = None) -> bool:
+        """Heartbeat, renew leases and move partitions toward a fair share; return whether ownership changed"""
+        if now is None:
+            now = datetime.utcnow()
+        before = set(self.owned)
+        expires_at = now + self.lease
+        db = self.db_manager
+
+        if not self.ready:
+            self.ready = db.init_shard_tables(self.partitions)
+            if not self.ready:
+                self.connected = False
+                return False
+
+        workers = db.heartbeat_worker(self.worker_id, now, stale_before=now - self.lease)
+        if workers is not None:
+            self.live_workers = workers
+        renewed = db.renew_shard_leases(self.worker_id, self.partitions, now, expires_at)
+        self.connected = renewed is not None
+        if renewed is None:
+            # Keep polling only what the leases we already had still cover
+            self.owned = {shard: until for shard, until in self.owned.items() if until > now}
+            return set(self.owned) != before
+        self.owned = {shard: expires_at for shard in renewed}
+
+        share = self.fair_share()
+        if len(self.owned) > share:
+            extra = sorted(self.owned)[share:]
+            if db.release_shard_leases(self.worker_id, extra):
+                for shard in extra:
+                    del self.owned[shard]
+        elif len(self.owned) < share:
+            claimed = db.claim_shard_leases(self.worker_id, self.partitions, share - len(self.owned), now, expires_at)
+            for shard in claimed or []:
+                self.owned[shard] = expires_at
+
+        changed = set(self.owned) != before
+        if changed:
+            logger.info(
+                f"🧩 Worker {self.worker_id} now holds {len(self.owned)}/{self.partitions} partitions "
+                f"({len(self.live_workers)} live workers)"
+            )
+        return changed
+
+    def owns(self, ticker: str, now: Optional[datetime] = None) -> bool:
+        """Whether this worker currently holds the lease on a ticker's partition"""
+        until = self.owned.get(self.partition_for(ticker))
+        if until is None:
+            return False
+        return until > (now if now is not None else datetime.utcnow())
+
+    def owned_tickers(self, tickers: Iterable[str]) -> List[str]:
+        """Filter tickers down to the ones this worker polls"""
+        now = datetime.utcnow()
+        return [ticker for ticker in tickers if self.owns(ticker, now)]
+
+    def stop(self) -> None:
+        """Hand back every partition so other workers take over without waiting for expiry"""
+        if not self.ready:
+            return
+        self.db_manager.release_shard_leases(self.worker_id)
+        self.db_manager.remove_worker(self.worker_id)
+        self.owned = {}
+        logger.info(f"🧩 Worker {self.worker_id} released its partitions")
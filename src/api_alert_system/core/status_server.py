@@ -0,0 +1,67 @@
+"""
+Embedded HTTP server exposing /metrics and /healthz
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class StatusServer:
+    """Serves Prometheus metrics and a health check from a background thread
+
+    `render_metrics` returns the /metrics body and `check_health` returns
+    whether the process is healthy plus details for the /healthz body, which is
+    answered with 200 or 503 so probes only need an HTTP client.
+    """
+
+    def __init__(self, render_metrics: Callable[[], str], check_health: Callable[[], Tuple[bool, Dict]],
+                 host: str = "0.0.0.0", port: int = 9108):
+        """Initialize and start the server"""
+        self.render_metrics = render_metrics
+        self.check_health = check_health
+        status = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                try:
+                    if path == "/metrics":
+                        self._respond(200, PROMETHEUS_CONTENT_TYPE, status.render_metrics().encode("utf-8"))
+                    elif path in ("/healthz", "/health"):
+                        healthy, details = status.check_health()
+                        body = json.dumps({"status": "ok" if healthy else "unhealthy", **details}).encode("utf-8")
+                        self._respond(200 if healthy else 503, "application/json", body)
+                    else:
+                        self._respond(404, "text/plain", b"Not found\n")
+                except Exception as e:
+                    logger.error(f"❌ Status endpoint {path} failed: {e}")
+                    self._respond(500, "text/plain", b"Internal error\n")
+
+            def _respond(self, code: int, content_type: str, body: bytes):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.host, self.port = self.server.server_address[:2]
+        self._thread = threading.Thread(target=self.server.serve_forever, name="status-server", daemon=True)
+        self._thread.start()
+        logger.info(f"🩺 Status endpoint on http://{host}:{self.port} (/metrics, /healthz)")
+
+    def close(self) -> None:
+        """Stop the server"""
+        self.server.shutdown()
+        self.server.server_close()
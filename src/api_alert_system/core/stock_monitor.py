@@ -2,63 +2,132 @@
 Stock price monitoring for the API Alert System
 """
 
-import yfinance as yf
-import random
+import math
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 import logging
 
+from ..utils.helpers import format_percentage_change
+from ..providers.base import QuoteProvider
+from .metrics import get_metrics
+from .tracing import get_current_span
+from .models import AlertEvent, Quote
+
 logger = logging.getLogger(__name__)
 
 
 class StockMonitor:
     """Handles stock price fetching and monitoring"""
     
-    def __init__(self, demo_mode: bool = False):
-        """Initialize the stock monitor"""
+    def __init__(self, demo_mode: bool = False, delta_tick: float = 0.0,
+                 delta_percent: float = 0.0, full_snapshot_interval: int = 300,
+                 history_size: int = 60, provider: Optional[QuoteProvider] = None):
+        """Initialize the stock monitor
+        
+        Prices come from `provider`; without one, demo mode uses synthetic
+        prices and otherwise Yahoo Finance is used.
+        """
         self.demo_mode = demo_mode
-        self.base_prices = {
-            # Stocks
-            "AAPL": 190, "TSLA": 250, "SPY": 470, "NVDA": 140,
-            # Cryptocurrencies
-            "BTC-USD": 95000, "LTC-USD": 110, "BCH-USD": 450
-        }
+        if provider is None:
+            from ..providers.factory import create_provider
+            provider = create_provider("synthetic" if demo_mode else "yfinance")
+        self.provider = provider
+        
+        # Recent (monotonic time, price) samples per ticker, used to estimate volatility
+        self.history_size = history_size
+        self.price_history: Dict[str, deque] = {}
+        
+        # Delta price updates: last price sent per ticker and when the last full table went out
+        self.delta_tick = delta_tick
+        self.delta_percent = delta_percent
+        self.full_snapshot_interval = full_snapshot_interval
+        self.last_sent_prices: Dict[str, Optional[float]] = {}
+        self.last_snapshot_at: Optional[datetime] = None
+        # What the last formatted message would move them to, applied by mark_sent
+        self._pending_sent: Optional[Tuple[Dict[str, Optional[float]], Optional[datetime]]] = None
     
     def get_stock_price(self, ticker: str) -> Optional[float]:
         """Fetch current stock price with error handling"""
         try:
-            if self.demo_mode:
-                # Return mock data for demo
-                base = self.base_prices.get(ticker, 100)
-                return base + random.uniform(-10, 10)
-            
-            data = yf.Ticker(ticker)
-            # Use fast history method
-            hist = data.history(period="1d", interval="1m")
-            if hist.empty:
-                logger.warning(f"No data available for {ticker}")
-                return None
-            
-            # Take the last available "Close" price
-            latest_price = float(hist["Close"].iloc[-1])
-            return latest_price
-            
+            quote = self.provider.get_quote(ticker)
+            return quote.price if quote is not None else None
         except Exception as e:
             logger.error(f"Error fetching {ticker}: {e}")
             return None
     
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """Fetch quotes for several tickers in one provider call"""
+        metrics = get_metrics()
+        tags = {"provider": self.provider.name}
+        started = time.perf_counter()
+        try:
+            quotes = self.provider.get_quotes(tickers)
+        except Exception as e:
+            logger.error(f"Error fetching quotes: {e}")
+            metrics.increment("fetch.errors", tags=tags)
+            quotes = {ticker: None for ticker in tickers}
+        metrics.timing("fetch.batch.seconds", time.perf_counter() - started, tags)
+        missing = [ticker for ticker in tickers if quotes.get(ticker) is None]
+        metrics.increment("fetch.quotes", len(tickers) - len(missing), tags)
+        metrics.increment("fetch.missing", len(missing), tags)
+        
+        span = get_current_span()
+        if span.is_recording():
+            span.set_attribute("provider", self.provider.name)
+            span.set_attribute("quotes", len(tickers) - len(missing))
+            if missing:
+                span.set_attribute("missing", ",".join(missing))
+        return quotes
+    
     def get_prices_for_watchlist(self, watchlist: Dict) -> Dict[str, Optional[float]]:
         """Get prices for all tickers in the watchlist"""
+        quotes = self.get_quotes(list(watchlist.keys()))
         prices = {}
         for ticker in watchlist.keys():
-            price = self.get_stock_price(ticker)
+            quote = quotes.get(ticker)
+            price = quote.price if quote is not None else None
             prices[ticker] = price
             if price is not None:
+                self.record_price(ticker, price)
                 logger.info(f"📊 {ticker}: ${price:.2f}")
-            else:
+            elif self.provider.is_available(ticker):
                 logger.warning(f"⚠️  Could not fetch price for {ticker}")
+            else:
+                logger.debug(f"Skipped {ticker}: circuit open")
         return prices
     
+    def record_price(self, ticker: str, price: float, at: float = None) -> None:
+        """Add a price to the in-process history for a ticker"""
+        history = self.price_history.get(ticker)
+        if history is None:
+            history = self.price_history[ticker] = deque(maxlen=self.history_size)
+        history.append((time.monotonic() if at is None else at, price))
+    
+    def get_volatility(self, ticker: str) -> Optional[float]:
+        """Per-second standard deviation of log returns from the recent history
+        
+        Returns None until at least three samples have been recorded.
+        """
+        history = self.price_history.get(ticker)
+        if history is None or len(history) < 3:
+            return None
+        
+        variance_sum = 0.0
+        count = 0
+        previous_time, previous_price = history[0]
+        for sample_time, price in list(history)[1:]:
+            elapsed = sample_time - previous_time
+            if elapsed > 0 and previous_price > 0 and price > 0:
+                variance_sum += math.log(price / previous_price) ** 2 / elapsed
+                count += 1
+            previous_time, previous_price = sample_time, price
+        
+        if count == 0:
+            return None
+        return math.sqrt(variance_sum / count)
+    
     def check_thresholds(self, ticker: str, price: float, thresholds: Dict) -> List[str]:
         """Check if price crosses any thresholds and return alert types"""
         alerts = []
@@ -90,11 +159,83 @@ class StockMonitor:
         
         return alerts
     
-    def format_price_message(self, prices: Dict[str, Optional[float]], timestamp: datetime = None) -> str:
-        """Format price data into a readable message"""
+    def build_alert_events(self, watchlist: Dict, prices: Dict[str, Optional[float]],
+                           timestamp: datetime = None) -> List[AlertEvent]:
+        """Create one AlertEvent per threshold breach in the watchlist"""
         if timestamp is None:
             timestamp = datetime.utcnow()
         
+        events = []
+        for ticker, thresholds in watchlist.items():
+            price = prices.get(ticker)
+            if price is None:
+                continue
+            
+            alert_types = self.check_thresholds(ticker, price, thresholds)
+            if not alert_types:
+                continue
+            
+            quote = Quote(ticker, price, timestamp)
+            for alert_type in alert_types:
+                threshold = thresholds['upper'] if alert_type == 'UPPER' else thresholds['lower']
+                events.append(AlertEvent(quote, alert_type, threshold))
+        
+        return events
+    
+    def has_price_moved(self, ticker: str, price: Optional[float]) -> bool:
+        """Check whether a price moved enough since it was last sent"""
+        if ticker not in self.last_sent_prices:
+            return True
+        
+        last_price = self.last_sent_prices[ticker]
+        if price is None or last_price is None:
+            return price != last_price
+        
+        change = abs(price - last_price)
+        if self.delta_tick > 0 and change >= self.delta_tick:
+            return True
+        if self.delta_percent > 0 and last_price != 0 and change / abs(last_price) * 100 >= self.delta_percent:
+            return True
+        return False
+    
+    def get_changed_prices(self, prices: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+        """Get the tickers whose price moved since the last sent message"""
+        return {ticker: price for ticker, price in prices.items() if self.has_price_moved(ticker, price)}
+    
+    def is_snapshot_due(self, timestamp: datetime) -> bool:
+        """Check whether a full price snapshot should be sent"""
+        if self.last_snapshot_at is None:
+            return True
+        return (timestamp - self.last_snapshot_at).total_seconds() >= self.full_snapshot_interval
+    
+    def format_price_message(self, prices: Dict[str, Optional[float]], timestamp: datetime = None,
+                             delta: bool = False) -> str:
+        """Format price data into a readable message
+        
+        In delta mode only tickers that moved since the last message are included,
+        with a full snapshot every `full_snapshot_interval` seconds. Returns an
+        empty string when nothing moved. Call `mark_sent` once the message went
+        out; until then the next message is computed against the same baseline.
+        """
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        
+        if delta and not self.is_snapshot_due(timestamp):
+            changed = self.get_changed_prices(prices)
+            if not changed:
+                return ""
+            
+            message = f"📊 *Stock Price Changes*\n`{timestamp}`\n\n"
+            for ticker, price in changed.items():
+                if price is not None:
+                    change = format_percentage_change(self.last_sent_prices.get(ticker), price)
+                    message += f"`{ticker:8} ${price:8.2f} {change:>8}`\n"
+                else:
+                    message += f"`{ticker:8} N/A`\n"
+            
+            self._pending_sent = (changed, None)
+            return message
+        
         message = f"📊 *Stock Price Update*\n`{timestamp}`\n\n"
         
         for ticker, price in prices.items():
@@ -103,8 +244,19 @@ class StockMonitor:
             else:
                 message += f"`{ticker:8} N/A`\n"
         
+        self._pending_sent = (dict(prices), timestamp)
         return message
     
+    def mark_sent(self) -> None:
+        """Record the last formatted price message as sent, moving the delta baseline"""
+        if self._pending_sent is None:
+            return
+        prices, snapshot_at = self._pending_sent
+        self.last_sent_prices.update(prices)
+        if snapshot_at is not None:
+            self.last_snapshot_at = snapshot_at
+        self._pending_sent = None
+    
     def format_alert_message(self, alerts: Dict[str, List[str]], prices: Dict[str, Optional[float]], watchlist: Dict) -> str:
         """Format alert data into a readable message"""
         if not alerts:
@@ -0,0 +1,158 @@
+"""
+Streaming quote ingestion for the API Alert System
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+import logging
+
+from ..providers.base import QuoteProvider
+from .metrics import get_metrics
+from .models import AlertEvent, Quote
+from .stock_monitor import StockMonitor
+from .subscriptions import Subscriptions
+
+logger = logging.getLogger(__name__)
+
+AlertCallback = Callable[[List[AlertEvent]], Union[None, Awaitable[None]]]
+UserAlertCallback = Callable[[Dict[str, List[AlertEvent]]], Union[None, Awaitable[None]]]
+
+
+class StreamingAlertEngine:
+    """Evaluates thresholds per tick as quotes are pushed into a queue
+
+    A producer task copies quotes from a provider's `stream` into a bounded
+    asyncio queue and a consumer checks each one against the watchlist as it
+    arrives. Alerts fire when a ticker moves into breach of a threshold rather
+    than on every tick it stays there, since ticks can arrive many times a
+    second. Subscribers' rules are checked the same way, with alerts grouped
+    per user. The latest quote per ticker is kept for periodic persistence and
+    price updates.
+    """
+
+    def __init__(self, stock_monitor: StockMonitor, watchlist: Dict, on_alerts: AlertCallback,
+                 queue_size: int = 10000, subscriptions: Optional[Subscriptions] = None,
+                 on_user_alerts: Optional[UserAlertCallback] = None):
+        """Initialize the engine"""
+        self.stock_monitor = stock_monitor
+        self.watchlist = watchlist
+        self.on_alerts = on_alerts
+        self.subscriptions = subscriptions
+        self.on_user_alerts = on_user_alerts
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.latest: Dict[str, Quote] = {}
+        self.updated: Dict[str, Quote] = {}
+        self.breaches: Dict[str, frozenset] = {}
+        # ticker -> user_id -> (alert_type, threshold) rules the user's last tick breached
+        self.user_breaches: Dict[str, Dict[str, FrozenSet[Tuple[str, float]]]] = {}
+        self.ticks_processed = 0
+        self.tickers: List[str] = []
+        self._producer: Optional[asyncio.Task] = None
+        self._resubscribe_to: Optional[List[str]] = None
+
+    def evaluate(self, quote: Quote) -> List[AlertEvent]:
+        """Check one quote and return alerts for thresholds it newly breaches"""
+        self.latest[quote.ticker] = quote
+        self.updated[quote.ticker] = quote
+        self.stock_monitor.record_price(quote.ticker, quote.price)
+        self.ticks_processed += 1
+
+        thresholds = self.watchlist.get(quote.ticker)
+        if thresholds is None:
+            return []
+
+        breached = frozenset(self.stock_monitor.check_thresholds(quote.ticker, quote.price, thresholds))
+        new_breaches = breached - self.breaches.get(quote.ticker, frozenset())
+        self.breaches[quote.ticker] = breached
+
+        return [
+            AlertEvent(quote, alert_type, thresholds['upper'] if alert_type == 'UPPER' else thresholds['lower'])
+            for alert_type in sorted(new_breaches)
+        ]
+
+    def evaluate_subscriptions(self, quote: Quote) -> Dict[str, List[AlertEvent]]:
+        """Check one quote against subscribers' rules and return each user's newly breached ones"""
+        if self.subscriptions is None:
+            return {}
+
+        matched = self.subscriptions.build_alert_events({quote.ticker: quote.price}, quote.timestamp)
+        previous = self.user_breaches.get(quote.ticker, {})
+        breaches = {}
+        new_events = {}
+        for user_id, events in matched.items():
+            breached = frozenset((event.alert_type, event.threshold) for event in events)
+            breaches[user_id] = breached
+            seen = previous.get(user_id, frozenset())
+            fresh = [event for event in events if (event.alert_type, event.threshold) not in seen]
+            if fresh:
+                new_events[user_id] = fresh
+        if breaches:
+            self.user_breaches[quote.ticker] = breaches
+        else:
+            self.user_breaches.pop(quote.ticker, None)
+        return new_events
+
+    def take_updates(self) -> Dict[str, Quote]:
+        """Get the latest quote of every ticker that ticked since the last call"""
+        updated, self.updated = self.updated, {}
+        return updated
+
+    async def produce(self, provider: QuoteProvider, tickers: List[str], interval: float = 1.0) -> None:
+        """Push quotes from the provider into the queue"""
+        async for quote in provider.stream(tickers, interval=interval):
+            await self.queue.put(quote)
+
+    async def consume(self) -> None:
+        """Evaluate queued quotes as they arrive"""
+        while True:
+            quote = await self.queue.get()
+            try:
+                started = time.perf_counter()
+                events = self.evaluate(quote)
+                user_events = self.evaluate_subscriptions(quote)
+                get_metrics().timing("stream.evaluate.seconds", time.perf_counter() - started)
+                if events:
+                    result = self.on_alerts(events)
+                    if inspect.isawaitable(result):
+                        await result
+                if user_events and self.on_user_alerts is not None:
+                    result = self.on_user_alerts(user_events)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as e:
+                logger.error(f"❌ Failed to evaluate {quote.ticker}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def resubscribe(self, tickers: List[str]) -> None:
+        """Restart the provider stream with a new ticker list, e.g. after watchlist edits"""
+        self._resubscribe_to = list(tickers)
+        if self._producer is not None:
+            self._producer.cancel()
+
+    async def run(self, provider: QuoteProvider, tickers: Optional[List[str]] = None,
+                  interval: float = 1.0) -> None:
+        """Run producer and consumer until the provider's stream ends"""
+        if tickers is None:
+            tickers = list(self.watchlist)
+
+        consumer = asyncio.create_task(self.consume())
+        try:
+            while True:
+                self.tickers = list(tickers)
+                self._producer = asyncio.create_task(self.produce(provider, self.tickers, interval))
+                try:
+                    await self._producer
+                    break
+                except asyncio.CancelledError:
+                    if self._resubscribe_to is None:
+                        raise
+                    tickers, self._resubscribe_to = self._resubscribe_to, None
+                    logger.info(f"📡 Resubscribed to {len(tickers)} tickers")
+            await self.queue.join()
+        finally:
+            if self._producer is not None:
+                self._producer.cancel()
+            consumer.cancel()
@@ -0,0 +1,191 @@
+"""
+Per-user alert subscriptions for the API Alert System
+"""
+
+import bisect
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from .database import DatabaseManager
+from .models import AlertEvent, Quote
+
+logger = logging.getLogger(__name__)
+
+# (channel name, destination, events), as taken by NotifierRegistry.deliver_routed
+Route = Tuple[str, str, List[AlertEvent]]
+
+
+class ThresholdIndex:
+    """One side of one ticker's thresholds, sorted with the users they belong to"""
+
+    __slots__ = ("thresholds", "users")
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self.thresholds: List[float] = []
+        self.users: List[str] = []
+
+    def add(self, threshold: float, user_id: str) -> None:
+        """Insert a user's threshold in order"""
+        i = bisect.bisect_right(self.thresholds, threshold)
+        self.thresholds.insert(i, threshold)
+        self.users.insert(i, user_id)
+
+    def remove(self, threshold: float, user_id: str) -> None:
+        """Delete a user's threshold"""
+        i = bisect.bisect_left(self.thresholds, threshold)
+        while i < len(self.thresholds) and self.thresholds[i] == threshold:
+            if self.users[i] == user_id:
+                del self.thresholds[i]
+                del self.users[i]
+                return
+            i += 1
+
+    def __len__(self) -> int:
+        return len(self.thresholds)
+
+
+class RuleStore:
+    """Subscriber thresholds indexed per ticker
+
+    Each ticker keeps its upper and lower thresholds in sorted arrays, so the
+    rules a price breaches are one bisection per side away: every upper
+    threshold at or below the price and every lower threshold at or above it.
+    Evaluating a ticker costs O(log n + matches) however many users watch it.
+    """
+
+    def __init__(self):
+        """Initialize an empty store"""
+        self.rules: Dict[Tuple[str, str], Tuple[Optional[float], Optional[float]]] = {}
+        self._upper: Dict[str, ThresholdIndex] = {}
+        self._lower: Dict[str, ThresholdIndex] = {}
+        self._counts: Dict[str, int] = {}
+
+    def add(self, user_id: str, ticker: str, upper: Optional[float] = None, lower: Optional[float] = None) -> None:
+        """Add a user's rule for a ticker, replacing any previous one"""
+        self.remove(user_id, ticker)
+        self.rules[(user_id, ticker)] = (upper, lower)
+        self._counts[ticker] = self._counts.get(ticker, 0) + 1
+        if upper is not None:
+            self._upper.setdefault(ticker, ThresholdIndex()).add(upper, user_id)
+        if lower is not None:
+            self._lower.setdefault(ticker, ThresholdIndex()).add(lower, user_id)
+
+    def remove(self, user_id: str, ticker: str) -> bool:
+        """Remove a user's rule for a ticker"""
+        rule = self.rules.pop((user_id, ticker), None)
+        if rule is None:
+            return False
+        upper, lower = rule
+        if upper is not None:
+            self._upper[ticker].remove(upper, user_id)
+        if lower is not None:
+            self._lower[ticker].remove(lower, user_id)
+        self._counts[ticker] -= 1
+        if self._counts[ticker] == 0:
+            del self._counts[ticker]
+            self._upper.pop(ticker, None)
+            self._lower.pop(ticker, None)
+        return True
+
+    def tickers(self) -> List[str]:
+        """Tickers with at least one subscriber"""
+        return list(self._counts)
+
+    def nearest(self, ticker: str) -> Dict[str, Optional[float]]:
+        """Get the lowest upper and highest lower threshold on a ticker, the first ones a move reaches"""
+        upper = self._upper.get(ticker)
+        lower = self._lower.get(ticker)
+        return {
+            "upper": upper.thresholds[0] if upper else None,
+            "lower": lower.thresholds[-1] if lower else None,
+        }
+
+    def match(self, ticker: str, price: float) -> List[Tuple[str, str, float]]:
+        """Get (user_id, alert_type, threshold) for every rule the price breaches"""
+        matches = []
+        upper = self._upper.get(ticker)
+        if upper is not None:
+            end = bisect.bisect_right(upper.thresholds, price)
+            matches.extend(zip(upper.users[:end], ["UPPER"] * end, upper.thresholds[:end]))
+        lower = self._lower.get(ticker)
+        if lower is not None:
+            start = bisect.bisect_left(lower.thresholds, price)
+            count = len(lower) - start
+            matches.extend(zip(lower.users[start:], ["LOWER"] * count, lower.thresholds[start:]))
+        return matches
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class Subscriptions:
+    """Users' alert rules and the channels their alerts are routed to"""
+
+    def __init__(self, rules: Optional[RuleStore] = None, channels: Optional[Dict[str, Dict[str, str]]] = None):
+        """Initialize from a rule store and each user's {channel: destination} map"""
+        self.rules = rules if rules is not None else RuleStore()
+        self.channels: Dict[str, Dict[str, str]] = channels if channels is not None else {}
+        self.version = 0
+
+    def load(self, db_manager: DatabaseManager) -> bool:
+        """Replace the rules and channels with the ones stored in the database"""
+        # Read the version first: an edit racing the load shows up as a newer version next poll
+        version = db_manager.get_subscriptions_version()
+        subscribers = db_manager.get_subscribers()
+        subscriptions = db_manager.get_subscriptions()
+        if version is None or subscribers is None or subscriptions is None:
+            return False
+
+        rules = RuleStore()
+        for row in subscriptions:
+            rules.add(row['user_id'], row['ticker'], row['upper'], row['lower'])
+        self.rules = rules
+        self.channels = subscribers
+        self.version = version
+        logger.info(f"👥 Loaded {len(rules)} subscriptions of {len(subscribers)} users on {len(rules.tickers())} tickers")
+        return True
+
+    def poll(self, db_manager: DatabaseManager) -> bool:
+        """Reload when the subscriptions changed since the last load; return whether they did"""
+        version = db_manager.get_subscriptions_version()
+        if version is None or version == self.version:
+            return False
+        return self.load(db_manager)
+
+    def build_alert_events(self, prices: Dict[str, Optional[float]],
+                           timestamp: datetime = None) -> Dict[str, List[AlertEvent]]:
+        """Evaluate the prices against every rule and group the alert events by user
+
+        Users breaching the same threshold share one event, so it is rendered
+        once per channel style.
+        """
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+
+        by_user: Dict[str, List[AlertEvent]] = {}
+        for ticker, price in prices.items():
+            if price is None:
+                continue
+            matches = self.rules.match(ticker, price)
+            if not matches:
+                continue
+
+            quote = Quote(ticker, price, timestamp)
+            shared: Dict[Tuple[str, float], AlertEvent] = {}
+            for user_id, alert_type, threshold in matches:
+                event = shared.get((alert_type, threshold))
+                if event is None:
+                    event = shared[(alert_type, threshold)] = AlertEvent(quote, alert_type, threshold)
+                by_user.setdefault(user_id, []).append(event)
+        return by_user
+
+    def routes(self, events_by_user: Dict[str, List[AlertEvent]]) -> List[Route]:
+        """Address each user's events to every channel the user has set up"""
+        return [
+            (channel, destination, events)
+            for user_id, events in events_by_user.items()
+            for channel, destination in self.channels.get(user_id, {}).items()
+            if destination
+        ]
@@ -0,0 +1,287 @@
+"""
+Tracing spans for the API Alert System
+
+The tracer mirrors the subset of the OpenTelemetry API the bot uses
+(`start_as_current_span`, `set_attribute`, `record_exception`), so the
+built-in tracer and a real OpenTelemetry tracer are interchangeable.
+"""
+
+import contextvars
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    def __init__(self, name: str, tracer: "Tracer", parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """Start the span"""
+        self.name = name
+        self.tracer = tracer
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "OK"
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.duration_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Tag the span"""
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Mark the span as failed by an exception"""
+        self.status = "ERROR"
+        self.attributes["exception.type"] = type(exception).__name__
+        self.attributes["exception.message"] = str(exception)
+
+    def is_recording(self) -> bool:
+        return True
+
+    def end(self) -> None:
+        """Finish the span and hand it to the exporter"""
+        if self.end_ns is not None:
+            return
+        self.duration_ns = time.perf_counter_ns() - self._start
+        self.end_ns = self.start_ns + self.duration_ns
+        self.tracer.exporter.export(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.duration_ns or 0) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span to a JSON-serializable dictionary"""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class NonRecordingSpan:
+    """Span returned while tracing is off; every method does nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+    def end(self) -> None:
+        pass
+
+
+NON_RECORDING_SPAN = NonRecordingSpan()
+
+
+class SpanExporter:
+    """Receives finished spans"""
+
+    def export(self, span: Span) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in memory, e.g. for tests and benchmarks"""
+
+    def __init__(self, max_spans: int = 100000):
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            if len(self.spans) > self.max_spans:
+                del self.spans[:len(self.spans) - self.max_spans]
+
+    def get_finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self.spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans = []
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends finished spans to a file as JSON lines, flushing after each trace"""
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            if span.parent_id is None:
+                self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """Creates spans and tracks the current span per thread and task"""
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        """Initialize the tracer; without an exporter spans are not recorded"""
+        self.exporter = exporter
+        self.enabled = exporter is not None
+
+    def start_span(self, name: str, *, attributes: Optional[Dict[str, Any]] = None):
+        """Start a child of the current span (or a new trace) without making it current"""
+        if not self.enabled:
+            return NON_RECORDING_SPAN
+        return Span(name, self, _current_span.get(), attributes)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, *, attributes: Optional[Dict[str, Any]] = None) -> Iterator:
+        """Run the enclosed block in a new span that is the parent of spans started inside it
+
+        `attributes` is keyword-only because OpenTelemetry's second positional
+        argument is the parent context.
+        """
+        if not self.enabled:
+            yield NON_RECORDING_SPAN
+            return
+
+        span = Span(name, self, _current_span.get(), attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def shutdown(self) -> None:
+        """Flush and close the exporter"""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+_tracer = Tracer()
+
+
+def get_current_span():
+    """Get the span the caller is running in, or a non-recording span outside any trace"""
+    span = _current_span.get()
+    if span is not None:
+        return span
+    if not isinstance(_tracer, Tracer):
+        from opentelemetry import trace
+        return trace.get_current_span()
+    return NON_RECORDING_SPAN
+
+
+def get_tracer():
+    """Get the process-wide tracer"""
+    return _tracer
+
+
+def set_tracer(tracer):
+    """Replace the process-wide tracer"""
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def create_tracer(exporter: str, path: str = "data/traces.jsonl"):
+    """Create a tracer by config name ("none", "memory", "file" or "otel")"""
+    if exporter == "none":
+        return Tracer()
+    if exporter == "memory":
+        return Tracer(InMemorySpanExporter())
+    if exporter == "file":
+        return Tracer(FileSpanExporter(path))
+    if exporter == "otel":
+        # Use the OpenTelemetry SDK configured by the environment (OTEL_* variables)
+        from opentelemetry import trace
+        return trace.get_tracer("api_alert_system")
+    raise ValueError(f"Unknown trace exporter: {exporter}")
+
+
+def load_traces(path: str) -> Dict[str, List[Dict]]:
+    """Read spans written by FileSpanExporter, grouped by trace id"""
+    traces: Dict[str, List[Dict]] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def format_trace(spans: List[Dict]) -> str:
+    """Format one trace as an indented tree of spans with durations and attributes"""
+    children: Dict[Optional[str], List[Dict]] = {}
+    for span in sorted(spans, key=lambda s: s["start_time_unix_nano"]):
+        children.setdefault(span["parent_span_id"], []).append(span)
+
+    lines = []
+
+    def visit(span: Dict, depth: int):
+        attributes = " ".join(f"{key}={value}" for key, value in span["attributes"].items())
+        status = "" if span["status"] == "OK" else f" [{span['status']}]"
+        lines.append(f"{'  ' * depth}{span['name']} {span['duration_ms']:.2f}ms{status} {attributes}".rstrip())
+        for child in children.get(span["span_id"], []):
+            visit(child, depth + 1)
+
+    for root in children.get(None, []):
+        visit(root, 0)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print the slowest traces from a trace file"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Show the slowest traces in a trace file")
+    parser.add_argument("path", nargs="?", default="data/traces.jsonl")
+    parser.add_argument("--top", type=int, default=5, help="Number of traces to show")
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    roots = [span for spans in traces.values() for span in spans if span["parent_span_id"] is None]
+    for root in sorted(roots, key=lambda span: span["duration_ms"], reverse=True)[:args.top]:
+        print(format_trace(traces[root["trace_id"]]))
+        print()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,82 @@
+"""
+Database-backed watchlist for the API Alert System
+"""
+
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from .database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+WatchlistChanges = Tuple[Dict[str, Dict], List[str]]
+
+
+class WatchlistSync:
+    """Keeps an in-memory watchlist in step with the watchlist table
+
+    The watchlist dict is updated in place, so every component holding a
+    reference to it sees edits made by other processes (e.g. the MCP server).
+    Checking for edits costs one single-row version read, and applying them
+    touches only the tickers written since the last check.
+    """
+
+    def __init__(self, db_manager: DatabaseManager, watchlist: Dict):
+        """Initialize the sync for a watchlist dict"""
+        self.db_manager = db_manager
+        self.watchlist = watchlist
+        self.version = 0
+
+    def load(self, seed: Optional[Dict] = None) -> bool:
+        """Replace the watchlist with the table's contents, seeding an empty table from `seed` first"""
+        if seed is not None and not self.db_manager.seed_watchlist(seed):
+            return False
+        rows = self.db_manager.get_watchlist_changes(0)
+        if rows is None:
+            return False
+
+        self.watchlist.clear()
+        self.watchlist.update({row['ticker']: row['settings'] for row in rows if not row['deleted']})
+        self.version = max((row['version'] for row in rows), default=0)
+        logger.info(f"📋 Loaded {len(self.watchlist)} watchlist tickers (version {self.version})")
+        return True
+
+    def fetch(self) -> Optional[Tuple[WatchlistChanges, int]]:
+        """Read the edits made since the last applied version without applying them
+
+        Returns None when nothing changed or the database could not be read.
+        """
+        version = self.db_manager.get_watchlist_version()
+        if version is None or version <= self.version:
+            return None
+        rows = self.db_manager.get_watchlist_changes(self.version)
+        if rows is None:
+            return None
+
+        changed: Dict[str, Dict] = {}
+        removed: List[str] = []
+        for row in rows:
+            ticker = row['ticker']
+            if row['deleted']:
+                changed.pop(ticker, None)
+                removed.append(ticker)
+            else:
+                changed[ticker] = row['settings']
+                if ticker in removed:
+                    removed.remove(ticker)
+            version = max(version, row['version'])
+        return (changed, removed), version
+
+    def apply(self, fetched: Optional[Tuple[WatchlistChanges, int]]) -> WatchlistChanges:
+        """Apply fetched edits to the watchlist and return (changed entries, removed tickers)"""
+        if fetched is None:
+            return {}, []
+        (changed, removed), version = fetched
+        removed = [ticker for ticker in removed if self.watchlist.pop(ticker, None) is not None]
+        self.watchlist.update(changed)
+        self.version = version
+        return changed, removed
+
+    def poll(self) -> WatchlistChanges:
+        """Fetch and apply the edits made since the last poll"""
+        return self.apply(self.fetch())
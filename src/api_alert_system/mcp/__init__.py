@@ -2,7 +2,12 @@
 Model Context Protocol (MCP) integration for the API Alert System
 """
 
-from .server import MCPServer
-from .client import MCPClient
+from ..utils.lazy import make_lazy_getattr
 
-__all__ = ["MCPServer", "MCPClient"] 
\ No newline at end of file
+_LAZY_IMPORTS = {"MCPServer": ".server", "MCPClient": ".client"}
+
+__all__ = ["MCPServer", "MCPClient"]
+
+
+# fastmcp is only needed once a server or client is used
+__getattr__ = make_lazy_getattr(__name__, _LAZY_IMPORTS)
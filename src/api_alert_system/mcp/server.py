@@ -5,19 +5,115 @@ Provides tools for managing stock alerts, monitoring prices, and handling notifi
 
 from fastmcp import FastMCP, Context
 from typing import Dict, List, Optional, Any
+import sys
 from datetime import datetime, timedelta
-import yfinance as yf
-import psycopg2
-from psycopg2.extras import DictCursor
 import json
 import asyncio
 
 # Import your existing config
-import config
+from api_alert_system.utils import config
+from api_alert_system.providers.circuit_breaker import format_breaker_status
 
 # Create the FastMCP server instance
 mcp = FastMCP("Stock Alert System 📈")
 
+# Fast start: tools are registered without importing the quote providers (numpy,
+# requests) or psycopg2. Those load, and the database connection opens, on the
+# first tool call that needs them, so a new session gets list_tools answered sooner.
+_db_connection = None
+
+def get_db_connection():
+    """Get the shared database connection, connecting on first use"""
+    global _db_connection
+    if _db_connection is None or _db_connection.closed:
+        import psycopg2
+        _db_connection = psycopg2.connect(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DB,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+        _db_connection.autocommit = True
+    return _db_connection
+
+# With WATCHLIST_SOURCE=database the watchlist lives in the watchlist table, which the
+# running bot polls for edits; config.WATCHLIST is this process's in-memory copy of it
+_db_manager = None
+_watchlist_sync = None
+
+def get_db_manager():
+    """Get the shared database manager used for watchlist edits, or None if the database is down"""
+    global _db_manager
+    if _db_manager is None or _db_manager.connection is None or _db_manager.connection.closed:
+        from api_alert_system.core.database import DatabaseManager
+        manager = DatabaseManager(
+            host=config.POSTGRES_HOST,
+            port=config.POSTGRES_PORT,
+            database=config.POSTGRES_DB,
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD
+        )
+        if not manager.connect() or not manager.init_tables():
+            return None
+        _db_manager = manager
+    return _db_manager
+
+def refresh_watchlist():
+    """Bring config.WATCHLIST up to date with the watchlist table"""
+    global _watchlist_sync
+    if config.WATCHLIST_SOURCE != "database":
+        return
+    manager = get_db_manager()
+    if manager is None:
+        return
+    if _watchlist_sync is None or _watchlist_sync.db_manager is not manager:
+        from api_alert_system.core.watchlist import WatchlistSync
+        sync = WatchlistSync(manager, config.WATCHLIST)
+        if sync.load(seed=dict(config.WATCHLIST)):
+            _watchlist_sync = sync
+    else:
+        _watchlist_sync.poll()
+
+def save_watchlist_entry(ticker: str, settings: Dict) -> bool:
+    """Write a watchlist entry to the table so the running bot picks it up"""
+    if config.WATCHLIST_SOURCE != "database":
+        return True
+    manager = get_db_manager()
+    return manager is not None and manager.upsert_watchlist_entry(ticker, settings)
+
+def delete_watchlist_entry(ticker: str) -> bool:
+    """Remove a watchlist entry from the table so the running bot stops polling it"""
+    if config.WATCHLIST_SOURCE != "database":
+        return True
+    manager = get_db_manager()
+    return manager is not None and manager.remove_watchlist_entry(ticker)
+
+NOT_SAVED = "\n⚠️  Database unavailable: the change applies to this session only and the alert bot will not see it"
+
+def get_shared_provider():
+    """Get the shared Yahoo provider, importing it on first use"""
+    from api_alert_system.providers.yahoo import get_shared_provider
+    return get_shared_provider()
+
+def fetch_price(ticker: str) -> Optional[float]:
+    """Get a ticker's price from the demo market or Yahoo"""
+    if config.DEMO_MODE:
+        from api_alert_system.providers.synthetic import get_demo_price
+        return get_demo_price(ticker)
+    from api_alert_system.providers.yahoo import get_latest_price
+    return get_latest_price(ticker)
+
+def warm_up():
+    """Import the providers and connect to the database before serving (MCP_FAST_START=false)"""
+    get_shared_provider()
+    from api_alert_system.providers import bar_cache, synthetic  # noqa: F401
+    try:
+        get_db_connection()
+        refresh_watchlist()
+    except Exception as e:
+        print(f"⚠️  Database not available at startup: {e}", file=sys.stderr)
+
 @mcp.tool
 async def add_stock_to_watchlist(
     ticker: str,
@@ -40,16 +136,20 @@ async def add_stock_to_watchlist(
             if upper_threshold <= lower_threshold:
                 return "❌ Upper threshold must be greater than lower threshold"
         
-        # Add to config
-        config.WATCHLIST[ticker] = {
+        # Save to the shared watchlist
+        refresh_watchlist()
+        settings = {
             "upper": upper_threshold,
             "lower": lower_threshold
         }
+        saved = save_watchlist_entry(ticker, settings)
+        config.WATCHLIST[ticker] = settings
         
         if ctx:
             await ctx.info(f"Added {ticker} to watchlist")
         
-        return f"✅ Added {ticker} to watchlist with thresholds: upper={upper_threshold}, lower={lower_threshold}"
+        result = f"✅ Added {ticker} to watchlist with thresholds: upper={upper_threshold}, lower={lower_threshold}"
+        return result if saved else result + NOT_SAVED
         
     except Exception as e:
         return f"❌ Error adding stock: {str(e)}"
@@ -61,15 +161,18 @@ async def remove_stock_from_watchlist(
 ) -> str:
     """Remove a stock from the watchlist"""
     try:
+        refresh_watchlist()
         if ticker not in config.WATCHLIST:
             return f"❌ {ticker} not found in watchlist"
         
+        saved = delete_watchlist_entry(ticker)
         del config.WATCHLIST[ticker]
         
         if ctx:
             await ctx.info(f"Removed {ticker} from watchlist")
         
-        return f"✅ Removed {ticker} from watchlist"
+        result = f"✅ Removed {ticker} from watchlist"
+        return result if saved else result + NOT_SAVED
         
     except Exception as e:
         return f"❌ Error removing stock: {str(e)}"
@@ -83,6 +186,7 @@ async def update_stock_thresholds(
 ) -> str:
     """Update price thresholds for a stock"""
     try:
+        refresh_watchlist()
         if ticker not in config.WATCHLIST:
             return f"❌ {ticker} not found in watchlist"
         
@@ -96,16 +200,19 @@ async def update_stock_thresholds(
                 return "❌ Upper threshold must be greater than lower threshold"
         
         # Update thresholds
-        current = config.WATCHLIST[ticker]
+        current = dict(config.WATCHLIST[ticker])
         if upper_threshold is not None:
             current["upper"] = upper_threshold
         if lower_threshold is not None:
             current["lower"] = lower_threshold
+        saved = save_watchlist_entry(ticker, current)
+        config.WATCHLIST[ticker] = current
         
         if ctx:
             await ctx.info(f"Updated thresholds for {ticker}")
         
-        return f"✅ Updated {ticker} thresholds: upper={current['upper']}, lower={current['lower']}"
+        result = f"✅ Updated {ticker} thresholds: upper={current.get('upper')}, lower={current.get('lower')}"
+        return result if saved else result + NOT_SAVED
         
     except Exception as e:
         return f"❌ Error updating thresholds: {str(e)}"
@@ -118,6 +225,7 @@ async def get_current_prices(
     """Get current prices for stocks in watchlist or specified tickers"""
     try:
         if tickers is None:
+            refresh_watchlist()
             tickers = list(config.WATCHLIST.keys())
         
         if not tickers:
@@ -126,24 +234,7 @@ async def get_current_prices(
         prices = {}
         for ticker in tickers:
             try:
-                if config.DEMO_MODE:
-                    # Mock data for demo
-                    import random
-                    base_prices = {
-                        "AAPL": 190, "TSLA": 250, "SPY": 470, "NVDA": 140,
-                        "BTC-USD": 95000, "LTC-USD": 110, "BCH-USD": 450
-                    }
-                    base = base_prices.get(ticker, 100)
-                    price = base + random.uniform(-10, 10)
-                else:
-                    data = yf.Ticker(ticker)
-                    hist = data.history(period="1d", interval="1m")
-                    if hist.empty:
-                        prices[ticker] = None
-                        continue
-                    price = float(hist["Close"].iloc[-1])
-                
-                prices[ticker] = price
+                prices[ticker] = fetch_price(ticker)
                 
             except Exception as e:
                 prices[ticker] = None
@@ -173,6 +264,7 @@ async def check_alert_conditions(
 ) -> str:
     """Check if any stocks have crossed their alert thresholds"""
     try:
+        refresh_watchlist()
         if ticker:
             tickers = [ticker]
         else:
@@ -191,17 +283,9 @@ async def check_alert_conditions(
             
             # Get current price
             try:
-                if config.DEMO_MODE:
-                    import random
-                    base_prices = {"AAPL": 190, "TSLA": 250, "SPY": 470, "NVDA": 140}
-                    base = base_prices.get(ticker, 100)
-                    current_price = base + random.uniform(-10, 10)
-                else:
-                    data = yf.Ticker(ticker)
-                    hist = data.history(period="1d", interval="1m")
-                    if hist.empty:
-                        continue
-                    current_price = float(hist["Close"].iloc[-1])
+                current_price = fetch_price(ticker)
+                if current_price is None:
+                    continue
                 
                 # Check thresholds
                 if thresholds.get("upper") and current_price >= thresholds["upper"]:
@@ -251,16 +335,8 @@ async def get_price_history(
 ) -> str:
     """Get price history for a stock from the database"""
     try:
-        # Connect to database
-        conn = psycopg2.connect(
-            host=config.POSTGRES_HOST,
-            port=config.POSTGRES_PORT,
-            database=config.POSTGRES_DB,
-            user=config.POSTGRES_USER,
-            password=config.POSTGRES_PASSWORD
-        )
-        
-        cur = conn.cursor(cursor_factory=DictCursor)
+        from psycopg2.extras import DictCursor
+        cur = get_db_connection().cursor(cursor_factory=DictCursor)
         
         # Get recent price history
         cur.execute("""
@@ -273,7 +349,6 @@ async def get_price_history(
         
         rows = cur.fetchall()
         cur.close()
-        conn.close()
         
         if not rows:
             return f"❌ No price history found for {ticker}"
@@ -291,6 +366,53 @@ async def get_price_history(
     except Exception as e:
         return f"❌ Error getting price history: {str(e)}"
 
+_bar_cache = None
+
+def get_bar_cache():
+    """Get the shared intraday bar cache"""
+    global _bar_cache
+    if _bar_cache is None:
+        from api_alert_system.providers.bar_cache import BarCache
+        _bar_cache = BarCache(
+            get_shared_provider(),
+            cache_dir=config.BAR_CACHE_DIR,
+            retention=config.BAR_CACHE_RETENTION_DAYS * 24 * 3600
+        )
+    return _bar_cache
+
+@mcp.tool
+async def get_intraday_bars(
+    ticker: str,
+    interval: str = "1m",
+    limit: int = 30,
+    ctx: Context = None
+) -> str:
+    """Get recent intraday OHLCV bars for a stock, fetching only bars newer than the local cache"""
+    try:
+        if config.DEMO_MODE:
+            return "❌ Intraday bars are not available in demo mode"
+        
+        bars = await asyncio.to_thread(get_bar_cache().get_bars, ticker, interval)
+        count = len(bars["timestamp"])
+        if count == 0:
+            return f"❌ No intraday bars found for {ticker}"
+        
+        # Format response
+        shown = min(limit, count)
+        result = f"🕯️ {interval} bars for {ticker} (last {shown} of {count} cached):\n"
+        for i in range(count - shown, count):
+            bar_time = datetime.utcfromtimestamp(int(bars["timestamp"][i]))
+            result += f"  {bar_time:%Y-%m-%d %H:%M}: O ${bars['open'][i]:.2f} H ${bars['high'][i]:.2f} "
+            result += f"L ${bars['low'][i]:.2f} C ${bars['close'][i]:.2f} V {int(bars['volume'][i])}\n"
+        
+        if ctx:
+            await ctx.info(f"Retrieved {shown} {interval} bars for {ticker}")
+        
+        return result
+        
+    except Exception as e:
+        return f"❌ Error getting intraday bars: {str(e)}"
+
 @mcp.tool
 async def get_alert_history(
     ticker: Optional[str] = None,
@@ -299,16 +421,8 @@ async def get_alert_history(
 ) -> str:
     """Get alert history from the database"""
     try:
-        # Connect to database
-        conn = psycopg2.connect(
-            host=config.POSTGRES_HOST,
-            port=config.POSTGRES_PORT,
-            database=config.POSTGRES_DB,
-            user=config.POSTGRES_USER,
-            password=config.POSTGRES_PASSWORD
-        )
-        
-        cur = conn.cursor(cursor_factory=DictCursor)
+        from psycopg2.extras import DictCursor
+        cur = get_db_connection().cursor(cursor_factory=DictCursor)
         
         # Get recent alert history
         if ticker:
@@ -329,7 +443,6 @@ async def get_alert_history(
         
         rows = cur.fetchall()
         cur.close()
-        conn.close()
         
         if not rows:
             return f"❌ No alert history found{f' for {ticker}' if ticker else ''}"
@@ -356,6 +469,7 @@ async def get_watchlist_status(
 ) -> str:
     """Get current status of all stocks in watchlist"""
     try:
+        refresh_watchlist()
         if not config.WATCHLIST:
             return "❌ Watchlist is empty"
         
@@ -368,20 +482,12 @@ async def get_watchlist_status(
             
             # Get current price
             try:
-                if config.DEMO_MODE:
-                    import random
-                    base_prices = {"AAPL": 190, "TSLA": 250, "SPY": 470, "NVDA": 140}
-                    base = base_prices.get(ticker, 100)
-                    current_price = base + random.uniform(-10, 10)
-                else:
-                    data = yf.Ticker(ticker)
-                    hist = data.history(period="1d", interval="1m")
-                    if not hist.empty:
-                        current_price = float(hist["Close"].iloc[-1])
-                    else:
-                        current_price = None
+                current_price = fetch_price(ticker)
                 
-                if current_price is not None:
+                breaker = get_shared_provider().breaker_for(ticker)
+                if current_price is None and breaker.state == breaker.OPEN:
+                    result += f"    ⛔ Circuit open after {breaker.failures} failures (retry in {breaker.retry_in():.0f}s)\n"
+                elif current_price is not None:
                     result += f"    Current price: ${current_price:.2f}\n"
                     
                     # Check if thresholds are crossed
@@ -397,6 +503,10 @@ async def get_watchlist_status(
             except Exception as e:
                 result += f"    ❌ Error fetching price: {str(e)}\n"
         
+        provider_breaker = get_shared_provider().provider_breaker
+        if provider_breaker.state != provider_breaker.CLOSED:
+            result += f"\n{format_breaker_status([provider_breaker])}\n"
+        
         if ctx:
             await ctx.info("Retrieved watchlist status")
         
@@ -425,6 +535,7 @@ async def toggle_demo_mode(
 @mcp.resource("mcp://stock-alerts/watchlist_config")
 async def watchlist_config() -> str:
     """Get current watchlist configuration"""
+    refresh_watchlist()
     return json.dumps(config.WATCHLIST, indent=2)
 
 @mcp.resource("mcp://stock-alerts/system_config")
@@ -441,4 +552,6 @@ async def system_config() -> str:
 
 # Run the server
 if __name__ == "__main__":
+    if not config.MCP_FAST_START:
+        warm_up()
     mcp.run() 
\ No newline at end of file
@@ -2,8 +2,28 @@
 Notification systems for the API Alert System
 """
 
-from .telegram import TelegramNotifier
-from .ntfy import NTFYNotifier
-from .console import ConsoleNotifier
+from ..utils.lazy import make_lazy_getattr
 
-__all__ = ["TelegramNotifier", "NTFYNotifier", "ConsoleNotifier"] 
\ No newline at end of file
+from .base import BaseNotifier
+from .registry import NotifierRegistry, register_notifier
+
+_LAZY_IMPORTS = {
+    "TelegramNotifier": ".telegram",
+    "NTFYNotifier": ".ntfy",
+    "ConsoleNotifier": ".console",
+    "WebhookNotifier": ".webhook",
+}
+
+__all__ = [
+    "BaseNotifier",
+    "TelegramNotifier",
+    "NTFYNotifier",
+    "ConsoleNotifier",
+    "WebhookNotifier",
+    "NotifierRegistry",
+    "register_notifier",
+]
+
+
+# The HTTP channels import requests, so load them when first used
+__getattr__ = make_lazy_getattr(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,144 @@
+"""
+Base notifier interface for the API Alert System
+"""
+
+import asyncio
+import re
+import threading
+from typing import TYPE_CHECKING, List, Optional
+import logging
+
+if TYPE_CHECKING:
+    from ..core.models import AlertEvent
+
+logger = logging.getLogger(__name__)
+
+_MARKDOWN_CHARS = re.compile(r"[*_`]")
+
+
+def strip_markdown(message: str) -> str:
+    """Remove Markdown emphasis and code markers from a message"""
+    return _MARKDOWN_CHARS.sub("", message)
+
+
+def truncate_markdown(message: str, limit: int) -> str:
+    """Cut a Markdown message to `limit` characters without leaving an entity open
+
+    Telegram rejects a message with an unmatched `*`, `_` or backtick, so the
+    cut moves back to before the last unmatched marker until all are paired.
+    """
+    message = message[:limit - 1]
+    while True:
+        unmatched = [message.rfind(mark) for mark in "*_`" if message.count(mark) % 2]
+        if not unmatched:
+            return message + "…"
+        message = message[:max(unmatched)]
+
+
+class BaseNotifier:
+    """Base class for notification channels
+
+    Subclasses implement `send_message` and describe themselves through the
+    capability flags below. `deliver` and `async_deliver` apply those flags and
+    the per-notifier concurrency limit, so the bot can fan out to any number of
+    channels without knowing which ones are configured.
+    """
+
+    name = "base"
+    supports_markdown = False
+    max_message_length: Optional[int] = None
+    supports_batching = False
+    max_concurrency = 1
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """Initialize the concurrency limit"""
+        if max_concurrency is not None:
+            self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether the notifier is configured to send messages"""
+        return True
+
+    def send_message(self, message: str) -> bool:
+        """Send a plain message"""
+        raise NotImplementedError
+
+    def send_price_update(self, message: str) -> bool:
+        """Send price update message"""
+        return self.send_message(message)
+
+    def send_alert(self, message: str) -> bool:
+        """Send alert message"""
+        return self.send_message(message)
+
+    def send_alert_events(self, events: List["AlertEvent"]) -> bool:
+        """Send alert events rendered for this channel"""
+        from ..core.models import render_alert_events
+        return self.send_alert(self.prepare_message(render_alert_events(events, markdown=self.supports_markdown)))
+
+    def prepare_message(self, message: str) -> str:
+        """Adapt a message to this channel's capabilities"""
+        if not self.supports_markdown:
+            message = strip_markdown(message)
+        if self.max_message_length and len(message) > self.max_message_length:
+            if self.supports_markdown:
+                message = truncate_markdown(message, self.max_message_length)
+            else:
+                message = message[:self.max_message_length - 1] + "…"
+        return message
+
+    def deliver(self, kind: str, message: str) -> bool:
+        """Send a message of the given kind ("message", "price_update" or "alert")"""
+        if not self.is_enabled:
+            return False
+
+        send = getattr(self, f"send_{kind}")
+        return self._guarded(lambda: send(self.prepare_message(message)))
+
+    def deliver_events(self, events: List["AlertEvent"]) -> bool:
+        """Send a batch of alert events"""
+        if not self.is_enabled or not events:
+            return False
+        return self._guarded(lambda: self.send_alert_events(events))
+
+    def _guarded(self, send) -> bool:
+        """Run a send under the concurrency limit, turning errors into failures"""
+        with self._semaphore:
+            try:
+                return send()
+            except Exception as e:
+                logger.error(f"❌ {self.name} notifier failed: {e}")
+                return False
+
+    async def async_deliver(self, kind: str, message: str) -> bool:
+        """Send a message without blocking the event loop"""
+        return await asyncio.to_thread(self.deliver, kind, message)
+
+    async def async_deliver_events(self, events: List["AlertEvent"]) -> bool:
+        """Send alert events without blocking the event loop"""
+        return await asyncio.to_thread(self.deliver_events, events)
+
+    async def async_send_price_update(self, message: str) -> bool:
+        """Send price update message asynchronously"""
+        return await self.async_deliver("price_update", message)
+
+    async def async_send_alert(self, message: str) -> bool:
+        """Send alert message asynchronously"""
+        return await self.async_deliver("alert", message)
+
+    def with_destination(self, destination: str) -> Optional["BaseNotifier"]:
+        """Get a notifier that sends to another destination on this channel, e.g. a user's chat
+
+        The copy shares this notifier's connections and concurrency limit.
+        Channels without per-message destinations return None.
+        """
+        return None
+
+    def test_connection(self) -> bool:
+        """Test the notifier connection"""
+        return self.is_enabled
+
+    def close(self) -> None:
+        """Release any resources held by the notifier"""
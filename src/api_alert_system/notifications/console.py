@@ -5,14 +5,19 @@ Console notifications for the API Alert System
 from datetime import datetime
 import logging
 
+from .base import BaseNotifier
+
 logger = logging.getLogger(__name__)
 
 
-class ConsoleNotifier:
+class ConsoleNotifier(BaseNotifier):
     """Handles console notifications"""
     
+    name = "console"
+    
     def __init__(self, enabled: bool = True):
         """Initialize console notifier"""
+        super().__init__()
         self.enabled = enabled
         
         if self.enabled:
@@ -20,6 +25,11 @@ class ConsoleNotifier:
         else:
             logger.info("ℹ️  Console notifications disabled")
     
+    @property
+    def is_enabled(self) -> bool:
+        """Whether console output is enabled"""
+        return self.enabled
+    
     def send_message(self, message: str, level: str = "INFO") -> bool:
         """Send message to console"""
         if not self.enabled:
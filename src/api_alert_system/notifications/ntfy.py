@@ -2,18 +2,37 @@
 NTFY notifications for the API Alert System
 """
 
+import base64
+import copy
 import requests
 from typing import Optional
 import logging
 
+from .base import BaseNotifier
+
 logger = logging.getLogger(__name__)
 
 
-class NTFYNotifier:
+def encode_header(value: str) -> str:
+    """RFC 2047-encode a header value that is not latin-1, e.g. a title with emoji"""
+    try:
+        value.encode('latin-1')
+        return value
+    except UnicodeEncodeError:
+        return f"=?UTF-8?B?{base64.b64encode(value.encode('utf-8')).decode('ascii')}?="
+
+
+class NTFYNotifier(BaseNotifier):
     """Handles NTFY notifications"""
     
-    def __init__(self, topic: str, server: str = "https://ntfy.sh", enabled: bool = True):
+    name = "ntfy"
+    max_message_length = 4096
+    max_concurrency = 4
+    
+    def __init__(self, topic: str, server: str = "https://ntfy.sh", enabled: bool = True,
+                 max_concurrency: Optional[int] = None):
         """Initialize NTFY notifier"""
+        super().__init__(max_concurrency)
         self.topic = topic
         self.server = server.rstrip('/')
         self.enabled = enabled and bool(topic)
@@ -24,6 +43,11 @@ class NTFYNotifier:
         else:
             logger.warning("⚠️  NTFY not configured or disabled")
     
+    @property
+    def is_enabled(self) -> bool:
+        """Whether NTFY is configured and enabled"""
+        return self.enabled
+    
     def send_message(self, message: str, title: str = None, priority: int = 3, tags: list = None) -> bool:
         """Send message via NTFY"""
         if not self.enabled:
@@ -36,7 +60,7 @@ class NTFYNotifier:
             }
             
             if title:
-                headers['Title'] = title
+                headers['Title'] = encode_header(title)
             
             if priority:
                 headers['Priority'] = str(priority)
@@ -80,6 +104,14 @@ class NTFYNotifier:
             tags=["warning", "money", "chart-decreasing"]
         )
     
+    def with_destination(self, destination: str) -> "NTFYNotifier":
+        """Get a notifier for another topic on the same server"""
+        routed = copy.copy(self)
+        routed.topic = destination
+        routed.url = f"{self.server}/{destination}"
+        routed.enabled = bool(destination)
+        return routed
+    
     def test_connection(self) -> bool:
         """Test NTFY connection"""
         if not self.enabled:
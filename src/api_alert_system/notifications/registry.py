@@ -0,0 +1,258 @@
+"""
+Notifier registry for the API Alert System
+"""
+
+import asyncio
+import contextvars
+import importlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+import logging
+
+from .base import BaseNotifier
+from ..core.metrics import get_metrics
+from ..core.tracing import get_tracer
+
+if TYPE_CHECKING:
+    from ..core.models import AlertEvent
+
+logger = logging.getLogger(__name__)
+
+# Factories for the built-in channels, keyed by the name used in config.NOTIFIERS.
+# A factory returns a notifier, or None when the channel is switched off.
+NOTIFIER_FACTORIES: Dict[str, Callable[[], Optional[BaseNotifier]]] = {}
+
+
+def register_notifier(name: str):
+    """Register a notifier factory under a config name"""
+    def decorator(factory: Callable[[], Optional[BaseNotifier]]):
+        NOTIFIER_FACTORIES[name] = factory
+        return factory
+    return decorator
+
+
+@register_notifier("telegram")
+def _create_telegram() -> Optional[BaseNotifier]:
+    from ..utils import config
+    from .telegram import TelegramNotifier
+    if not config.ENABLE_TELEGRAM:
+        return None
+    return TelegramNotifier(config.TELEGRAM_TOKEN, config.TELEGRAM_CHAT_ID, api_url=config.TELEGRAM_API_URL)
+
+
+@register_notifier("ntfy")
+def _create_ntfy() -> Optional[BaseNotifier]:
+    from ..utils import config
+    from .ntfy import NTFYNotifier
+    if not config.ENABLE_NTFY:
+        return None
+    return NTFYNotifier(config.NTFY_TOPIC, config.NTFY_SERVER, config.NTFY_ENABLED)
+
+
+@register_notifier("webhook")
+def _create_webhook() -> Optional[BaseNotifier]:
+    from ..utils import config
+    from .webhook import WebhookNotifier
+    if not config.WEBHOOK_URLS:
+        return None
+    return WebhookNotifier(
+        config.WEBHOOK_URLS,
+        secret=config.WEBHOOK_SECRET,
+        batch_size=config.WEBHOOK_BATCH_SIZE,
+        use_gzip=config.WEBHOOK_GZIP
+    )
+
+
+@register_notifier("console")
+def _create_console() -> Optional[BaseNotifier]:
+    from ..utils import config
+    from .console import ConsoleNotifier
+    return ConsoleNotifier(config.CONSOLE_NOTIFICATIONS)
+
+
+def create_notifier(name: str) -> Optional[BaseNotifier]:
+    """Create a notifier from a registered name or a "module:ClassName" path"""
+    if name in NOTIFIER_FACTORIES:
+        return NOTIFIER_FACTORIES[name]()
+
+    if ":" in name:
+        module_name, class_name = name.split(":", 1)
+        notifier_class = getattr(importlib.import_module(module_name), class_name)
+        return notifier_class()
+
+    raise ValueError(f"Unknown notifier: {name}")
+
+
+class NotifierRegistry:
+    """Holds the active notifiers and fans messages out to all of them"""
+
+    def __init__(self, notifiers: List[BaseNotifier] = None, max_workers: int = 8):
+        """Initialize the registry with a list of notifiers"""
+        self.notifiers: List[BaseNotifier] = list(notifiers or [])
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._routed: Dict[Tuple[str, str], Optional[BaseNotifier]] = {}
+
+    @classmethod
+    def from_config(cls, names: List[str], max_workers: int = 8) -> "NotifierRegistry":
+        """Build a registry from the configured notifier names"""
+        notifiers = []
+        for name in names:
+            try:
+                notifier = create_notifier(name)
+            except Exception as e:
+                logger.error(f"❌ Failed to load notifier {name}: {e}")
+                continue
+            if notifier is not None:
+                notifiers.append(notifier)
+
+        logger.info(f"Loaded {len(notifiers)} notifiers: {', '.join(n.name for n in notifiers)}")
+        return cls(notifiers, max_workers=max_workers)
+
+    def register(self, notifier: BaseNotifier) -> None:
+        """Add a notifier to the fan-out"""
+        self.notifiers.append(notifier)
+
+    def get(self, name: str) -> Optional[BaseNotifier]:
+        """Get the first notifier with the given name"""
+        for notifier in self.notifiers:
+            if notifier.name == name:
+                return notifier
+        return None
+
+    @property
+    def active(self) -> List[BaseNotifier]:
+        """Notifiers that are currently enabled"""
+        return [notifier for notifier in self.notifiers if notifier.is_enabled]
+
+    @staticmethod
+    def _record(notifier: BaseNotifier, started: float, success: bool) -> None:
+        """Record the duration and outcome of one notifier send"""
+        metrics = get_metrics()
+        tags = {"notifier": notifier.name}
+        metrics.timing("notify.seconds", time.perf_counter() - started, tags)
+        metrics.increment("notify.sent" if success else "notify.failed", tags=tags)
+
+    def _call(self, notifier: BaseNotifier, method: str, *args) -> bool:
+        """Call a delivery method on one notifier, timing and tracing it"""
+        started = time.perf_counter()
+        success = False
+        with get_tracer().start_as_current_span("notify", attributes={"notifier": notifier.name, "method": method}) as span:
+            try:
+                success = bool(getattr(notifier, method)(*args))
+            finally:
+                span.set_attribute("outcome", "ok" if success else "failed")
+                self._record(notifier, started, success)
+        return success
+
+    async def _async_call(self, notifier: BaseNotifier, method: str, *args) -> bool:
+        """Await an async delivery method on one notifier, timing and tracing it"""
+        started = time.perf_counter()
+        success = False
+        with get_tracer().start_as_current_span("notify", attributes={"notifier": notifier.name, "method": method}) as span:
+            try:
+                success = bool(await getattr(notifier, method)(*args))
+            finally:
+                span.set_attribute("outcome", "ok" if success else "failed")
+                self._record(notifier, started, success)
+        return success
+
+    def _fan_out(self, method: str, *args) -> int:
+        """Call a delivery method on every active notifier and count successes"""
+        return self._run_calls([(notifier, method, args) for notifier in self.active])
+
+    def _run_calls(self, calls: List[Tuple[BaseNotifier, str, tuple]]) -> int:
+        """Run (notifier, method, args) calls on the worker threads and count successes"""
+        if len(calls) <= 1:
+            return sum(1 for notifier, method, args in calls if self._call(notifier, method, *args))
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="notifier")
+
+        # Run each send in a copy of the caller's context so its span joins the caller's trace
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, self._call, notifier, method, *args)
+            for notifier, method, args in calls
+        ]
+        return sum(1 for future in futures if future.result())
+
+    def routed(self, channel: str, destination: str) -> Optional[BaseNotifier]:
+        """Get the loaded notifier for a channel aimed at one destination, cached per destination"""
+        key = (channel, destination)
+        if key not in self._routed:
+            notifier = self.get(channel)
+            self._routed[key] = notifier.with_destination(destination) if notifier is not None else None
+        return self._routed[key]
+
+    def queue_depth(self) -> int:
+        """Sends waiting for a fan-out worker thread"""
+        if self._executor is None:
+            return 0
+        return self._executor._work_queue.qsize()
+
+    def broadcast(self, kind: str, message: str) -> int:
+        """Send a message to every active notifier and return the success count"""
+        return self._fan_out("deliver", kind, message)
+
+    def broadcast_events(self, events: List["AlertEvent"]) -> int:
+        """Send alert events to every active notifier and return the success count"""
+        return self._fan_out("deliver_events", events)
+
+    def deliver_routed(self, routes: List[Tuple[str, str, List["AlertEvent"]]]) -> int:
+        """Send alert events to individual destinations and return the success count
+
+        Each route is (channel name, destination, events), e.g. ("telegram",
+        chat_id, events) for one user. Routes to channels that are not loaded, or
+        cannot address single destinations, are skipped.
+        """
+        return self._run_calls([
+            (notifier, "deliver_events", (events,)) for notifier, events in self._resolve_routes(routes)
+        ])
+
+    def _resolve_routes(self, routes: List[Tuple[str, str, List["AlertEvent"]]]) -> List[Tuple[BaseNotifier, List["AlertEvent"]]]:
+        """Pair each route's events with the notifier aimed at its destination"""
+        resolved = []
+        for channel, destination, events in routes:
+            notifier = self.routed(channel, destination)
+            if notifier is None:
+                logger.debug(f"No {channel} notifier to route alerts to {destination}")
+                continue
+            resolved.append((notifier, events))
+        return resolved
+
+    async def async_broadcast(self, kind: str, message: str) -> int:
+        """Send a message to every active notifier concurrently"""
+        results = await asyncio.gather(
+            *(self._async_call(notifier, "async_deliver", kind, message) for notifier in self.active)
+        )
+        return sum(1 for result in results if result)
+
+    async def async_broadcast_events(self, events: List["AlertEvent"]) -> int:
+        """Send alert events to every active notifier concurrently"""
+        results = await asyncio.gather(
+            *(self._async_call(notifier, "async_deliver_events", events) for notifier in self.active)
+        )
+        return sum(1 for result in results if result)
+
+    async def async_deliver_routed(self, routes: List[Tuple[str, str, List["AlertEvent"]]]) -> int:
+        """Send alert events to individual destinations concurrently, like `deliver_routed`"""
+        results = await asyncio.gather(
+            *(self._async_call(notifier, "async_deliver_events", events)
+              for notifier, events in self._resolve_routes(routes))
+        )
+        return sum(1 for result in results if result)
+
+    def close(self) -> None:
+        """Shut down the fan-out worker threads and the notifiers"""
+        for notifier in self.notifiers:
+            notifier.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __iter__(self):
+        return iter(self.notifiers)
+
+    def __len__(self) -> int:
+        return len(self.notifiers)
@@ -2,21 +2,31 @@
 Telegram notifications for the API Alert System
 """
 
+import copy
 import requests
 from typing import Optional
 import logging
 
+from .base import BaseNotifier
+
 logger = logging.getLogger(__name__)
 
 
-class TelegramNotifier:
+class TelegramNotifier(BaseNotifier):
     """Handles Telegram bot notifications"""
     
-    def __init__(self, token: str, chat_id: str):
+    name = "telegram"
+    supports_markdown = True
+    max_message_length = 4096
+    max_concurrency = 2
+    
+    def __init__(self, token: str, chat_id: str, max_concurrency: Optional[int] = None,
+                 api_url: str = "https://api.telegram.org"):
         """Initialize Telegram notifier"""
+        super().__init__(max_concurrency)
         self.token = token
         self.chat_id = chat_id
-        self.base_url = f"https://api.telegram.org/bot{token}"
+        self.base_url = f"{api_url.rstrip('/')}/bot{token}"
         self.configured = bool(token and chat_id and token != "YOUR_BOT_TOKEN_HERE" and chat_id != "YOUR_CHAT_ID_HERE")
         
         if self.configured:
@@ -24,6 +34,11 @@ class TelegramNotifier:
         else:
             logger.warning("⚠️  Telegram credentials not configured")
     
+    @property
+    def is_enabled(self) -> bool:
+        """Whether Telegram credentials are configured"""
+        return self.configured
+    
     def send_message(self, text: str, parse_mode: str = 'Markdown') -> bool:
         """Send message via Telegram bot"""
         if not self.configured:
@@ -59,6 +74,13 @@ class TelegramNotifier:
         """Send alert message"""
         return self.send_message(message)
     
+    def with_destination(self, destination: str) -> "TelegramNotifier":
+        """Get a notifier for another chat using the same bot"""
+        routed = copy.copy(self)
+        routed.chat_id = destination
+        routed.configured = bool(self.token and destination and self.token != "YOUR_BOT_TOKEN_HERE")
+        return routed
+    
     def test_connection(self) -> bool:
         """Test Telegram bot connection"""
         if not self.configured:
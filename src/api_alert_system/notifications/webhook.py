@@ -0,0 +1,161 @@
+"""
+Webhook notifications for the API Alert System
+"""
+
+import copy
+import gzip
+import hashlib
+import hmac
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import logging
+
+import requests
+
+from .base import BaseNotifier
+
+if TYPE_CHECKING:
+    from ..core.models import AlertEvent
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = "X-Signature-256"
+
+
+def sign_payload(body: bytes, secret: str) -> str:
+    """Compute the HMAC-SHA256 signature header value for a request body"""
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(body: bytes, secret: str, signature: str) -> bool:
+    """Check a received signature header against the raw request body"""
+    return hmac.compare_digest(sign_payload(body, secret), signature or "")
+
+
+class WebhookNotifier(BaseNotifier):
+    """Delivers JSON alert events to one or more webhook endpoints
+
+    Events are sent as `{"events": [...], "sent_at": ...}` in batches of up to
+    `batch_size`. Each batch is serialized, compressed and signed once and then
+    POSTed to every endpoint concurrently, each worker thread with its own
+    HTTP session. The signature covers the bytes on the wire, so receivers
+    verify it before decompressing.
+    """
+
+    name = "webhook"
+    supports_batching = True
+    max_concurrency = 4
+
+    def __init__(self, urls: List[str], secret: Optional[str] = None, batch_size: int = 100,
+                 use_gzip: bool = True, timeout: int = 10, max_workers: int = 8,
+                 max_concurrency: Optional[int] = None):
+        """Initialize webhook notifier"""
+        super().__init__(max_concurrency)
+        self.urls = [url for url in urls if url]
+        self.secret = secret
+        self.batch_size = max(1, batch_size)
+        self.use_gzip = use_gzip
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._sessions_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(self.urls) or 1)),
+                                            thread_name_prefix="webhook")
+
+        if self.urls:
+            logger.info(f"✅ Webhook configured for {len(self.urls)} endpoint(s)")
+        else:
+            logger.warning("⚠️  No webhook URLs configured")
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether any endpoint is configured"""
+        return bool(self.urls)
+
+    def _get_session(self) -> requests.Session:
+        """Get the calling thread's session; a requests.Session is not safe to share between threads"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def build_request(self, events: List[Dict[str, Any]]) -> tuple:
+        """Serialize a batch of events into a request body and headers"""
+        payload = {"events": events, "sent_at": datetime.utcnow().isoformat()}
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+
+        if self.use_gzip:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        if self.secret:
+            headers[SIGNATURE_HEADER] = sign_payload(body, self.secret)
+
+        return body, headers
+
+    def _post(self, url: str, body: bytes, headers: Dict[str, str]) -> bool:
+        """POST a prepared body to a single endpoint"""
+        try:
+            response = self._get_session().post(url, data=body, headers=headers, timeout=self.timeout)
+            if 200 <= response.status_code < 300:
+                return True
+            logger.error(f"❌ Webhook error from {url}: {response.status_code} - {response.text[:200]}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Failed to send webhook to {url}: {e}")
+            return False
+
+    def send_events(self, events: List[Dict[str, Any]]) -> bool:
+        """Send events to every endpoint, batching them per request"""
+        if not self.is_enabled or not events:
+            return False
+
+        futures = []
+        for start in range(0, len(events), self.batch_size):
+            body, headers = self.build_request(events[start:start + self.batch_size])
+            futures.extend(self._executor.submit(self._post, url, body, headers) for url in self.urls)
+
+        results = [future.result() for future in futures]
+        if all(results):
+            logger.info(f"✅ Webhook delivered {len(events)} event(s) to {len(self.urls)} endpoint(s)")
+        return all(results)
+
+    def _text_event(self, event_type: str, message: str) -> Dict[str, Any]:
+        return {"type": event_type, "message": message, "timestamp": datetime.utcnow().isoformat()}
+
+    def send_message(self, message: str) -> bool:
+        """Send a plain message as a single event"""
+        return self.send_events([self._text_event("message", message)])
+
+    def send_price_update(self, message: str) -> bool:
+        """Send price update message as an event"""
+        return self.send_events([self._text_event("price_update", message)])
+
+    def send_alert(self, message: str) -> bool:
+        """Send alert message as an event"""
+        return self.send_events([self._text_event("alert", message)])
+
+    def send_alert_events(self, events: List["AlertEvent"]) -> bool:
+        """Send alert events as structured JSON rather than rendered text"""
+        return self.send_events([event.to_dict() for event in events])
+
+    def with_destination(self, destination: str) -> "WebhookNotifier":
+        """Get a notifier for a single other endpoint, sharing the sessions and workers"""
+        routed = copy.copy(self)
+        routed.urls = [destination] if destination else []
+        return routed
+
+    def close(self) -> None:
+        """Wait for in-flight requests and release connections"""
+        self._executor.shutdown(wait=True)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
@@ -0,0 +1,23 @@
+"""
+Quote providers for the API Alert System
+"""
+
+from ..utils.lazy import make_lazy_getattr
+
+from .base import QuoteProvider
+from .factory import create_provider
+
+_LAZY_IMPORTS = {
+    "SyntheticProvider": ".synthetic",
+    "ReplayProvider": ".replay",
+    "TCPFeedProvider": ".feed",
+    "FeedServer": ".feed",
+    "BarCache": ".bar_cache",
+    "YFinanceProvider": ".yahoo",
+}
+
+__all__ = ["QuoteProvider", "SyntheticProvider", "ReplayProvider", "TCPFeedProvider", "FeedServer", "BarCache", "YFinanceProvider", "create_provider"]
+
+
+# numpy, yfinance and pandas are only imported once a provider that needs them is used
+__getattr__ = make_lazy_getattr(__name__, _LAZY_IMPORTS)
@@ -0,0 +1,122 @@
+"""
+Incremental intraday bar cache for the API Alert System
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import logging
+
+import numpy as np
+
+from .base import Bars, QuoteProvider
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+
+def empty_bars() -> Bars:
+    """Return a bar set with no rows"""
+    return {field: np.empty(0, dtype=np.int64 if field == "timestamp" else np.float64) for field in BAR_FIELDS}
+
+
+def merge_bars(cached: Bars, new: Bars) -> Bars:
+    """Merge newer bars into cached ones, replacing any overlapping bars
+
+    Both inputs are sorted by timestamp. Cached bars at or after the first new
+    timestamp are dropped, so a bar that was still forming when it was cached
+    is replaced by its final version.
+    """
+    if len(new["timestamp"]) == 0:
+        return cached
+    if len(cached["timestamp"]) == 0:
+        return new
+
+    cut = int(np.searchsorted(cached["timestamp"], new["timestamp"][0], side="left"))
+    return {field: np.concatenate([cached[field][:cut], new[field]]) for field in BAR_FIELDS}
+
+
+class BarCache:
+    """Caches intraday bars per ticker and interval and fetches only newer bars
+
+    Each (ticker, interval) series is kept as one numpy array per column and
+    persisted to `cache_dir` as a compressed .npz file, so it survives
+    restarts. A refresh asks the provider for bars starting at the last cached
+    timestamp; that last bar is refetched because it may have been incomplete.
+    Bars older than `retention` seconds are dropped.
+    """
+
+    def __init__(self, provider: QuoteProvider, cache_dir: Optional[str] = "data/bars",
+                 retention: float = 7 * 24 * 3600):
+        """Initialize the bar cache; cache_dir None keeps it in memory only"""
+        self.provider = provider
+        self.cache_dir = cache_dir
+        self.retention = retention
+        self._series: Dict[Tuple[str, str], Bars] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, ticker: str, interval: str) -> str:
+        # Both parts come from callers such as MCP tool arguments, so neither may leave cache_dir
+        safe_ticker = re.sub(r"[^A-Za-z0-9._-]", "_", ticker)
+        safe_interval = re.sub(r"[^A-Za-z0-9._-]", "_", interval)
+        return os.path.join(self.cache_dir, f"{safe_ticker}_{safe_interval}.npz")
+
+    def _load(self, ticker: str, interval: str) -> Bars:
+        if self.cache_dir is None:
+            return empty_bars()
+        path = self._path(ticker, interval)
+        if not os.path.exists(path):
+            return empty_bars()
+        try:
+            with np.load(path) as data:
+                return {field: data[field] for field in BAR_FIELDS}
+        except Exception as e:
+            logger.warning(f"⚠️  Ignoring unreadable bar cache {path}: {e}")
+            return empty_bars()
+
+    def _save(self, ticker: str, interval: str, bars: Bars) -> None:
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(ticker, interval)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez_compressed(f, **bars)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"❌ Failed to save bar cache for {ticker}: {e}")
+
+    def cached(self, ticker: str, interval: str = "1m") -> Bars:
+        """Get the cached bars for a ticker without fetching"""
+        key = (ticker, interval)
+        with self._lock:
+            if key not in self._series:
+                self._series[key] = self._load(ticker, interval)
+            return self._series[key]
+
+    def get_bars(self, ticker: str, interval: str = "1m", refresh: bool = True) -> Bars:
+        """Get bars for a ticker, first fetching any newer than the cache"""
+        bars = self.cached(ticker, interval)
+        if not refresh:
+            return bars
+
+        start = int(bars["timestamp"][-1]) if len(bars["timestamp"]) else None
+        new = self.provider.get_bars(ticker, interval=interval, start=start)
+        if new is None or len(new["timestamp"]) == 0:
+            return bars
+
+        merged = merge_bars(bars, new)
+        cutoff = time.time() - self.retention
+        keep = int(np.searchsorted(merged["timestamp"], cutoff, side="left"))
+        if keep:
+            merged = {field: values[keep:] for field, values in merged.items()}
+
+        with self._lock:
+            self._series[(ticker, interval)] = merged
+        self._save(ticker, interval, merged)
+        logger.debug(f"Bar cache {ticker} {interval}: +{len(new['timestamp'])} fetched, {len(merged['timestamp'])} cached")
+        return merged
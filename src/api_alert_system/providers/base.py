@@ -0,0 +1,69 @@
+"""
+Base quote provider interface for the API Alert System
+"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional
+import logging
+
+from ..core.metrics import get_metrics
+from ..core.tracing import get_tracer
+from ..core.models import Quote
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Intraday bars as one array per column: timestamp (epoch seconds), open, high, low, close, volume
+Bars = Dict[str, "np.ndarray"]
+
+
+class QuoteProvider:
+    """Base class for price sources
+
+    Subclasses implement `get_quote`. `get_quotes` fetches a batch and `stream`
+    yields quotes as they become available; the defaults build both on top of
+    `get_quote`, and providers that can do better override them.
+    """
+
+    name = "base"
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Fetch the latest quote for a ticker, or None if unavailable"""
+        raise NotImplementedError
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """Fetch the latest quotes for several tickers, timing and tracing each fetch"""
+        metrics = get_metrics()
+        tracer = get_tracer()
+        tags = {"provider": self.name}
+        quotes = {}
+        for ticker in tickers:
+            started = time.perf_counter()
+            with tracer.start_as_current_span("fetch_ticker", attributes={"ticker": ticker, "provider": self.name}) as span:
+                quotes[ticker] = self.get_quote(ticker)
+                span.set_attribute("outcome", "ok" if quotes[ticker] is not None else "missing")
+            metrics.timing("fetch.ticker.seconds", time.perf_counter() - started, tags)
+        return quotes
+
+    def is_available(self, ticker: str) -> bool:
+        """Whether the provider will currently try to fetch the ticker"""
+        return True
+
+    def get_bars(self, ticker: str, interval: str = "1m", start: Optional[int] = None) -> Optional[Bars]:
+        """Fetch intraday bars from `start` (epoch seconds) or for the current day; None if unsupported"""
+        return None
+
+    async def stream(self, tickers: List[str], interval: float = 1.0) -> AsyncIterator[Quote]:
+        """Yield quotes for the tickers, polling every `interval` seconds"""
+        while True:
+            quotes = await asyncio.to_thread(self.get_quotes, tickers)
+            for quote in quotes.values():
+                if quote is not None:
+                    yield quote
+            await asyncio.sleep(interval)
+
+    def close(self) -> None:
+        """Release any resources held by the provider"""
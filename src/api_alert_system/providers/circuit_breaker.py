@@ -0,0 +1,215 @@
+"""
+Circuit breakers that stop polling failing tickers and providers
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import logging
+
+from ..core.models import Quote
+from .base import Bars, QuoteProvider
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker with exponential probing
+
+    After `failure_threshold` consecutive failures the breaker opens and calls
+    are skipped for `base_backoff` seconds. It then goes half-open and lets
+    calls through again until the next result: a success closes it, a failure
+    reopens it with the backoff doubled, up to `max_backoff`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, base_backoff: float = 30.0,
+                 max_backoff: float = 1800.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize a closed breaker"""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.retry_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        with self._lock:
+            if self.state != self.OPEN:
+                return True
+            if self.clock() >= self.retry_at:
+                self.state = self.HALF_OPEN
+                logger.info(f"🔌 Circuit half-open for {self.name}, probing")
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ Circuit closed for {self.name}")
+            self.state = self.CLOSED
+            self.failures = 0
+            self.trips = 0
+            self.retry_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker once the threshold is reached"""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                backoff = min(self.base_backoff * (2 ** self.trips), self.max_backoff)
+                self.trips += 1
+                self.state = self.OPEN
+                self.retry_at = self.clock() + backoff
+                logger.warning(f"⛔ Circuit open for {self.name} after {self.failures} failures, retrying in {backoff:.0f}s")
+
+    def retry_in(self) -> Optional[float]:
+        """Seconds until an open breaker allows a probe"""
+        if self.state != self.OPEN:
+            return None
+        return max(0.0, self.retry_at - self.clock())
+
+    def to_dict(self) -> Dict:
+        """Convert the breaker state to a dictionary"""
+        return {
+            "name": self.name,
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": self.retry_in(),
+        }
+
+
+class CircuitBreakerProvider(QuoteProvider):
+    """Wraps a provider with one breaker per ticker and one for the provider
+
+    Tickers with an open breaker are skipped without a request, so a delisted
+    symbol stops costing a timeout every cycle. A batch in which every ticker
+    fails, or a provider call that raises, counts against the provider
+    breaker instead, and while that is open no requests are made at all.
+
+    A lone ticker that fails counts against its own breaker, since it may be
+    the one at fault. It only counts against the provider when its previous
+    fetch succeeded, so a delisted symbol polled on its own cannot trip the
+    provider breaker for the whole watchlist.
+    """
+
+    def __init__(self, provider: QuoteProvider, failure_threshold: int = 3, base_backoff: float = 30.0,
+                 max_backoff: float = 1800.0, clock: Callable[[], float] = time.monotonic):
+        """Initialize the breaker wrapper"""
+        self.provider = provider
+        self.name = provider.name
+        self._breaker_settings = {
+            "failure_threshold": failure_threshold,
+            "base_backoff": base_backoff,
+            "max_backoff": max_backoff,
+            "clock": clock,
+        }
+        self.provider_breaker = CircuitBreaker(f"provider {provider.name}", **self._breaker_settings)
+        self.ticker_breakers: Dict[str, CircuitBreaker] = {}
+        # Consecutive fetches that returned nothing, per ticker
+        self.ticker_misses: Dict[str, int] = {}
+
+    def __getattr__(self, name):
+        # Expose provider-specific attributes, e.g. ReplayProvider.exhausted
+        if name == "provider":
+            raise AttributeError(name)
+        return getattr(self.provider, name)
+
+    def breaker_for(self, ticker: str) -> CircuitBreaker:
+        """Get the breaker for a ticker"""
+        breaker = self.ticker_breakers.get(ticker)
+        if breaker is None:
+            breaker = self.ticker_breakers.setdefault(ticker, CircuitBreaker(ticker, **self._breaker_settings))
+        return breaker
+
+    def is_available(self, ticker: str) -> bool:
+        """Whether neither the provider nor the ticker breaker is open"""
+        return (self.provider_breaker.state != CircuitBreaker.OPEN
+                and self.breaker_for(ticker).state != CircuitBreaker.OPEN)
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Fetch a quote unless the ticker or provider breaker is open"""
+        return self.get_quotes([ticker])[ticker]
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """Fetch quotes for the tickers whose breakers allow it"""
+        quotes: Dict[str, Optional[Quote]] = {ticker: None for ticker in tickers}
+        if not self.provider_breaker.allow():
+            return quotes
+
+        allowed = [ticker for ticker in tickers if self.breaker_for(ticker).allow()]
+        if not allowed:
+            return quotes
+
+        try:
+            fetched = self.provider.get_quotes(allowed)
+        except Exception as e:
+            logger.error(f"Error fetching quotes from {self.name}: {e}")
+            self.provider_breaker.record_failure()
+            return quotes
+
+        failed = [ticker for ticker in allowed if fetched.get(ticker) is None]
+        if len(failed) == len(allowed):
+            if len(allowed) > 1:
+                # Nothing came back, so blame the provider rather than every ticker
+                self.provider_breaker.record_failure()
+            else:
+                ticker = allowed[0]
+                # A ticker that missed last time too is more likely dead than the provider down
+                if (self.ticker_misses.get(ticker, 0) == 0
+                        or self.provider_breaker.state == CircuitBreaker.HALF_OPEN):
+                    self.provider_breaker.record_failure()
+                self.breaker_for(ticker).record_failure()
+            for ticker in allowed:
+                self.ticker_misses[ticker] = self.ticker_misses.get(ticker, 0) + 1
+            return quotes
+
+        self.provider_breaker.record_success()
+        for ticker in allowed:
+            quote = fetched.get(ticker)
+            quotes[ticker] = quote
+            if quote is None:
+                self.ticker_misses[ticker] = self.ticker_misses.get(ticker, 0) + 1
+                self.breaker_for(ticker).record_failure()
+            else:
+                self.ticker_misses.pop(ticker, None)
+                self.breaker_for(ticker).record_success()
+        return quotes
+
+    def get_bars(self, ticker: str, interval: str = "1m", start: Optional[int] = None) -> Optional[Bars]:
+        """Fetch bars from the wrapped provider"""
+        return self.provider.get_bars(ticker, interval=interval, start=start)
+
+    def stream(self, tickers: List[str], interval: float = 1.0):
+        """Stream from the wrapped provider, which may push quotes itself"""
+        if type(self.provider).stream is QuoteProvider.stream:
+            return super().stream(tickers, interval)
+        return self.provider.stream(tickers, interval)
+
+    def open_breakers(self) -> List[CircuitBreaker]:
+        """Breakers that are currently open or half-open"""
+        breakers = [self.provider_breaker] + list(self.ticker_breakers.values())
+        return [breaker for breaker in breakers if breaker.state != CircuitBreaker.CLOSED]
+
+    def close(self) -> None:
+        """Close the wrapped provider"""
+        self.provider.close()
+
+
+def format_breaker_status(breakers: List[CircuitBreaker]) -> str:
+    """Format open breakers as status lines"""
+    lines = []
+    for breaker in breakers:
+        retry_in = breaker.retry_in()
+        when = f"retry in {retry_in:.0f}s" if retry_in is not None else "probing"
+        lines.append(f"⛔ {breaker.name}: {breaker.state.replace('_', '-')} after {breaker.failures} failures ({when})")
+    return "\n".join(lines)
@@ -0,0 +1,28 @@
+"""
+Quote provider selection for the API Alert System
+"""
+
+from .base import QuoteProvider
+
+
+def create_provider(name: str, replay_source: str = "database", replay_speedup: float = 1.0,
+                    db_manager=None, feed_host: str = "127.0.0.1", feed_port: int = 9100,
+                    yfinance_lightweight: bool = True, synthetic_options: dict = None) -> QuoteProvider:
+    """Create a quote provider by config name ("yfinance", "synthetic", "replay" or "feed")"""
+    if name == "synthetic":
+        from .synthetic import SyntheticProvider
+        return SyntheticProvider(**(synthetic_options or {}))
+
+    if name == "replay":
+        from .replay import ReplayProvider
+        return ReplayProvider.from_source(replay_source, speedup=replay_speedup, db_manager=db_manager)
+
+    if name == "feed":
+        from .feed import TCPFeedProvider
+        return TCPFeedProvider(feed_host, feed_port)
+
+    if name == "yfinance":
+        from .yahoo import YFinanceProvider
+        return YFinanceProvider(lightweight=yfinance_lightweight)
+
+    raise ValueError(f"Unknown quote provider: {name}")
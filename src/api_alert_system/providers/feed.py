@@ -0,0 +1,182 @@
+"""
+Push-based TCP quote feed and a local stand-in feed server
+
+The wire format is newline-delimited JSON. A client subscribes by sending
+`{"subscribe": ["AAPL", "TSLA"]}` and then receives one
+`{"ticker": ..., "price": ..., "timestamp": ...}` line per quote.
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Set
+import logging
+
+from ..core.models import Quote
+from .base import QuoteProvider
+
+logger = logging.getLogger(__name__)
+
+
+def encode_quote(quote: Quote) -> bytes:
+    """Encode a quote as one feed line"""
+    return (json.dumps({
+        "ticker": quote.ticker,
+        "price": quote.price,
+        "timestamp": quote.timestamp.isoformat(),
+    }, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decode_quote(line: bytes) -> Quote:
+    """Decode one feed line into a quote"""
+    data = json.loads(line)
+    return Quote(data["ticker"], float(data["price"]), datetime.fromisoformat(data["timestamp"]))
+
+
+class TCPFeedProvider(QuoteProvider):
+    """Receives pushed quotes from a TCP feed
+
+    `stream` yields quotes as soon as they arrive and reconnects with
+    exponential backoff if the feed drops. The latest streamed quote per
+    ticker is kept for `get_quote`, which has nothing to return until the
+    stream runs, so the bot only uses this provider with INGESTION_MODE=stream.
+    """
+
+    name = "feed"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100, max_backoff: float = 30.0):
+        """Initialize the feed provider"""
+        self.host = host
+        self.port = port
+        self.max_backoff = max_backoff
+        self.latest: Dict[str, Quote] = {}
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Get the most recent pushed quote for a ticker"""
+        return self.latest.get(ticker)
+
+    async def stream(self, tickers: List[str], interval: float = 1.0) -> AsyncIterator[Quote]:
+        """Yield pushed quotes for the tickers as they arrive"""
+        backoff = 0.5
+        while True:
+            writer = None
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                writer.write((json.dumps({"subscribe": list(tickers)}) + "\n").encode("utf-8"))
+                await writer.drain()
+                logger.info(f"📡 Subscribed to feed {self.host}:{self.port} for {len(tickers)} tickers")
+                backoff = 0.5
+
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    quote = decode_quote(line)
+                    self.latest[quote.ticker] = quote
+                    yield quote
+
+                logger.warning("⚠️  Feed connection closed")
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                logger.error(f"❌ Feed error: {e}")
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+
+class FeedServer:
+    """Local stand-in for a streaming quote feed, for testing and load tests"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """Initialize the feed server; port 0 picks a free port"""
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clients: Dict[asyncio.StreamWriter, Set[str]] = {}
+        self._subscribed = asyncio.Event()
+
+    async def start(self) -> "FeedServer":
+        """Start listening for subscribers"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"📡 Feed server listening on {self.host}:{self.port}")
+        return self
+
+    async def stop(self) -> None:
+        """Disconnect subscribers and stop listening"""
+        for writer in list(self._clients):
+            writer.close()
+        self._clients.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def wait_for_subscriber(self, timeout: float = 5.0) -> None:
+        """Wait until at least one client has subscribed"""
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(await reader.readline())
+            self._clients[writer] = set(request.get("subscribe", []))
+            self._subscribed.set()
+            # Keep the connection open until the client goes away
+            while await reader.readline():
+                pass
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    async def publish(self, quote: Quote) -> None:
+        """Push a quote to every client subscribed to its ticker"""
+        line = encode_quote(quote)
+        for writer, tickers in list(self._clients.items()):
+            if quote.ticker in tickers:
+                try:
+                    writer.write(line)
+                    await writer.drain()
+                except OSError:
+                    self._clients.pop(writer, None)
+
+    async def publish_from(self, provider: QuoteProvider, tickers: List[str], interval: float = 1.0) -> None:
+        """Publish everything another provider streams, e.g. synthetic or replayed ticks"""
+        async for quote in provider.stream(tickers, interval=interval):
+            await self.publish(quote)
+
+
+async def _serve(args) -> None:
+    from .factory import create_provider
+    provider = create_provider(args.provider, replay_source=args.replay_source, replay_speedup=args.speedup)
+    server = await FeedServer(args.host, args.port).start()
+    try:
+        await server.publish_from(provider, args.tickers, interval=args.interval)
+    finally:
+        await server.stop()
+
+
+def main():
+    """Run a local feed server publishing synthetic or replayed quotes"""
+    from ..utils.config import WATCHLIST
+    from ..utils.helpers import setup_logging
+
+    parser = argparse.ArgumentParser(description="Local streaming quote feed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--provider", default="synthetic", choices=["synthetic", "replay"])
+    parser.add_argument("--replay-source", default="database")
+    parser.add_argument("--speedup", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between synthetic quotes")
+    parser.add_argument("--tickers", nargs="*", default=list(WATCHLIST))
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(_serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Replay quote provider that plays back recorded ticks
+"""
+
+import asyncio
+import bisect
+import csv
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+import logging
+
+from ..core.models import Quote
+from .base import QuoteProvider
+
+logger = logging.getLogger(__name__)
+
+Tick = Tuple[datetime, str, float]
+
+
+def _parse_timestamp(value) -> datetime:
+    """Parse a recorded timestamp into a naive UTC datetime"""
+    if hasattr(value, "to_pydatetime"):
+        value = value.to_pydatetime()
+    elif not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _rows_to_ticks(rows: Iterable[Dict]) -> List[Tick]:
+    """Convert rows with ticker, timestamp (or fetched_at) and price columns into ticks"""
+    ticks = []
+    for row in rows:
+        timestamp = row.get("timestamp", row.get("fetched_at"))
+        ticks.append((_parse_timestamp(timestamp), str(row["ticker"]), float(row["price"])))
+    return ticks
+
+
+def load_ticks_from_csv(path: str) -> List[Tick]:
+    """Load ticks from a CSV file with ticker, timestamp and price columns"""
+    with open(path, newline="") as f:
+        return _rows_to_ticks(csv.DictReader(f))
+
+
+def load_ticks_from_parquet(path: str) -> List[Tick]:
+    """Load ticks from a Parquet file with ticker, timestamp and price columns"""
+    import pandas as pd
+    return _rows_to_ticks(pd.read_parquet(path).to_dict("records"))
+
+
+def load_ticks_from_database(db_manager, tickers: List[str] = None, since: datetime = None) -> List[Tick]:
+    """Load ticks from the price_history table"""
+    return _rows_to_ticks(db_manager.get_price_history(tickers=tickers, since=since))
+
+
+class ReplayProvider(QuoteProvider):
+    """Plays back recorded ticks on a virtual clock
+
+    The clock starts at the first recorded tick and runs `speedup` times faster
+    than real time; `get_quote` returns the latest tick at or before the current
+    virtual time. With `speedup` <= 0 the clock instead jumps to the next
+    recorded timestamp on every `get_quotes` call, replaying as fast as the
+    caller polls. Quotes keep their recorded timestamps.
+    """
+
+    name = "replay"
+
+    def __init__(self, ticks: List[Tick], speedup: float = 1.0, loop: bool = False):
+        """Initialize the replay provider with recorded ticks"""
+        self.ticks = sorted(ticks)
+        self.speedup = speedup
+        self.loop = loop
+        self._times: Dict[str, List[datetime]] = {}
+        self._prices: Dict[str, List[float]] = {}
+        for timestamp, ticker, price in self.ticks:
+            self._times.setdefault(ticker, []).append(timestamp)
+            self._prices.setdefault(ticker, []).append(price)
+        self._distinct_times = sorted({tick[0] for tick in self.ticks})
+        self._step = 0
+        self._started_at: Optional[float] = None
+
+        logger.info(f"🎞️  Replay loaded {len(self.ticks)} ticks for {len(self._times)} tickers")
+
+    @classmethod
+    def from_source(cls, source: str, speedup: float = 1.0, db_manager=None, **kwargs) -> "ReplayProvider":
+        """Create a replay provider from a .csv/.parquet path or "database" """
+        if source == "database":
+            if db_manager is None:
+                raise ValueError("Replaying from the database needs a DatabaseManager")
+            ticks = load_ticks_from_database(db_manager)
+        elif source.endswith(".parquet"):
+            ticks = load_ticks_from_parquet(source)
+        else:
+            ticks = load_ticks_from_csv(source)
+        return cls(ticks, speedup=speedup, **kwargs)
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return self.ticks[0][0] if self.ticks else None
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return self.ticks[-1][0] if self.ticks else None
+
+    def reset(self) -> None:
+        """Rewind the virtual clock to the first tick"""
+        self._step = 0
+        self._started_at = None
+
+    def virtual_now(self) -> Optional[datetime]:
+        """Current position of the replay clock"""
+        if not self.ticks:
+            return None
+        if self.speedup <= 0:
+            return self._distinct_times[min(self._step, len(self._distinct_times) - 1)]
+
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        elapsed = (time.monotonic() - self._started_at) * self.speedup
+        span = (self.end_time - self.start_time).total_seconds()
+        if self.loop and span > 0:
+            elapsed %= span
+        return self.start_time + timedelta(seconds=elapsed)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the replay clock has passed the last recorded tick"""
+        if not self.ticks or self.loop:
+            return False
+        if self.speedup <= 0:
+            return self._step >= len(self._distinct_times)
+        return self.virtual_now() > self.end_time
+
+    def _quote_at(self, ticker: str, moment: datetime) -> Optional[Quote]:
+        times = self._times.get(ticker)
+        if not times:
+            return None
+        index = bisect.bisect_right(times, moment) - 1
+        if index < 0:
+            return None
+        return Quote(ticker, self._prices[ticker][index], times[index])
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Get the latest recorded quote at the current virtual time"""
+        moment = self.virtual_now()
+        return self._quote_at(ticker, moment) if moment is not None else None
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """Get quotes for several tickers at the same virtual time"""
+        moment = self.virtual_now()
+        quotes = {ticker: self._quote_at(ticker, moment) if moment is not None else None for ticker in tickers}
+        if self.speedup <= 0:
+            self._step += 1
+            if self.loop and self._step >= len(self._distinct_times):
+                self._step = 0
+        return quotes
+
+    async def stream(self, tickers: List[str], interval: float = 1.0) -> AsyncIterator[Quote]:
+        """Yield recorded ticks in order, paced by the speed-up factor"""
+        wanted = set(tickers)
+        ticks = [tick for tick in self.ticks if tick[1] in wanted]
+        if not ticks:
+            logger.warning("⚠️  No recorded ticks for the requested tickers, nothing to replay")
+            return
+        while True:
+            previous = None
+            for timestamp, ticker, price in ticks:
+                if self.speedup > 0 and previous is not None and timestamp > previous:
+                    await asyncio.sleep((timestamp - previous).total_seconds() / self.speedup)
+                elif self.speedup <= 0:
+                    await asyncio.sleep(0)
+                previous = timestamp
+                yield Quote(ticker, price, timestamp)
+            if not self.loop:
+                return
+            # Pause between passes too, so a recording with a single tick cannot spin
+            await asyncio.sleep(interval / self.speedup if self.speedup > 0 else 0)
@@ -0,0 +1,148 @@
+"""
+Synthetic quote provider for demo mode and offline testing
+"""
+
+import math
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.models import Quote
+from .base import QuoteProvider
+
+BASE_PRICES = {
+    # Stocks
+    "AAPL": 190, "TSLA": 250, "SPY": 470, "NVDA": 140,
+    # Cryptocurrencies
+    "BTC-USD": 95000, "LTC-USD": 110, "BCH-USD": 450
+}
+
+
+def make_tickers(count: int, prefix: str = "SYM") -> List[str]:
+    """Generate ticker names for load tests"""
+    width = len(str(count))
+    return [f"{prefix}{i:0{width}d}" for i in range(count)]
+
+
+class MarketSimulator:
+    """Correlated geometric Brownian motion with jumps for many symbols at once
+
+    Every step draws one market-wide shock and one idiosyncratic shock per
+    symbol, so any two symbols have return correlation `correlation` without
+    building a covariance matrix. Jumps arrive as a Poisson process with
+    `jump_intensity` jumps per year and normally distributed log sizes; the
+    drift is compensated so `drift` stays the expected return. Rates are
+    annualized and `dt` is the step length in years.
+    """
+
+    def __init__(self, base_prices: Dict[str, float], drift: float = 0.0, volatility: float = 0.3,
+                 correlation: float = 0.3, jump_intensity: float = 5.0, jump_mean: float = 0.0,
+                 jump_std: float = 0.05, dt: float = 1 / 252, seed: Optional[int] = None):
+        """Initialize the simulator at the base prices"""
+        self.drift = drift
+        self.volatility = volatility
+        self.correlation = correlation
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.dt = dt
+        self.rng = np.random.default_rng(seed)
+        self.tickers: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.prices = np.empty(0, dtype=np.float64)
+        self.steps = 0
+        self.add_symbols(base_prices)
+
+    def add_symbols(self, base_prices: Dict[str, float]) -> None:
+        """Start simulating more symbols at the given prices"""
+        new = [(ticker, price) for ticker, price in base_prices.items() if ticker not in self.index]
+        if not new:
+            return
+        for ticker, _ in new:
+            self.index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        self.prices = np.concatenate([self.prices, np.array([price for _, price in new], dtype=np.float64)])
+
+    def _log_returns(self, steps: int) -> np.ndarray:
+        """Draw log returns with shape (steps, symbols)"""
+        n = len(self.tickers)
+        sigma = self.volatility * math.sqrt(self.dt)
+        common = self.rng.standard_normal((steps, 1))
+        own = self.rng.standard_normal((steps, n))
+        shocks = math.sqrt(self.correlation) * common + math.sqrt(1 - self.correlation) * own
+
+        jump_compensation = self.jump_intensity * (math.exp(self.jump_mean + self.jump_std ** 2 / 2) - 1)
+        mean = (self.drift - self.volatility ** 2 / 2 - jump_compensation) * self.dt
+        returns = mean + sigma * shocks
+
+        jump_counts = self.rng.poisson(self.jump_intensity * self.dt, (steps, n))
+        jumped = jump_counts > 0
+        if jumped.any():
+            counts = jump_counts[jumped]
+            returns[jumped] += self.jump_mean * counts + self.jump_std * np.sqrt(counts) * self.rng.standard_normal(counts.shape)
+        return returns
+
+    def step(self) -> np.ndarray:
+        """Advance every symbol one step and return the new prices"""
+        self.prices = self.prices * np.exp(self._log_returns(1)[0])
+        self.steps += 1
+        return self.prices
+
+    def generate(self, steps: int) -> np.ndarray:
+        """Advance `steps` steps and return the price paths with shape (steps, symbols)"""
+        paths = self.prices * np.exp(np.cumsum(self._log_returns(steps), axis=0))
+        self.prices = paths[-1].copy()
+        self.steps += steps
+        return paths
+
+
+class SyntheticProvider(QuoteProvider):
+    """Generates continuous, correlated mock prices starting from a base price per ticker
+
+    Each `get_quotes` call advances the simulated market by one step, so
+    prices drift, trend and occasionally jump across thresholds between polls.
+    Pass a seed for reproducible runs.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, base_prices: Dict[str, float] = None, default_price: float = 100,
+                 seed: Optional[int] = None, **simulator_options):
+        """Initialize the synthetic provider"""
+        self.base_prices = dict(BASE_PRICES if base_prices is None else base_prices)
+        self.default_price = default_price
+        self.simulator = MarketSimulator(self.base_prices, seed=seed, **simulator_options)
+        self._lock = threading.Lock()
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Advance the market one step and return the ticker's new price"""
+        return self.get_quotes([ticker])[ticker]
+
+    def get_quotes(self, tickers: List[str]) -> Dict[str, Optional[Quote]]:
+        """Advance the market one step and return prices for the tickers"""
+        with self._lock:
+            self.simulator.add_symbols({
+                ticker: self.base_prices.get(ticker, self.default_price)
+                for ticker in tickers if ticker not in self.simulator.index
+            })
+            prices = self.simulator.step()
+            return {ticker: Quote(ticker, float(prices[self.simulator.index[ticker]])) for ticker in tickers}
+
+
+_demo_provider: Optional[SyntheticProvider] = None
+
+
+def get_demo_price(ticker: str) -> float:
+    """Get the next simulated price for a ticker from a shared demo market"""
+    global _demo_provider
+    if _demo_provider is None:
+        from ..utils import config
+        _demo_provider = SyntheticProvider(
+            seed=config.SYNTHETIC_SEED,
+            volatility=config.SYNTHETIC_VOLATILITY,
+            correlation=config.SYNTHETIC_CORRELATION,
+            jump_intensity=config.SYNTHETIC_JUMP_INTENSITY,
+            dt=config.SYNTHETIC_STEP_DAYS / 252
+        )
+    return _demo_provider.get_quote(ticker).price
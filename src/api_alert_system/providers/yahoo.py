@@ -0,0 +1,173 @@
+"""
+Yahoo Finance quote provider for the API Alert System
+"""
+
+import time
+from typing import Dict, Optional
+import logging
+
+import numpy as np
+import requests
+
+from ..core.models import Quote
+from .base import Bars, QuoteProvider
+from .circuit_breaker import CircuitBreakerProvider
+
+logger = logging.getLogger(__name__)
+
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{ticker}"
+CHART_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; api-alert-system)"}
+
+
+def parse_chart_price(payload: Dict) -> Optional[float]:
+    """Read the latest market price from a chart API response"""
+    results = (payload.get("chart") or {}).get("result") or []
+    if not results:
+        return None
+    price = (results[0].get("meta") or {}).get("regularMarketPrice")
+    return float(price) if price is not None else None
+
+
+def parse_chart_bars(payload: Dict) -> Optional[Bars]:
+    """Read OHLCV bars from a chart API response, skipping bars without a close"""
+    results = (payload.get("chart") or {}).get("result") or []
+    if not results:
+        return None
+    result = results[0]
+    timestamps = result.get("timestamp") or []
+    quote = ((result.get("indicators") or {}).get("quote") or [{}])[0]
+
+    columns = {"timestamp": np.asarray(timestamps, dtype=np.int64)}
+    for field in ("open", "high", "low", "close", "volume"):
+        values = quote.get(field) or [None] * len(timestamps)
+        columns[field] = np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    valid = ~np.isnan(columns["close"])
+    return {field: values[valid] for field, values in columns.items()}
+
+
+class YFinanceProvider(QuoteProvider):
+    """Fetches live prices from Yahoo Finance
+
+    By default only the latest quote is requested: a single daily bar from the
+    chart API, whose metadata carries the current market price, is parsed
+    straight from JSON without building a DataFrame. If that fails the full
+    1-minute intraday history is fetched through yfinance instead.
+    """
+
+    name = "yfinance"
+
+    def __init__(self, lightweight: bool = True, timeout: float = 5):
+        """Initialize the Yahoo Finance provider"""
+        self.lightweight = lightweight
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+
+    def _get_session(self) -> requests.Session:
+        if self._session is None:
+            self._session = requests.Session()
+            self._session.headers.update(CHART_HEADERS)
+        return self._session
+
+    def fetch_latest_price(self, ticker: str) -> Optional[float]:
+        """Fetch only the latest market price for a ticker"""
+        response = self._get_session().get(
+            CHART_URL.format(ticker=ticker),
+            params={"range": "1d", "interval": "1d"},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return parse_chart_price(response.json())
+
+    def get_bars(self, ticker: str, interval: str = "1m", start: Optional[int] = None) -> Optional[Bars]:
+        """Fetch intraday bars from `start` (epoch seconds), or for the current day"""
+        params = {"interval": interval}
+        if start is None:
+            params["range"] = "1d"
+        else:
+            params.update({"period1": int(start), "period2": int(time.time()) + 60})
+
+        try:
+            response = self._get_session().get(CHART_URL.format(ticker=ticker), params=params, timeout=self.timeout)
+            response.raise_for_status()
+            bars = parse_chart_bars(response.json())
+            if bars is not None:
+                return bars
+        except Exception as e:
+            logger.warning(f"⚠️  Bar fetch for {ticker} failed, falling back to yfinance: {e}")
+
+        try:
+            import yfinance as yf
+            data = yf.Ticker(ticker)
+            if start is None:
+                hist = data.history(period="1d", interval=interval)
+            else:
+                hist = data.history(start=start, interval=interval)
+            return {
+                "timestamp": np.asarray([int(ts.timestamp()) for ts in hist.index], dtype=np.int64),
+                "open": hist["Open"].to_numpy(dtype=np.float64),
+                "high": hist["High"].to_numpy(dtype=np.float64),
+                "low": hist["Low"].to_numpy(dtype=np.float64),
+                "close": hist["Close"].to_numpy(dtype=np.float64),
+                "volume": hist["Volume"].to_numpy(dtype=np.float64),
+            }
+        except Exception as e:
+            logger.error(f"Error fetching bars for {ticker}: {e}")
+            return None
+
+    def fetch_history_price(self, ticker: str) -> Optional[float]:
+        """Fetch the latest 1-minute close from the full intraday history"""
+        # yfinance pulls in pandas, so it is only imported when the fallback is needed
+        import yfinance as yf
+        data = yf.Ticker(ticker)
+        hist = data.history(period="1d", interval="1m")
+        if hist.empty:
+            return None
+
+        # Take the last available "Close" price
+        return float(hist["Close"].iloc[-1])
+
+    def get_quote(self, ticker: str) -> Optional[Quote]:
+        """Fetch the latest price for a ticker, falling back to the intraday history"""
+        if self.lightweight:
+            try:
+                price = self.fetch_latest_price(ticker)
+                if price is not None:
+                    return Quote(ticker, price)
+                logger.warning(f"⚠️  No latest quote for {ticker}, falling back to history")
+            except Exception as e:
+                logger.warning(f"⚠️  Latest quote for {ticker} failed, falling back to history: {e}")
+
+        try:
+            price = self.fetch_history_price(ticker)
+            if price is None:
+                logger.warning(f"No data available for {ticker}")
+                return None
+            return Quote(ticker, price)
+
+        except Exception as e:
+            logger.error(f"Error fetching {ticker}: {e}")
+            return None
+
+    def close(self) -> None:
+        """Close the HTTP session"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_shared_provider: Optional[CircuitBreakerProvider] = None
+
+
+def get_shared_provider() -> CircuitBreakerProvider:
+    """Get a process-wide provider so callers share one HTTP session and circuit breakers"""
+    global _shared_provider
+    if _shared_provider is None:
+        _shared_provider = CircuitBreakerProvider(YFinanceProvider())
+    return _shared_provider
+
+
+def get_latest_price(ticker: str) -> Optional[float]:
+    """Fetch the latest price for a ticker with the shared provider"""
+    quote = get_shared_provider().get_quote(ticker)
+    return quote.price if quote is not None else None
@@ -7,6 +7,9 @@ load_dotenv()
 
 # 1) Which symbols to track, and at what thresholds (you can expand this)
 #    Format: { "TICKER": { "upper": float_or_None, "lower": float_or_None } }
+#    Optional per-ticker keys:
+#      "priority": "high" | "normal" | "low"  - polling tier (see PRIORITY_INTERVALS)
+#      "interval": seconds                     - explicit polling interval, overrides the tier
 WATCHLIST = {
     # Stocks - Normal monitoring ranges
     "AAPL": {"upper": 220.00, "lower": 180.00},    # Wider $40 range
@@ -15,9 +18,9 @@ WATCHLIST = {
     "NVDA": {"upper": 180.00, "lower": 120.00},    # Wider $60 range
     
     # Cryptocurrencies - Much wider ranges for volatility
-    "BTC-USD": {"upper": 110000.00, "lower": 85000.00},    # $25k range for Bitcoin
+    "BTC-USD": {"upper": 110000.00, "lower": 85000.00, "priority": "high"},    # $25k range for Bitcoin
     "LTC-USD": {"upper": 130.00, "lower": 70.00},          # $60 range for Litecoin
-    "BCH-USD": {"upper": 550.00, "lower": 350.00},         # $200 range for Bitcoin Cash
+    "BCH-USD": {"upper": 550.00, "lower": 350.00, "priority": "low"},          # $200 range for Bitcoin Cash
 }
 
 # 2) Polling interval (in seconds) - Updated to 10 seconds for frequent monitoring
@@ -30,6 +33,7 @@ POLL_INTERVAL = 10  # Check every 10 seconds for real-time monitoring
 # 2. Get your chat ID by messaging @userinfobot
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")  # Loaded from .env file
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")  # Loaded from .env file
+TELEGRAM_API_URL = os.getenv("TELEGRAM_API_URL", "https://api.telegram.org")  # Override for a local Bot API server or stub
 
 # Example of what they should look like:
 # TELEGRAM_TOKEN = "1234567890:ABCDEFGHIJKLMNOPQRSTUVWXYZ123456789"
@@ -74,4 +78,189 @@ POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "postgres")
 # POSTGRES_PORT=5432
 # POSTGRES_DB=stock_alerts
 # POSTGRES_USER=postgres
-# POSTGRES_PASSWORD=your_secure_password 
\ No newline at end of file
+# POSTGRES_PASSWORD=your_secure_password
+
+# 9) Price update messages
+#    "full"  - send the whole price table every poll
+#    "delta" - only send tickers that moved more than PRICE_DELTA_TICK (absolute $)
+#              or PRICE_DELTA_PERCENT (%) since they were last sent, plus a full
+#              snapshot every FULL_SNAPSHOT_INTERVAL seconds. Set either to 0 to disable it.
+PRICE_UPDATE_MODE = os.getenv("PRICE_UPDATE_MODE", "full").lower()
+PRICE_DELTA_TICK = float(os.getenv("PRICE_DELTA_TICK", "0"))
+PRICE_DELTA_PERCENT = float(os.getenv("PRICE_DELTA_PERCENT", "0.1"))
+FULL_SNAPSHOT_INTERVAL = int(os.getenv("FULL_SNAPSHOT_INTERVAL", "300"))  # Seconds between full snapshots
+
+# 10) Notification channels
+#    Comma-separated notifier names, in fan-out order. Built-in names are "telegram",
+#    "ntfy", "console" and "webhook"; plugins can be listed as "package.module:ClassName".
+#    ENABLE_TELEGRAM / ENABLE_NTFY still switch the built-in channels off.
+NOTIFIERS = [name.strip() for name in os.getenv("NOTIFIERS", "telegram,ntfy,console,webhook").split(",") if name.strip()]
+NOTIFIER_MAX_WORKERS = int(os.getenv("NOTIFIER_MAX_WORKERS", "8"))  # Threads used to send to channels concurrently
+
+# 11) Webhook notifications
+#    Structured JSON events are POSTed to every URL in WEBHOOK_URLS (comma-separated).
+#    Bodies are signed with HMAC-SHA256 in the X-Signature-256 header when WEBHOOK_SECRET is set.
+WEBHOOK_URLS = [url.strip() for url in os.getenv("WEBHOOK_URLS", "").split(",") if url.strip()]
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))  # Events per request
+WEBHOOK_GZIP = os.getenv("WEBHOOK_GZIP", "true").lower() in ("true", "1", "yes")
+
+# 12) Market-hours-aware polling
+#    Equities are polled every POLL_INTERVAL seconds during their exchange session only;
+#    crypto pairs (e.g. "BTC-USD") trade 24/7. Off-hours, tickers are polled every
+#    OFF_HOURS_INTERVAL seconds, or paused until the next session open when it is 0.
+#    A watchlist entry can pin its calendar with "calendar": "nyse" or "crypto".
+MARKET_HOURS_AWARE = os.getenv("MARKET_HOURS_AWARE", "true").lower() in ("true", "1", "yes")
+OFF_HOURS_INTERVAL = int(os.getenv("OFF_HOURS_INTERVAL", "0"))
+
+# 13) Priority tiers
+#    In-session polling interval (seconds) for each watchlist "priority" tier.
+#    Entries without a priority are "normal"; an entry's own "interval" always wins.
+PRIORITY_INTERVALS = {
+    "high": int(os.getenv("HIGH_PRIORITY_INTERVAL", "5")),
+    "normal": POLL_INTERVAL,
+    "low": int(os.getenv("LOW_PRIORITY_INTERVAL", "300")),
+}
+
+# 14) Proximity-driven adaptive polling
+#    When enabled, each ticker's next poll is scheduled from its distance to the nearest
+#    threshold scaled by its recent volatility: far-away tickers back off towards
+#    ADAPTIVE_MAX_INTERVAL, tickers close to a threshold speed up towards ADAPTIVE_MIN_INTERVAL.
+ADAPTIVE_POLLING = os.getenv("ADAPTIVE_POLLING", "false").lower() in ("true", "1", "yes")
+ADAPTIVE_MIN_INTERVAL = float(os.getenv("ADAPTIVE_MIN_INTERVAL", "2"))
+ADAPTIVE_MAX_INTERVAL = float(os.getenv("ADAPTIVE_MAX_INTERVAL", "300"))
+ADAPTIVE_SAFETY_FACTOR = float(os.getenv("ADAPTIVE_SAFETY_FACTOR", "3"))  # Standard deviations of movement allowed between polls
+
+# 15) Quote provider
+#    "yfinance"  - live prices from Yahoo Finance
+#    "synthetic" - generated prices (always used when DEMO_MODE is True)
+#    "feed"      - quotes pushed by a streaming TCP feed at FEED_HOST:FEED_PORT
+#    "replay"    - recorded ticks from REPLAY_SOURCE: a .csv/.parquet file with
+#                  ticker, timestamp and price columns, or "database" for price_history,
+#                  played back REPLAY_SPEEDUP times faster than real time (0 = as fast as polled)
+QUOTE_PROVIDER = os.getenv("QUOTE_PROVIDER", "yfinance").lower()
+REPLAY_SOURCE = os.getenv("REPLAY_SOURCE", "database")
+REPLAY_SPEEDUP = float(os.getenv("REPLAY_SPEEDUP", "60"))
+# Fetch only the latest quote from Yahoo's chart API instead of a full day of 1-minute bars
+# (the full history is still used as a fallback)
+YFINANCE_LIGHTWEIGHT_QUOTES = os.getenv("YFINANCE_LIGHTWEIGHT_QUOTES", "true").lower() == "true"
+# Intraday bars are cached per ticker and interval as compressed .npz files;
+# later requests only fetch bars newer than the cache
+BAR_CACHE_DIR = os.getenv("BAR_CACHE_DIR", "data/bars")
+BAR_CACHE_RETENTION_DAYS = float(os.getenv("BAR_CACHE_RETENTION_DAYS", "7"))
+
+# 16) Ingestion mode
+#    "poll"   - fetch prices on the scheduler's cadence
+#    "stream" - the quote provider pushes quotes into a queue and thresholds are checked
+#               per tick as they arrive; prices are persisted every POLL_INTERVAL seconds.
+#               Required by QUOTE_PROVIDER=feed, which only pushes quotes
+#               (local stand-in: python -m api_alert_system.providers.feed).
+INGESTION_MODE = os.getenv("INGESTION_MODE", "poll").lower()
+FEED_HOST = os.getenv("FEED_HOST", "127.0.0.1")
+FEED_PORT = int(os.getenv("FEED_PORT", "9100"))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "10000"))  # Quotes buffered before the feed is throttled
+
+# 17) Circuit breakers
+#    After CIRCUIT_FAILURE_THRESHOLD consecutive failures a ticker (or the whole provider,
+#    when a batch returns nothing) is skipped for CIRCUIT_BASE_BACKOFF seconds, then probed
+#    once; each failed probe doubles the wait, up to CIRCUIT_MAX_BACKOFF.
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() == "true"
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_BASE_BACKOFF = float(os.getenv("CIRCUIT_BASE_BACKOFF", "30"))
+CIRCUIT_MAX_BACKOFF = float(os.getenv("CIRCUIT_MAX_BACKOFF", "1800"))
+
+# 18) Synthetic market (demo mode and QUOTE_PROVIDER=synthetic)
+#    Correlated geometric Brownian motion with jumps; every poll advances the market one
+#    step of SYNTHETIC_STEP_DAYS. Rates are annualized. Set SYNTHETIC_SEED for reproducible runs.
+SYNTHETIC_SEED = int(os.getenv("SYNTHETIC_SEED")) if os.getenv("SYNTHETIC_SEED") else None
+SYNTHETIC_VOLATILITY = float(os.getenv("SYNTHETIC_VOLATILITY", "0.3"))
+SYNTHETIC_CORRELATION = float(os.getenv("SYNTHETIC_CORRELATION", "0.3"))
+SYNTHETIC_JUMP_INTENSITY = float(os.getenv("SYNTHETIC_JUMP_INTENSITY", "5"))  # Jumps per year
+SYNTHETIC_STEP_DAYS = float(os.getenv("SYNTHETIC_STEP_DAYS", "1"))  # Trading days per poll
+
+# 19) Metrics
+#    Stage timings (fetch, DB insert, evaluation, each notifier) and counters go to METRICS_SINK:
+#    "inprocess" keeps recent samples in memory and reports percentiles, "none" discards
+#    everything, and "module:Class" loads a custom MetricsSink subclass.
+#    A summary is logged every METRICS_REPORT_INTERVAL seconds (0 = only at shutdown).
+METRICS_SINK = os.getenv("METRICS_SINK", "inprocess")
+METRICS_REPORT_INTERVAL = int(os.getenv("METRICS_REPORT_INTERVAL", "300"))
+
+# 20) Status endpoint
+#    An embedded HTTP server serves Prometheus metrics on /metrics and a health check on
+#    /healthz, which returns 503 once no cycle has completed (and the scheduler has not been
+#    idle) for HEALTH_MAX_CYCLE_AGE seconds.
+STATUS_SERVER_ENABLED = os.getenv("STATUS_SERVER_ENABLED", "true").lower() == "true"
+STATUS_HOST = os.getenv("STATUS_HOST", "0.0.0.0")
+STATUS_PORT = int(os.getenv("STATUS_PORT", "9108"))
+HEALTH_MAX_CYCLE_AGE = float(os.getenv("HEALTH_MAX_CYCLE_AGE", "300"))
+
+# 21) Cycle profiling (off by default; `kill -USR1 <pid>` toggles it at runtime)
+#    Every PROFILE_EVERY_N-th poll cycle runs under cProfile (.prof); other cycles are
+#    stack-sampled every PROFILE_SAMPLE_INTERVAL seconds and kept as collapsed stacks
+#    (.folded) when they take at least PROFILE_SLOW_CYCLE_SECONDS (0 = off).
+#    Only the newest PROFILE_MAX_FILES profiles are kept in PROFILE_DIR.
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() == "true"
+PROFILE_EVERY_N = int(os.getenv("PROFILE_EVERY_N", "100"))
+PROFILE_SLOW_CYCLE_SECONDS = float(os.getenv("PROFILE_SLOW_CYCLE_SECONDS", "5"))
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "20"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+
+# 22) Tracing
+#    Each poll cycle becomes one trace with child spans per stage, ticker fetch and notifier
+#    send. TRACE_EXPORTER: "none", "memory", "file" (JSON lines in TRACE_FILE; show the
+#    slowest cycles with python -m api_alert_system.core.tracing) or "otel" (the
+#    OpenTelemetry SDK, configured through the standard OTEL_* variables; install it separately).
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "none").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "data/traces.jsonl")
+
+# 23) MCP server startup
+#    With MCP_FAST_START the stdio server answers list_tools before importing the quote
+#    providers or connecting to the database; the first tool call that needs them pays
+#    that cost instead. Set to false to load everything up front.
+MCP_FAST_START = os.getenv("MCP_FAST_START", "true").lower() == "true"
+
+# 24) Watchlist storage
+#    "database" keeps the watchlist in the watchlist table, seeded from WATCHLIST above
+#    on first run, so edits made through the MCP server reach the running bot: it checks
+#    the table's version counter every WATCHLIST_SYNC_INTERVAL seconds and applies only
+#    the changed tickers. "config" uses WATCHLIST as is.
+WATCHLIST_SOURCE = os.getenv("WATCHLIST_SOURCE", "database").lower()
+WATCHLIST_SYNC_INTERVAL = float(os.getenv("WATCHLIST_SYNC_INTERVAL", "5"))
+
+# 25) Per-user subscriptions
+#    Users' own thresholds live in the subscriptions table and their alerts go to the
+#    channels stored for them in the subscribers table, e.g.
+#    {"telegram": "<chat id>", "ntfy": "<topic>", "webhook": "<url>"} (sent through the
+#    notifiers loaded from NOTIFIERS). Each subscribed ticker is fetched once per poll,
+#    however many users watch it. With INGESTION_MODE=stream the rules are checked on
+#    every tick and alert when a price moves into breach. Edits are reloaded every
+#    WATCHLIST_SYNC_INTERVAL seconds in both modes.
+SUBSCRIPTIONS_ENABLED = os.getenv("SUBSCRIPTIONS_ENABLED", "true").lower() == "true"
+
+# 26) Sharding across bot workers
+#    With SHARDING_ENABLED several bots split the watchlist: tickers hash into
+#    SHARD_PARTITIONS partitions and each worker leases its fair share from the database,
+#    renewing every SHARD_HEARTBEAT_INTERVAL seconds (keep it well below SHARD_LEASE_SECONDS).
+#    Partitions move when workers join or leave; a stopped worker's partitions are taken
+#    over once its leases expire. WORKER_ID defaults to <hostname>-<pid>.
+SHARDING_ENABLED = os.getenv("SHARDING_ENABLED", "false").lower() == "true"
+SHARD_PARTITIONS = int(os.getenv("SHARD_PARTITIONS", "64"))
+SHARD_LEASE_SECONDS = float(os.getenv("SHARD_LEASE_SECONDS", "30"))
+SHARD_HEARTBEAT_INTERVAL = float(os.getenv("SHARD_HEARTBEAT_INTERVAL", "10"))
+WORKER_ID = os.getenv("WORKER_ID", "")
+
+# 27) Active-standby replicas
+#    With HA_MODE=active-standby, redundant bots share one lease in the database: only the
+#    holder fetches prices and sends notifications, renewing the lease every
+#    LEADER_HEARTBEAT_INTERVAL seconds. A standby takes over within LEADER_LEASE_SECONDS
+#    (plus one heartbeat) after the leader dies, or on its next heartbeat after a clean
+#    shutdown. It resumes from the last RESUME_LOOKBACK_HOURS of stored prices and alert
+#    history: price updates continue as deltas and, in streaming mode, breaches already in
+#    the alert history are not raised again.
+#    Not needed together with SHARDING_ENABLED, which already moves work off a dead worker.
+HA_MODE = os.getenv("HA_MODE", "off").lower()
+LEADER_LEASE_SECONDS = float(os.getenv("LEADER_LEASE_SECONDS", "15"))
+LEADER_HEARTBEAT_INTERVAL = float(os.getenv("LEADER_HEARTBEAT_INTERVAL", "5"))
+RESUME_LOOKBACK_HOURS = float(os.getenv("RESUME_LOOKBACK_HOURS", "24"))
@@ -0,0 +1,24 @@
+"""
+Lazy imports for package namespaces
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict
+
+
+def make_lazy_getattr(package: str, lazy_imports: Dict[str, str]) -> Callable[[str], Any]:
+    """Build a module `__getattr__` that imports names from their submodules on first use
+
+    `lazy_imports` maps each name to the module that defines it, relative to
+    `package`. The imported value is cached on the package so later lookups
+    skip the hook.
+    """
+    def __getattr__(name: str) -> Any:
+        if name in lazy_imports:
+            value = getattr(importlib.import_module(lazy_imports[name], package), name)
+            setattr(sys.modules[package], name, value)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    return __getattr__
@@ -5,6 +5,7 @@ Simple test for the Stock Alert MCP Server using stdio transport.
 
 import asyncio
 import subprocess
+import time
 from fastmcp import Client
 
 async def test_stdio_mcp():
@@ -17,11 +18,17 @@ async def test_stdio_mcp():
         print("🔗 Connecting to MCP server via stdio...")
         from fastmcp.client.transports import PythonStdioTransport
         transport = PythonStdioTransport("stock_alert_mcp_server.py")
+        started = time.perf_counter()
         async with Client(transport) as client:
+            connected = time.perf_counter()
             print("✅ Connected to MCP server via stdio")
             
             # List available tools
             tools = await client.list_tools()
+            first_response = time.perf_counter()
+            print(f"⏱️  Time to first response: {(first_response - started) * 1000:.0f} ms "
+                  f"(server start + handshake {(connected - started) * 1000:.0f} ms, "
+                  f"list_tools {(first_response - connected) * 1000:.0f} ms)")
             print(f"📋 Available tools ({len(tools)}):")
             for tool in tools:
                 print(f"  - {tool.name}: {tool.description}")
@@ -34,7 +41,9 @@ async def test_stdio_mcp():
             
             # Test a simple tool call
             print("\n🧪 Testing tool call: get_watchlist_status")
+            call_started = time.perf_counter()
             result = await client.call_tool("get_watchlist_status")
+            print(f"⏱️  First tool call (loads providers on demand): {(time.perf_counter() - call_started) * 1000:.0f} ms")
             print("✅ Tool call successful:")
             if hasattr(result, 'text'):
                 print(result.text)
@@ -0,0 +1,85 @@
+"""
+Shared fixtures and test doubles
+"""
+
+import copy
+import threading
+import time
+
+import pytest
+
+from benchmarks.support import SQLiteDatabaseManager
+
+from api_alert_system.notifications.base import BaseNotifier
+from api_alert_system.providers.synthetic import SyntheticProvider
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Open connections to one SQLite database under tmp_path, as separate processes would"""
+    path = str(tmp_path / "alerts.db")
+
+    def connect() -> SQLiteDatabaseManager:
+        db_manager = SQLiteDatabaseManager(path)
+        db_manager.connect()
+        db_manager.init_tables()
+        return db_manager
+
+    return connect
+
+
+class RecordingNotifier(BaseNotifier):
+    """Notifier that records what it was asked to send
+
+    `sent` holds the messages and `routed` the (destination, events) of each
+    alert batch; copies made by `with_destination` share both lists.
+    """
+
+    name = "recording"
+
+    def __init__(self, enabled: bool = True, succeed: bool = True, delay: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.enabled = enabled
+        self.succeed = succeed
+        self.delay = delay
+        self.destination = None
+        self.sent = []
+        self.routed = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.enabled
+
+    def send_message(self, message: str) -> bool:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.sent.append(message)
+        return self.succeed
+
+    def send_alert_events(self, events) -> bool:
+        self.routed.append((self.destination, events))
+        return super().send_alert_events(events)
+
+    def with_destination(self, destination):
+        routed = copy.copy(self)
+        routed.destination = destination
+        return routed
+
+
+class CountingProvider(SyntheticProvider):
+    """Synthetic provider that records the tickers it was asked for"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested = []
+
+    def get_quotes(self, tickers):
+        self.requested.extend(tickers)
+        return super().get_quotes(tickers)
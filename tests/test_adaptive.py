@@ -0,0 +1,47 @@
+"""
+Tests for proximity-driven adaptive polling
+"""
+
+import math
+
+from api_alert_system.core.adaptive import adaptive_interval, threshold_distance
+from api_alert_system.core.stock_monitor import StockMonitor
+
+THRESHOLDS = {"upper": 110.0, "lower": 90.0}
+
+
+def test_threshold_distance():
+    """Distance is measured to the nearest threshold and is 0 once beyond it"""
+    assert math.isclose(threshold_distance(100.0, THRESHOLDS), math.log(110 / 100))
+    assert threshold_distance(120.0, THRESHOLDS) == 0
+    assert threshold_distance(100.0, {"upper": None, "lower": None}) is None
+
+
+def test_interval_shrinks_near_threshold():
+    """Tickers close to a threshold are polled faster than distant ones"""
+    kwargs = dict(volatility=0.0005, base_interval=10, min_interval=2, max_interval=300)
+
+    far = adaptive_interval(100.0, THRESHOLDS, **kwargs)
+    near = adaptive_interval(109.5, THRESHOLDS, **kwargs)
+
+    assert far == 300
+    assert 2 <= near < far
+
+
+def test_interval_falls_back_to_base():
+    """Without history, or once breached, the base interval is used"""
+    kwargs = dict(base_interval=10, min_interval=2, max_interval=300)
+
+    assert adaptive_interval(100.0, THRESHOLDS, None, **kwargs) == 10
+    assert adaptive_interval(115.0, THRESHOLDS, 0.001, **kwargs) == 10
+
+
+def test_volatility_from_price_history():
+    """Volatility is estimated per second from the recorded samples"""
+    monitor = StockMonitor()
+    for second, price in enumerate([100.0, 101.0, 100.0, 101.0]):
+        monitor.record_price("AAPL", price, at=float(second))
+
+    volatility = monitor.get_volatility("AAPL")
+    assert math.isclose(volatility, abs(math.log(101 / 100)), rel_tol=1e-9)
+    assert monitor.get_volatility("TSLA") is None
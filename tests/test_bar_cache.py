@@ -0,0 +1,65 @@
+"""
+Tests for the incremental intraday bar cache
+"""
+
+import time
+
+import numpy as np
+
+from api_alert_system.providers.bar_cache import BarCache, merge_bars
+from api_alert_system.providers.base import QuoteProvider
+
+
+def make_bars(timestamps, closes):
+    closes = np.asarray(closes, dtype=np.float64)
+    return {
+        "timestamp": np.asarray(timestamps, dtype=np.int64),
+        "open": closes, "high": closes, "low": closes, "close": closes,
+        "volume": np.ones(len(closes)),
+    }
+
+
+class RecordedBarsProvider(QuoteProvider):
+    """Serves bars from a fixed series and records the requested start times"""
+
+    def __init__(self, bars):
+        self.bars = bars
+        self.starts = []
+
+    def get_bars(self, ticker, interval="1m", start=None):
+        self.starts.append(start)
+        keep = self.bars["timestamp"] >= (start or 0)
+        return {field: values[keep] for field, values in self.bars.items()}
+
+
+def test_merge_replaces_overlapping_bars():
+    """A refetched, previously incomplete bar replaces the cached one"""
+    merged = merge_bars(make_bars([60, 120, 180], [1, 2, 3]), make_bars([180, 240], [3.5, 4]))
+    assert merged["timestamp"].tolist() == [60, 120, 180, 240]
+    assert merged["close"].tolist() == [1, 2, 3.5, 4]
+
+
+def test_only_newer_bars_are_fetched_and_cache_survives_restart(tmp_path):
+    """Refreshes start at the last cached bar and the cache is reloaded from disk"""
+    now = int(time.time()) // 60 * 60
+    provider = RecordedBarsProvider(make_bars([now - 120, now - 60], [10, 11]))
+    cache = BarCache(provider, cache_dir=str(tmp_path))
+
+    assert cache.get_bars("AAPL")["close"].tolist() == [10, 11]
+    provider.bars = make_bars([now - 120, now - 60, now], [10, 11.5, 12])
+    assert cache.get_bars("AAPL")["close"].tolist() == [10, 11.5, 12]
+    assert provider.starts == [None, now - 60]
+    assert (tmp_path / "AAPL_1m.npz").exists()
+
+    restarted = BarCache(provider, cache_dir=str(tmp_path))
+    assert restarted.get_bars("AAPL", refresh=False)["timestamp"].tolist() == [now - 120, now - 60, now]
+
+
+def test_interval_cannot_escape_the_cache_dir(tmp_path):
+    """Path separators in the interval are replaced like those in the ticker"""
+    now = int(time.time()) // 60 * 60
+    cache_dir = tmp_path / "bars"
+    cache = BarCache(RecordedBarsProvider(make_bars([now], [10])), cache_dir=str(cache_dir))
+    cache.get_bars("AAPL", "../../x")
+    assert [path.name for path in cache_dir.iterdir()] == ["AAPL_.._.._x.npz"]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["bars"]
@@ -0,0 +1,21 @@
+"""
+Smoke test for the end-to-end benchmark harness
+"""
+
+from benchmarks.e2e_latency import run_size
+from benchmarks.support import StubHTTPServer
+
+
+def test_e2e_benchmark_measures_alert_latency():
+    """A small run delivers alerts to both stub endpoints and reports latencies"""
+    telegram, ntfy = StubHTTPServer(), StubHTTPServer()
+    try:
+        result = run_size(20, cycles=3, band=0.001, seed=1, database="sqlite", telegram=telegram, ntfy=ntfy)
+    finally:
+        telegram.close()
+        ntfy.close()
+
+    assert result["watchlist_size"] == 20
+    assert result["cycle_seconds"]["count"] == 3
+    assert result["alert_messages"] == 6
+    assert 0 < result["tick_to_alert_ms"]["p50"] <= result["tick_to_alert_ms"]["p99"]
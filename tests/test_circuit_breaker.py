@@ -0,0 +1,145 @@
+"""
+Tests for the per-ticker and per-provider circuit breakers
+"""
+
+from api_alert_system.core.models import Quote
+from api_alert_system.providers.base import QuoteProvider
+from api_alert_system.providers.circuit_breaker import CircuitBreaker, CircuitBreakerProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyProvider(QuoteProvider):
+    """Fails for tickers in `failing` and records every ticker it is asked for"""
+
+    name = "flaky"
+
+    def __init__(self, failing):
+        self.failing = set(failing)
+        self.requested = []
+
+    def get_quote(self, ticker):
+        self.requested.append(ticker)
+        return None if ticker in self.failing else Quote(ticker, 100.0)
+
+
+def test_breaker_opens_and_probes_with_exponential_backoff():
+    """Each failed probe doubles the wait and a success closes the breaker"""
+    clock = FakeClock()
+    breaker = CircuitBreaker("DEAD", failure_threshold=2, base_backoff=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_failure()
+    assert breaker.retry_in() == 20
+
+    clock.now = 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.trips == 0
+
+
+def test_failing_ticker_is_skipped_while_open():
+    """A dead symbol stops being requested but healthy ones keep flowing"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["DEAD"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    for _ in range(2):
+        provider.get_quotes(["AAPL", "DEAD"])
+    inner.requested.clear()
+
+    quotes = provider.get_quotes(["AAPL", "DEAD"])
+    assert inner.requested == ["AAPL"]
+    assert quotes["AAPL"].price == 100.0 and quotes["DEAD"] is None
+    assert not provider.is_available("DEAD")
+    assert [breaker.name for breaker in provider.open_breakers()] == ["DEAD"]
+
+
+def test_provider_breaker_opens_when_whole_batches_fail():
+    """An outage trips the provider breaker instead of every ticker's"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["AAPL", "TSLA"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    for _ in range(2):
+        provider.get_quotes(["AAPL", "TSLA"])
+    inner.requested.clear()
+
+    provider.get_quotes(["AAPL", "TSLA"])
+    assert inner.requested == []
+    assert provider.provider_breaker.state == CircuitBreaker.OPEN
+    assert provider.breaker_for("AAPL").state == CircuitBreaker.CLOSED
+
+
+def test_provider_breaker_opens_on_failed_single_ticker_fetches():
+    """Per-ticker polling still trips the provider breaker during an outage"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["AAPL", "TSLA", "MSFT"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    assert provider.get_quote("AAPL") is None
+    assert provider.get_quote("TSLA") is None
+    inner.requested.clear()
+
+    assert provider.get_quote("MSFT") is None
+    assert inner.requested == []
+    assert provider.provider_breaker.state == CircuitBreaker.OPEN
+
+
+def test_lone_dead_ticker_opens_its_own_breaker():
+    """Successful fetches in between keep the provider closed while the dead symbol trips"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["DEAD"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    for _ in range(2):
+        provider.get_quote("DEAD")
+        provider.get_quote("AAPL")
+
+    assert provider.provider_breaker.state == CircuitBreaker.CLOSED
+    assert provider.breaker_for("DEAD").state == CircuitBreaker.OPEN
+
+
+def test_dead_ticker_polled_alone_does_not_open_the_provider_breaker():
+    """Repeated misses of one symbol count against that symbol, not the whole provider"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["DEAD"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    for _ in range(2):
+        assert provider.get_quote("DEAD") is None
+    assert provider.provider_breaker.state == CircuitBreaker.CLOSED
+    assert provider.breaker_for("DEAD").state == CircuitBreaker.OPEN
+
+    clock.now = 60
+    assert provider.get_quote("DEAD") is None
+    assert provider.provider_breaker.state == CircuitBreaker.CLOSED
+    assert provider.get_quote("AAPL").price == 100.0
+
+
+def test_failed_probe_reopens_the_provider_breaker():
+    """While the provider is half-open any failed fetch counts, even of a ticker that missed before"""
+    clock = FakeClock()
+    inner = FlakyProvider(failing=["AAPL", "TSLA"])
+    provider = CircuitBreakerProvider(inner, failure_threshold=2, base_backoff=60, clock=clock)
+
+    provider.get_quote("AAPL")
+    provider.get_quote("TSLA")
+    assert provider.provider_breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 60
+    assert provider.get_quote("AAPL") is None
+    assert provider.provider_breaker.state == CircuitBreaker.OPEN
+    assert provider.provider_breaker.retry_in() == 120
@@ -0,0 +1,97 @@
+"""
+Tests for active-standby mode and the leader lease
+"""
+
+from datetime import datetime, timedelta
+
+from tests.conftest import CountingProvider
+
+from api_alert_system.core import alert_bot
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.leader import LeaderElection
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.notifications.registry import NotifierRegistry
+
+
+def test_one_leader_and_takeover_after_expiry(sqlite_db):
+    now = datetime(2025, 1, 6, 15, 0, 0)
+    a = LeaderElection(sqlite_db(), worker_id="a", lease_seconds=15)
+    b = LeaderElection(sqlite_db(), worker_id="b", lease_seconds=15)
+    assert a.heartbeat(now) is True
+    assert b.heartbeat(now) is False
+
+    # The leader keeps renewing; the standby cannot take over meanwhile
+    for step in range(1, 4):
+        later = now + timedelta(seconds=5 * step)
+        assert a.heartbeat(later) is True
+        assert b.heartbeat(later) is False
+
+    # a stops heartbeating: it steps down when its lease runs out, and b takes over
+    expired = now + timedelta(seconds=31)
+    assert a.is_leader(expired) is False
+    assert b.heartbeat(expired) is True
+    assert a.heartbeat(expired) is False
+
+
+def test_release_hands_over_right_away(sqlite_db):
+    now = datetime(2025, 1, 6, 15, 0, 0)
+    a = LeaderElection(sqlite_db(), worker_id="a", lease_seconds=15)
+    b = LeaderElection(sqlite_db(), worker_id="b", lease_seconds=15)
+    a.heartbeat(now)
+    assert b.heartbeat(now) is False
+    a.release()
+    assert a.is_leader(now) is False
+    assert b.heartbeat(now) is True
+
+
+def test_only_the_leader_fetches_and_a_standby_resumes(sqlite_db, monkeypatch):
+    monkeypatch.setattr(alert_bot, "HA_MODE", "active-standby")
+    watchlist = {"AAA": {"upper": 1.0, "lower": None}, "BBB": {"upper": None, "lower": None}}
+    bots = []
+    for worker_id in ("primary", "standby"):
+        monkeypatch.setattr(alert_bot, "WORKER_ID", worker_id)
+        bots.append(AlertBot(
+            watchlist=dict(watchlist),
+            db_manager=sqlite_db(),
+            provider=CountingProvider({"AAA": 100, "BBB": 50}, seed=1),
+            notifiers=NotifierRegistry([]),
+            metrics=InProcessMetrics()
+        ))
+    primary, standby = bots
+
+    for bot in bots:
+        bot.poll_due_tickers()
+    assert sorted(primary.stock_monitor.provider.requested) == ["AAA", "BBB"]
+    assert standby.stock_monitor.provider.requested == []
+    assert "alertbot_leader 0" in standby.render_metrics()
+
+    # The primary shuts down; the standby takes over from the prices it stored
+    primary.leader.release()
+    assert standby.check_leadership() is True
+    stored = {ticker: row["price"] for ticker, row in primary.db_manager.get_latest_prices(datetime(2000, 1, 1)).items()}
+    assert standby.stock_monitor.last_sent_prices == stored and set(stored) == {"AAA", "BBB"}
+    assert standby.resumed_breaches == {"AAA": frozenset(["UPPER"])}
+    standby.poll_due_tickers()
+    assert sorted(standby.stock_monitor.provider.requested) == ["AAA", "BBB"]
+
+
+def test_breach_without_a_recorded_alert_is_raised_again(sqlite_db, monkeypatch):
+    """Resume only suppresses breaches the alert history already holds"""
+    monkeypatch.setattr(alert_bot, "HA_MODE", "active-standby")
+    monkeypatch.setattr(alert_bot, "WORKER_ID", "standby")
+    db_manager = sqlite_db()
+    now = datetime.utcnow()
+    db_manager.insert_prices([("AAA", 120.0, now), ("BBB", 5.0, now), ("OLD", 1.0, now - timedelta(days=3))])
+    db_manager.insert_alerts([("AAA", "UPPER", 120.0, 100.0, now)])
+
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 100, "lower": None}, "BBB": {"upper": None, "lower": 10},
+                   "OLD": {"upper": None, "lower": 10}},
+        db_manager=db_manager,
+        provider=CountingProvider({"AAA": 120, "BBB": 5}, seed=1),
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+    assert bot.leader.is_leader()
+    assert bot.resumed_breaches == {"AAA": frozenset(["UPPER"])}
+    assert bot.stock_monitor.last_sent_prices == {"AAA": 120.0, "BBB": 5.0}
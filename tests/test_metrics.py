@@ -0,0 +1,81 @@
+"""
+Tests for the per-stage metrics
+"""
+
+from benchmarks.support import SQLiteDatabaseManager
+
+from tests.conftest import RecordingNotifier
+
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics, MetricsSink, create_metrics
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.synthetic import SyntheticProvider
+
+
+def test_in_process_metrics_reports_percentiles():
+    """Timings keep count, sum and percentiles per tag set"""
+    metrics = InProcessMetrics()
+    for ms in range(1, 101):
+        metrics.timing("fetch.seconds", ms / 1000, {"provider": "a"})
+    metrics.timing("fetch.seconds", 5.0, {"provider": "b"})
+    metrics.increment("fetch.missing", 2)
+    metrics.increment("fetch.missing", 3)
+
+    percentiles = metrics.percentiles("fetch.seconds", {"provider": "a"})
+    assert percentiles == {"p50": 0.051, "p90": 0.091, "p99": 0.1}
+
+    snapshot = metrics.snapshot()
+    assert snapshot["timings"]["fetch.seconds{provider=a}"]["count"] == 100
+    assert snapshot["timings"]["fetch.seconds{provider=b}"]["p99"] == 5.0
+    assert snapshot["counters"]["fetch.missing"] == 5
+    assert "fetch.seconds{provider=a}" in metrics.report()
+
+
+def test_reservoir_keeps_recent_samples():
+    """Percentiles come from the most recent samples while the count covers all of them"""
+    metrics = InProcessMetrics(reservoir_size=10)
+    with metrics.timer("slow"):
+        pass
+    for _ in range(20):
+        metrics.timing("slow", 1.0)
+
+    assert metrics.percentiles("slow") == {"p50": 1.0, "p90": 1.0, "p99": 1.0}
+    assert metrics.snapshot()["timings"]["slow"]["count"] == 21
+
+
+def test_create_metrics_by_name():
+    assert isinstance(create_metrics("inprocess"), InProcessMetrics)
+    assert type(create_metrics("none")) is MetricsSink
+    assert isinstance(create_metrics("api_alert_system.core.metrics:InProcessMetrics"), InProcessMetrics)
+
+
+def test_alert_cycle_records_every_stage():
+    """A check cycle times fetch, DB insert, evaluation and each notifier"""
+    watchlist = {"AAA": {"upper": 50, "lower": 10}, "BBB": {"upper": 500, "lower": 10}}
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    notifiers = NotifierRegistry([RecordingNotifier(), RecordingNotifier(succeed=False)])
+    metrics = InProcessMetrics()
+    bot = AlertBot(
+        watchlist=watchlist,
+        db_manager=db_manager,
+        provider=SyntheticProvider({"AAA": 100, "BBB": 100}, seed=1, volatility=0, jump_intensity=0),
+        notifiers=notifiers,
+        metrics=metrics
+    )
+
+    bot.check_prices_and_send_alerts()
+    notifiers.close()
+    db_manager.disconnect()
+
+    timings = metrics.snapshot()["timings"]
+    counters = metrics.snapshot()["counters"]
+    for stage in ["fetch", "db_insert", "evaluate", "notify_prices", "notify_alerts", "db_insert_alerts"]:
+        assert timings[f"stage.seconds{{stage={stage}}}"]["count"] == 1
+    assert timings["fetch.batch.seconds{provider=synthetic}"]["count"] == 1
+    assert timings["notify.seconds{notifier=recording}"]["count"] == 4
+    assert counters["notify.sent{notifier=recording}"] == 2
+    assert counters["notify.failed{notifier=recording}"] == 2
+    assert counters["fetch.quotes{provider=synthetic}"] == 2
+    assert counters["alerts.raised"] == 1
+    assert timings["cycle.seconds"]["count"] == 1
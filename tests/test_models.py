@@ -0,0 +1,49 @@
+"""
+Tests for the quote and alert event models
+"""
+
+from datetime import datetime
+
+from api_alert_system.core.models import AlertEvent, Quote, render_alert_events
+from api_alert_system.core.stock_monitor import StockMonitor
+
+
+def test_build_alert_events_uses_watchlist_thresholds():
+    """One event is created per breached threshold"""
+    monitor = StockMonitor()
+    now = datetime(2025, 1, 6, 15, 0, 0)
+    watchlist = {"AAPL": {"upper": 200.0, "lower": 150.0}, "TSLA": {"upper": 300.0, "lower": 200.0}}
+
+    events = monitor.build_alert_events(watchlist, {"AAPL": 140.0, "TSLA": None}, now)
+
+    assert len(events) == 1
+    assert events[0].to_dict() == {
+        "type": "alert",
+        "ticker": "AAPL",
+        "alert_type": "LOWER",
+        "price": 140.0,
+        "threshold": 150.0,
+        "timestamp": "2025-01-06T15:00:00",
+    }
+
+
+def test_render_is_cached_per_style():
+    """Rendering twice in the same style returns the cached string"""
+    event = AlertEvent(Quote("AAPL", 210.0), "UPPER", 200.0)
+
+    markdown = event.render(markdown=True)
+    plain = event.render(markdown=False)
+
+    assert markdown.startswith("*AAPL*")
+    assert plain.startswith("AAPL")
+    assert event.render(markdown=True) is markdown
+
+
+def test_render_alert_events_batches_into_one_message():
+    """A batch renders as a single alert message"""
+    quote = Quote("AAPL", 210.0, datetime(2025, 1, 6, 15, 0, 0))
+    message = render_alert_events([AlertEvent(quote, "UPPER", 200.0), AlertEvent(quote, "LOWER", 220.0)])
+
+    assert message.startswith("🚨 *Price Alert*\n`2025-01-06 15:00:00`")
+    assert "Above upper threshold: $200.0" in message
+    assert "Below lower threshold: $220.0" in message
@@ -0,0 +1,83 @@
+"""
+Tests for the notifier interface and registry
+"""
+
+import asyncio
+from datetime import datetime
+
+from tests.conftest import RecordingNotifier
+
+from api_alert_system.core.models import AlertEvent, Quote
+from api_alert_system.notifications.base import truncate_markdown
+from api_alert_system.notifications.registry import NotifierRegistry
+
+
+def test_broadcast_skips_disabled_notifiers():
+    """Only enabled notifiers receive messages"""
+    enabled, disabled = RecordingNotifier(), RecordingNotifier(enabled=False)
+    registry = NotifierRegistry([enabled, disabled])
+
+    assert registry.broadcast("alert", "hello") == 1
+    assert enabled.sent == ["hello"]
+    assert disabled.sent == []
+    registry.close()
+
+
+def test_prepare_message_applies_capabilities():
+    """Markdown is stripped and long messages are truncated"""
+    notifier = RecordingNotifier()
+    notifier.max_message_length = 10
+
+    notifier.deliver("price_update", "*bold* `code` and more")
+    assert notifier.sent == ["bold code…"]
+
+
+def test_alert_events_are_prepared_like_messages():
+    """Event batches are truncated and stripped for the channel too"""
+    notifier = RecordingNotifier()
+    notifier.max_message_length = 200
+    quote = Quote("AAA", 120.0, datetime(2025, 1, 6, 15, 0))
+    events = [AlertEvent(quote, "UPPER", 100.0 + i) for i in range(20)]
+
+    assert notifier.deliver_events(events)
+    message = notifier.sent[0]
+    assert len(message) <= 200 and message.endswith("…")
+    assert not any(mark in message for mark in "*_`")
+
+
+def test_markdown_truncation_keeps_entities_closed():
+    """A cut inside a bold or code span backs up to before the span"""
+    message = "🚨 *Price Alert*\n`2025-01-06 15:00:00`\n\n*AAA* above `100.00`"
+    for limit in range(2, len(message)):
+        cut = truncate_markdown(message, limit)
+        assert len(cut) <= limit
+        assert all(cut.count(mark) % 2 == 0 for mark in "*_`")
+    assert truncate_markdown(message, 25) == "🚨 *Price Alert*\n…"
+
+
+def test_concurrency_limit_is_respected():
+    """A notifier never runs more sends at once than its limit"""
+    notifier = RecordingNotifier(delay=0.02, max_concurrency=2)
+
+    async def fan_out():
+        await asyncio.gather(*(notifier.async_send_alert(f"alert {i}") for i in range(6)))
+
+    asyncio.run(fan_out())
+    assert len(notifier.sent) == 6
+    assert notifier.peak <= 2
+
+
+def test_async_broadcast_counts_successes():
+    """Async fan-out reports how many channels accepted the message"""
+    registry = NotifierRegistry([RecordingNotifier(), RecordingNotifier()])
+    assert asyncio.run(registry.async_broadcast("alert", "hi")) == 2
+
+
+def test_ntfy_titles_with_emoji_are_header_safe():
+    """Non-latin-1 titles are RFC 2047-encoded so requests can send them"""
+    from api_alert_system.notifications.ntfy import encode_header
+
+    assert encode_header("Price Update") == "Price Update"
+    encoded = encode_header("🚨 Price Alert")
+    encoded.encode("latin-1")
+    assert encoded.startswith("=?UTF-8?B?") and encoded.endswith("?=")
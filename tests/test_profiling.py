@@ -0,0 +1,58 @@
+"""
+Tests for opt-in cycle profiling
+"""
+
+import os
+import pstats
+import time
+
+from api_alert_system.core.profiling import CycleProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = CycleProfiler(output_dir=str(tmp_path), every=1)
+    with profiler.profile():
+        busy(0.01)
+    assert profiler.cycles == 0 and not os.listdir(tmp_path)
+
+
+def test_every_nth_cycle_is_profiled_with_cprofile(tmp_path):
+    profiler = CycleProfiler(output_dir=str(tmp_path), every=2, enabled=True)
+    for _ in range(4):
+        with profiler.profile():
+            busy(0.001)
+
+    profiles = sorted(os.listdir(tmp_path))
+    assert len(profiles) == 2 and all(name.endswith(".prof") for name in profiles)
+    assert any("busy" in function for _, _, function in pstats.Stats(profiler.last_profile).stats)
+
+
+def test_slow_cycles_keep_sampled_stacks(tmp_path):
+    profiler = CycleProfiler(output_dir=str(tmp_path), every=0, slow_threshold=0.05,
+                             sample_interval=0.001, enabled=True)
+    with profiler.profile():
+        busy(0.001)
+    assert not os.listdir(tmp_path)
+
+    with profiler.profile():
+        busy(0.1)
+    with open(profiler.last_profile) as f:
+        stacks = f.read()
+    assert profiler.last_profile.endswith(".folded")
+    assert "test_profiling:busy" in stacks
+
+
+def test_rotation_and_toggle(tmp_path):
+    profiler = CycleProfiler(output_dir=str(tmp_path), every=1, max_files=3)
+    assert profiler.toggle() is True
+    for _ in range(5):
+        with profiler.profile():
+            pass
+    assert len(os.listdir(tmp_path)) == 3
+    assert profiler.toggle() is False
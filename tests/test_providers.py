@@ -0,0 +1,143 @@
+"""
+Tests for the quote providers
+"""
+
+import asyncio
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from api_alert_system.core import alert_bot
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.stock_monitor import StockMonitor
+from api_alert_system.providers.replay import ReplayProvider, load_ticks_from_csv
+from api_alert_system.providers.synthetic import MarketSimulator, SyntheticProvider, make_tickers
+from api_alert_system.providers.yahoo import YFinanceProvider, parse_chart_price
+
+CSV = """ticker,timestamp,price
+AAPL,2025-01-06T15:00:00,190.0
+TSLA,2025-01-06T15:00:00,250.0
+AAPL,2025-01-06T15:00:10,191.5
+TSLA,2025-01-06T15:00:20,248.0
+"""
+
+
+def test_replay_steps_through_recorded_ticks(tmp_path):
+    """With no speed-up each poll advances to the next recorded timestamp"""
+    path = tmp_path / "ticks.csv"
+    path.write_text(CSV)
+    provider = ReplayProvider(load_ticks_from_csv(str(path)), speedup=0)
+
+    first = provider.get_quotes(["AAPL", "TSLA"])
+    second = provider.get_quotes(["AAPL", "TSLA"])
+    third = provider.get_quotes(["AAPL", "TSLA"])
+
+    assert (first["AAPL"].price, first["TSLA"].price) == (190.0, 250.0)
+    assert (second["AAPL"].price, second["TSLA"].price) == (191.5, 250.0)
+    assert third["TSLA"].price == 248.0
+    assert third["TSLA"].timestamp == datetime(2025, 1, 6, 15, 0, 20)
+    assert provider.exhausted
+
+
+def test_replay_stream_yields_ticks_in_order(tmp_path):
+    """Streaming replays only the requested tickers, in recorded order"""
+    path = tmp_path / "ticks.csv"
+    path.write_text(CSV)
+    provider = ReplayProvider.from_source(str(path), speedup=0)
+
+    async def collect():
+        return [(quote.ticker, quote.price) async for quote in provider.stream(["AAPL"])]
+
+    assert asyncio.run(collect()) == [("AAPL", 190.0), ("AAPL", 191.5)]
+
+
+def test_looping_replay_stream_does_not_block_the_event_loop(tmp_path):
+    """A looped stream with nothing to replay ends, and a single tick still yields to other tasks"""
+    path = tmp_path / "ticks.csv"
+    path.write_text(CSV)
+    provider = ReplayProvider.from_source(str(path), speedup=1000, loop=True)
+
+    async def collect(provider, tickers, count):
+        ticks = 0
+
+        async def count_ticks():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        counter = asyncio.create_task(count_ticks())
+        quotes = []
+        async for quote in provider.stream(tickers, interval=0.01):
+            quotes.append(quote.price)
+            if len(quotes) == count:
+                break
+        counter.cancel()
+        return quotes, ticks
+
+    assert asyncio.run(asyncio.wait_for(collect(provider, ["MSFT"], 1), timeout=5))[0] == []
+
+    one_tick = ReplayProvider(provider.ticks[:1], speedup=1000, loop=True)
+    quotes, ticks = asyncio.run(asyncio.wait_for(collect(one_tick, ["AAPL"], 3), timeout=5))
+    assert quotes == [190.0, 190.0, 190.0]
+    assert ticks > 0
+
+
+def test_stock_monitor_uses_provider():
+    """StockMonitor reads prices through its provider"""
+    monitor = StockMonitor(provider=SyntheticProvider({"AAPL": 100}, volatility=0, jump_intensity=0))
+
+    assert monitor.get_prices_for_watchlist({"AAPL": {}, "TSLA": {}}) == {"AAPL": 100, "TSLA": 100}
+
+
+def test_chart_price_is_read_from_metadata():
+    """The lightweight fetch reads the live price without any bars"""
+    payload = {"chart": {"result": [{"meta": {"symbol": "AAPL", "regularMarketPrice": 191.5}}], "error": None}}
+    assert parse_chart_price(payload) == 191.5
+    assert parse_chart_price({"chart": {"result": None, "error": {"code": "Not Found"}}}) is None
+
+
+def test_yfinance_falls_back_to_history():
+    """A failed lightweight fetch falls back to the intraday history"""
+    class OfflineProvider(YFinanceProvider):
+        def fetch_latest_price(self, ticker):
+            raise ConnectionError("offline")
+
+        def fetch_history_price(self, ticker):
+            return 190.0
+
+    assert OfflineProvider().get_quote("AAPL").price == 190.0
+
+
+def test_synthetic_market_is_reproducible_and_continuous():
+    """Seeded providers produce the same path, moving gradually from the base price"""
+    first = SyntheticProvider(seed=7)
+    second = SyntheticProvider(seed=7)
+    path = [first.get_quote("AAPL").price for _ in range(50)]
+
+    assert path == [second.get_quote("AAPL").price for _ in range(50)]
+    assert len(set(path)) == 50
+    steps = np.abs(np.diff(np.log([190.0] + path)))
+    assert steps.max() < 0.25
+
+
+def test_simulator_generates_correlated_paths_for_many_symbols():
+    """Returns of different symbols share the market factor"""
+    tickers = make_tickers(2000)
+    simulator = MarketSimulator(dict.fromkeys(tickers, 100.0), correlation=0.5, jump_intensity=0, seed=1)
+    paths = simulator.generate(250)
+
+    assert paths.shape == (250, 2000)
+    returns = np.diff(np.log(paths), axis=0)
+    correlation = np.corrcoef(returns[:, 0], returns[:, 1])[0, 1]
+    assert 0.3 < correlation < 0.7
+
+
+def test_feed_provider_is_rejected_in_poll_mode(monkeypatch):
+    """A push feed has nothing to return to polls, so the bot refuses to start"""
+    monkeypatch.setattr(alert_bot, "DEMO_MODE", False)
+    monkeypatch.setattr(alert_bot, "QUOTE_PROVIDER", "feed")
+    monkeypatch.setattr(alert_bot, "INGESTION_MODE", "poll")
+    with pytest.raises(ValueError, match="INGESTION_MODE=stream"):
+        AlertBot(watchlist={})
@@ -0,0 +1,96 @@
+"""
+Tests for trading calendars and the poll scheduler
+"""
+
+from datetime import datetime, timedelta
+
+from api_alert_system.core.market_hours import CRYPTO, NYSE, calendar_for
+from api_alert_system.core.scheduler import PollScheduler
+
+WATCHLIST = {
+    "AAPL": {"upper": 220.0, "lower": 180.0},
+    "BTC-USD": {"upper": 110000.0, "lower": 85000.0},
+}
+
+
+def test_calendar_for_ticker():
+    """Crypto pairs trade 24/7, everything else follows the NYSE"""
+    assert calendar_for("BTC-USD") is CRYPTO
+    assert calendar_for("AAPL") is NYSE
+    assert calendar_for("AAPL", {"calendar": "crypto"}) is CRYPTO
+
+
+def test_nyse_session_hours():
+    """The NYSE is open 9:30-16:00 New York time on trading days"""
+    assert NYSE.is_open(datetime(2025, 1, 6, 15, 0))       # Monday 10:00 EST
+    assert not NYSE.is_open(datetime(2025, 1, 6, 21, 30))  # Monday 16:30 EST
+    assert not NYSE.is_open(datetime(2025, 1, 4, 15, 0))   # Saturday
+    assert not NYSE.is_open(datetime(2025, 12, 25, 15, 0))  # Christmas
+    assert not NYSE.is_open(datetime(2025, 11, 28, 18, 30))  # Early close at 13:00 EST
+
+
+def test_next_open_skips_weekend():
+    """After Friday's close the next open is Monday morning"""
+    next_open = NYSE.next_open(datetime(2025, 1, 10, 22, 0))
+    assert next_open.replace(tzinfo=None) == datetime(2025, 1, 13, 14, 30)
+
+
+def test_scheduler_pauses_equities_off_hours():
+    """Off-hours equities wait for the next open while crypto keeps polling"""
+    scheduler = PollScheduler(in_session_interval=10, off_hours_interval=0)
+    saturday = datetime(2025, 1, 11, 12, 0)
+
+    assert scheduler.due_tickers(WATCHLIST, saturday) == ["AAPL", "BTC-USD"]
+    assert scheduler.next_due["AAPL"] == datetime(2025, 1, 13, 14, 30)
+    assert scheduler.due_tickers(WATCHLIST, datetime(2025, 1, 11, 12, 0, 10)) == ["BTC-USD"]
+    assert scheduler.paused_tickers(datetime(2025, 1, 11, 12, 0, 10)) == ["AAPL"]
+
+
+def test_scheduler_off_hours_interval():
+    """A non-zero off-hours interval keeps polling slowly"""
+    scheduler = PollScheduler(in_session_interval=10, off_hours_interval=600)
+    saturday = datetime(2025, 1, 11, 12, 0)
+
+    scheduler.due_tickers(WATCHLIST, saturday)
+    assert scheduler.next_due["AAPL"] == datetime(2025, 1, 11, 12, 10)
+
+
+def test_priority_tiers_and_explicit_intervals():
+    """High-priority tickers poll faster and explicit intervals override tiers"""
+    scheduler = PollScheduler(in_session_interval=10, market_hours_aware=False,
+                              priority_intervals={"high": 2, "normal": 10, "low": 60})
+    watchlist = {
+        "AAA": {"priority": "high"},
+        "BBB": {},
+        "CCC": {"priority": "low", "interval": 30},
+    }
+    start = datetime(2025, 1, 6, 15, 0)
+
+    assert scheduler.due_tickers(watchlist, start) == ["AAA", "BBB", "CCC"]
+
+    polls = {ticker: 0 for ticker in watchlist}
+    for second in range(1, 61):
+        for ticker in scheduler.due_tickers(watchlist, start + timedelta(seconds=second)):
+            polls[ticker] += 1
+
+    assert polls == {"AAA": 30, "BBB": 6, "CCC": 2}
+
+
+def test_removed_tickers_are_dropped():
+    """Tickers removed from the watchlist are no longer scheduled"""
+    scheduler = PollScheduler(in_session_interval=10, market_hours_aware=False)
+    start = datetime(2025, 1, 6, 15, 0)
+    scheduler.due_tickers({"AAA": {}, "BBB": {}}, start)
+
+    assert scheduler.due_tickers({"AAA": {}}, datetime(2025, 1, 6, 15, 0, 10)) == ["AAA"]
+    assert "BBB" not in scheduler.next_due
+
+
+def test_swapped_ticker_with_same_size_is_scheduled():
+    """Replacing a ticker keeps the size but still schedules the newcomer"""
+    scheduler = PollScheduler(in_session_interval=10, market_hours_aware=False)
+    start = datetime(2025, 1, 6, 15, 0)
+    assert sorted(scheduler.due_tickers({"AAA": {}, "BBB": {}}, start)) == ["AAA", "BBB"]
+
+    assert scheduler.due_tickers({"AAA": {}, "CCC": {}}, start + timedelta(seconds=1)) == ["CCC"]
+    assert "BBB" not in scheduler.next_due
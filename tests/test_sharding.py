@@ -0,0 +1,130 @@
+"""
+Tests for sharding the watchlist across bot workers
+"""
+
+from datetime import datetime, timedelta
+
+from api_alert_system.core import alert_bot
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.core.sharding import ShardCoordinator
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.synthetic import SyntheticProvider, make_tickers
+
+TICKERS = make_tickers(200)
+
+
+def owners(workers, now):
+    """Map each ticker to the workers that would poll it"""
+    return {ticker: [w.worker_id for w in workers if w.owns(ticker, now)] for ticker in TICKERS}
+
+
+def settle(workers, now, rounds=3):
+    for _ in range(rounds):
+        for worker in workers:
+            worker.rebalance(now)
+
+
+def test_workers_split_partitions_and_rebalance(sqlite_db):
+    now = datetime(2025, 1, 6, 15, 0, 0)
+    a = ShardCoordinator(sqlite_db(), "a", partitions=16, lease_seconds=30)
+    assert a.start() is True
+    settle([a], now)
+    assert len(a.owned) == 16
+
+    # A second and third worker join; partitions move until each holds a fair share
+    b = ShardCoordinator(sqlite_db(), "b", partitions=16, lease_seconds=30)
+    c = ShardCoordinator(sqlite_db(), "c", partitions=16, lease_seconds=30)
+    b.start()
+    c.start()
+    settle([a, b, c], now)
+    assert sorted(len(w.owned) for w in (a, b, c)) == [4, 6, 6]
+    assert all(len(polled_by) == 1 for polled_by in owners([a, b, c], now).values())
+
+    # c shuts down cleanly: its partitions are handed back and taken over right away
+    c.stop()
+    settle([a, b], now)
+    assert all(len(polled_by) == 1 for polled_by in owners([a, b], now).values())
+
+
+def test_partitions_of_a_crashed_worker_are_taken_over_after_expiry(sqlite_db):
+    now = datetime(2025, 1, 6, 15, 0, 0)
+    a = ShardCoordinator(sqlite_db(), "a", partitions=8, lease_seconds=30)
+    b = ShardCoordinator(sqlite_db(), "b", partitions=8, lease_seconds=30)
+    a.start()
+    b.start()
+    settle([a, b], now)
+    assert len(a.owned) == len(b.owned) == 4
+
+    # b stops heartbeating; until its leases expire nobody else polls its tickers
+    later = now + timedelta(seconds=20)
+    settle([a], later)
+    assert len(a.owned) == 4
+
+    expired = now + timedelta(seconds=31)
+    assert not any(b.owns(ticker, expired) for ticker in TICKERS)
+    settle([a], expired)
+    assert len(a.owned) == 8
+    assert all(polled_by == ["a"] for polled_by in owners([a, b], expired).values())
+
+
+def test_each_ticker_is_fetched_by_exactly_one_bot(sqlite_db, monkeypatch):
+    monkeypatch.setattr(alert_bot, "SHARDING_ENABLED", True)
+    monkeypatch.setattr(alert_bot, "SHARD_PARTITIONS", 8)
+    watchlist = {ticker: {"upper": None, "lower": None} for ticker in TICKERS[:40]}
+    bots, requested = [], []
+    for worker_id in ("w1", "w2"):
+        monkeypatch.setattr(alert_bot, "WORKER_ID", worker_id)
+        provider = SyntheticProvider(seed=1)
+        fetched = []
+        provider.get_quotes = lambda tickers, provider=provider, fetched=fetched: (
+            fetched.extend(tickers) or SyntheticProvider.get_quotes(provider, tickers)
+        )
+        bots.append(AlertBot(
+            watchlist=dict(watchlist),
+            db_manager=sqlite_db(),
+            provider=provider,
+            notifiers=NotifierRegistry([]),
+            metrics=InProcessMetrics()
+        ))
+        requested.append(fetched)
+
+    for _ in range(2):
+        for bot in bots:
+            bot.rebalance_shards()
+    for bot in bots:
+        bot.poll_due_tickers()
+
+    assert not set(requested[0]) & set(requested[1])
+    assert sorted(requested[0] + requested[1]) == sorted(watchlist)
+    assert "alertbot_shard_partitions_owned 4" in bots[0].render_metrics()
+
+
+def test_worker_that_fails_to_join_polls_nothing_and_retries(sqlite_db, monkeypatch):
+    monkeypatch.setattr(alert_bot, "SHARDING_ENABLED", True)
+    monkeypatch.setattr(alert_bot, "SHARD_PARTITIONS", 8)
+    monkeypatch.setattr(alert_bot, "WORKER_ID", "w1")
+    db_manager = sqlite_db()
+    init_shard_tables = db_manager.init_shard_tables
+    monkeypatch.setattr(db_manager, "init_shard_tables", lambda partitions: False)
+    provider = SyntheticProvider(seed=1)
+    fetched = []
+    provider.get_quotes = lambda tickers: fetched.extend(tickers) or SyntheticProvider.get_quotes(provider, tickers)
+    bot = AlertBot(
+        watchlist={ticker: {"upper": None, "lower": None} for ticker in TICKERS[:20]},
+        db_manager=db_manager,
+        provider=provider,
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+
+    # The pool could not be joined: nothing is polled rather than everything
+    assert bot.shards is not None and not bot.shards.owned
+    bot.poll_due_tickers()
+    assert fetched == []
+
+    # The next heartbeat creates the tables and claims the partitions
+    monkeypatch.setattr(db_manager, "init_shard_tables", init_shard_tables)
+    bot.rebalance_shards()
+    assert len(bot.shards.owned) == 8
+    assert bot.shards.owned_tickers(bot.watchlist) == list(bot.watchlist)
@@ -0,0 +1,16 @@
+"""
+Tests that the entry points import without their heavy dependencies
+"""
+
+from benchmarks.startup import measure_import
+
+
+def test_alert_bot_import_defers_heavy_dependencies():
+    """numpy, yfinance/pandas, requests and psycopg2 load when first used, not at import"""
+    result = measure_import("api_alert_system.core.alert_bot")
+    assert not set(result["loaded"]) & {"numpy", "pandas", "yfinance", "requests", "psycopg2"}
+
+
+def test_package_import_is_cheap():
+    result = measure_import("api_alert_system")
+    assert result["loaded"] == []
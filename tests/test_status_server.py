@@ -0,0 +1,107 @@
+"""
+Tests for the /metrics and /healthz status endpoint
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+from benchmarks.support import SQLiteDatabaseManager
+
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.core.status_server import StatusServer
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.synthetic import SyntheticProvider
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+def test_prometheus_exposition():
+    metrics = InProcessMetrics()
+    metrics.increment("notify.sent", tags={"notifier": "ntfy"})
+    metrics.gauge("stream.queue_depth", 3)
+    metrics.timing("stage.seconds", 0.25, {"stage": "fetch"})
+
+    text = metrics.prometheus()
+    assert '# TYPE alertbot_notify_sent_total counter' in text
+    assert 'alertbot_notify_sent_total{notifier="ntfy"} 1' in text
+    assert 'alertbot_stream_queue_depth 3' in text
+    assert 'alertbot_stage_seconds{stage="fetch",quantile="0.99"} 0.25' in text
+    assert 'alertbot_stage_seconds_count{stage="fetch"} 1' in text
+
+
+def test_status_endpoint_serves_metrics_and_health():
+    """/metrics reflects the last cycle and /healthz fails once cycles stop"""
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 500, "lower": 10}},
+        db_manager=db_manager,
+        provider=SyntheticProvider({"AAA": 100}, seed=1),
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+    bot.check_prices_and_send_alerts()
+    server = StatusServer(bot.render_metrics, bot.check_health, host="127.0.0.1", port=0)
+    url = f"http://127.0.0.1:{server.port}"
+    try:
+        status, body = get(f"{url}/metrics")
+        assert status == 200
+        assert 'alertbot_stage_seconds_count{stage="fetch"} 1' in body
+        assert "alertbot_db_connections 1" in body
+        assert "alertbot_cycle_last_success_age_seconds" in body
+
+        status, body = get(f"{url}/healthz")
+        assert status == 200 and json.loads(body)["status"] == "ok"
+
+        bot.started_at -= 3600
+        bot.last_cycle_at -= 3600
+        status, body = get(f"{url}/healthz")
+        assert status == 503 and json.loads(body)["last_cycle_age"] >= 3600
+
+        assert get(f"{url}/missing")[0] == 404
+    finally:
+        server.close()
+        db_manager.disconnect()
+
+
+class FailingProvider(SyntheticProvider):
+    """Synthetic provider whose every fetch fails"""
+
+    def get_quotes(self, tickers):
+        return {ticker: None for ticker in tickers}
+
+
+def test_health_fails_when_every_fetch_fails():
+    """Idle scheduler ticks do not hide cycles that fetched nothing"""
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 500, "lower": 10}},
+        db_manager=db_manager,
+        provider=FailingProvider({"AAA": 100}, seed=1),
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+    bot.started_at -= 3600
+    bot.poll_due_tickers()
+    bot.poll_due_tickers()
+    assert bot.last_cycle_at is None and bot.last_idle_at is not None
+
+    healthy, details = bot.check_health()
+    assert healthy is False
+    assert details["last_cycle_age"] is None
+
+    # A later successful cycle makes idle ticks count again
+    bot.stock_monitor.provider = SyntheticProvider({"AAA": 100}, seed=1)
+    bot.check_prices_and_send_alerts()
+    bot.poll_due_tickers()
+    assert bot.check_health()[0] is True
+    db_manager.disconnect()
@@ -0,0 +1,68 @@
+"""
+Tests for StockMonitor threshold checks and price messages
+"""
+
+from datetime import datetime, timedelta
+
+from api_alert_system.core.stock_monitor import StockMonitor
+
+
+def test_check_all_thresholds():
+    """Prices outside the thresholds produce alerts"""
+    monitor = StockMonitor()
+    watchlist = {"AAPL": {"upper": 200.0, "lower": 150.0}, "TSLA": {"upper": 300.0, "lower": 200.0}}
+    prices = {"AAPL": 210.0, "TSLA": 250.0}
+
+    assert monitor.check_all_thresholds(watchlist, prices) == {"AAPL": ["UPPER"]}
+
+
+def test_delta_message_only_includes_moved_tickers():
+    """Delta mode skips tickers that moved less than the configured percentage"""
+    monitor = StockMonitor(delta_percent=1.0, full_snapshot_interval=300)
+    start = datetime(2025, 1, 6, 15, 0, 0)
+
+    first = monitor.format_price_message({"AAPL": 100.0, "TSLA": 200.0}, start, delta=True)
+    assert "Stock Price Update" in first
+    monitor.mark_sent()
+
+    second = monitor.format_price_message({"AAPL": 100.5, "TSLA": 210.0}, start + timedelta(seconds=10), delta=True)
+    assert "Stock Price Changes" in second
+    assert "TSLA" in second
+    assert "AAPL" not in second
+    monitor.mark_sent()
+
+    third = monitor.format_price_message({"AAPL": 100.5, "TSLA": 210.0}, start + timedelta(seconds=20), delta=True)
+    assert third == ""
+
+
+def test_delta_message_sends_periodic_snapshot():
+    """Delta mode falls back to a full snapshot once the interval has elapsed"""
+    monitor = StockMonitor(delta_tick=1.0, full_snapshot_interval=60)
+    start = datetime(2025, 1, 6, 15, 0, 0)
+
+    monitor.format_price_message({"AAPL": 100.0}, start, delta=True)
+    monitor.mark_sent()
+    assert monitor.format_price_message({"AAPL": 100.0}, start + timedelta(seconds=30), delta=True) == ""
+
+    snapshot = monitor.format_price_message({"AAPL": 100.0}, start + timedelta(seconds=60), delta=True)
+    assert "Stock Price Update" in snapshot
+    assert "AAPL" in snapshot
+
+
+def test_unsent_price_message_keeps_the_delta_baseline():
+    """A message that failed to go out is not treated as sent"""
+    monitor = StockMonitor(delta_tick=1.0, full_snapshot_interval=300)
+    start = datetime(2025, 1, 6, 15, 0, 0)
+
+    monitor.format_price_message({"AAPL": 100.0}, start, delta=True)
+    # Nothing was sent, so the next message is still a full snapshot
+    retry = monitor.format_price_message({"AAPL": 100.0}, start + timedelta(seconds=10), delta=True)
+    assert "Stock Price Update" in retry
+    monitor.mark_sent()
+
+    moved = monitor.format_price_message({"AAPL": 105.0}, start + timedelta(seconds=20), delta=True)
+    assert "AAPL" in moved
+    # The move was never delivered, so it is reported again against the last sent price
+    again = monitor.format_price_message({"AAPL": 105.0}, start + timedelta(seconds=30), delta=True)
+    assert "+5.00%" in again
+    assert monitor.last_sent_prices == {"AAPL": 100.0}
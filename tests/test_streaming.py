@@ -0,0 +1,84 @@
+"""
+Tests for streaming quote ingestion
+"""
+
+import asyncio
+from datetime import datetime
+
+from api_alert_system.core.models import Quote
+from api_alert_system.core.stock_monitor import StockMonitor
+from api_alert_system.core.streaming import StreamingAlertEngine
+from api_alert_system.core.subscriptions import RuleStore, Subscriptions
+from api_alert_system.providers.feed import FeedServer, TCPFeedProvider, decode_quote, encode_quote
+
+WATCHLIST = {"AAPL": {"upper": 200, "lower": 180}}
+
+
+def test_feed_line_round_trip():
+    """Quotes survive encoding to and decoding from the wire format"""
+    quote = Quote("AAPL", 191.25, datetime(2025, 1, 6, 15, 0, 0))
+    decoded = decode_quote(encode_quote(quote))
+    assert (decoded.ticker, decoded.price, decoded.timestamp) == ("AAPL", 191.25, quote.timestamp)
+
+
+def test_engine_alerts_on_breach_transitions_only():
+    """A ticker staying in breach alerts once, and again after it recovers"""
+    engine = StreamingAlertEngine(StockMonitor(demo_mode=True), WATCHLIST, on_alerts=lambda events: None)
+    prices = [190, 201, 205, 195, 202, 179]
+    alerts = [[e.alert_type for e in engine.evaluate(Quote("AAPL", p))] for p in prices]
+    assert alerts == [[], ["UPPER"], [], [], ["UPPER"], ["LOWER"]]
+    assert engine.ticks_processed == len(prices)
+    assert list(engine.take_updates()) == ["AAPL"]
+    assert engine.take_updates() == {}
+
+
+def test_subscribers_are_alerted_on_their_own_breach_transitions():
+    """Each user alerts once per rule a ticker moves into, whatever the other users' rules do"""
+    rules = RuleStore()
+    rules.add("alice", "AAPL", upper=200)
+    rules.add("bob", "AAPL", upper=210, lower=180)
+    engine = StreamingAlertEngine(StockMonitor(demo_mode=True), {}, on_alerts=lambda events: None,
+                                  subscriptions=Subscriptions(rules))
+    prices = [190, 201, 211, 205, 212, 195, 179]
+    alerts = [
+        {user: [(e.alert_type, e.threshold) for e in events]
+         for user, events in engine.evaluate_subscriptions(Quote("AAPL", p)).items()}
+        for p in prices
+    ]
+    assert alerts == [
+        {},
+        {"alice": [("UPPER", 200)]},
+        {"bob": [("UPPER", 210)]},
+        {},
+        {"bob": [("UPPER", 210)]},
+        {},
+        {"bob": [("LOWER", 180)]},
+    ]
+
+
+def test_pushed_quotes_are_checked_per_tick():
+    """Quotes pushed over the TCP feed are evaluated as they arrive"""
+    received = []
+
+    async def scenario():
+        server = await FeedServer().start()
+        provider = TCPFeedProvider(server.host, server.port)
+        engine = StreamingAlertEngine(StockMonitor(demo_mode=True), WATCHLIST, on_alerts=received.extend)
+        task = asyncio.create_task(engine.run(provider, ["AAPL"]))
+        try:
+            await server.wait_for_subscriber()
+            for price in (190.0, 201.0, 202.0, 179.0):
+                await server.publish(Quote("AAPL", price))
+            for _ in range(100):
+                if engine.ticks_processed == 4:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+            await server.stop()
+        return engine
+
+    engine = asyncio.run(scenario())
+    assert engine.ticks_processed == 4
+    assert [(e.alert_type, e.price) for e in received] == [("UPPER", 201.0), ("LOWER", 179.0)]
+    assert engine.latest["AAPL"].price == 179.0
@@ -0,0 +1,192 @@
+"""
+Tests for per-user subscriptions, the indexed rule store and alert routing
+"""
+
+import asyncio
+import random
+
+from tests.conftest import CountingProvider, RecordingNotifier
+
+from api_alert_system.core import alert_bot
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.core.models import Quote
+from api_alert_system.core.stock_monitor import StockMonitor
+from api_alert_system.core.subscriptions import RuleStore, Subscriptions
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.base import QuoteProvider
+from api_alert_system.providers.synthetic import SyntheticProvider
+
+
+def test_rule_store_matches_brute_force():
+    """Bisection finds exactly the rules a linear scan would"""
+    rng = random.Random(7)
+    store = RuleStore()
+    rules = {}
+    for i in range(2000):
+        user, ticker = f"u{i % 500}", rng.choice(["AAA", "BBB", "CCC"])
+        upper = rng.choice([None, round(rng.uniform(90, 110), 1)])
+        lower = rng.choice([None, round(rng.uniform(90, 110), 1)])
+        store.add(user, ticker, upper, lower)
+        rules[(user, ticker)] = (upper, lower)
+    for key in rng.sample(sorted(rules), 300):
+        assert store.remove(*key)
+        del rules[key]
+
+    monitor = StockMonitor(demo_mode=True)
+    for ticker in ("AAA", "BBB", "CCC", "ZZZ"):
+        for price in (85.0, 95.5, 100.0, 104.3, 115.0):
+            expected = sorted(
+                (user, alert_type, upper if alert_type == "UPPER" else lower)
+                for (user, rule_ticker), (upper, lower) in rules.items() if rule_ticker == ticker
+                for alert_type in monitor.check_thresholds(ticker, price, {"upper": upper, "lower": lower})
+            )
+            assert sorted(store.match(ticker, price)) == expected
+    assert len(store) == len(rules)
+
+
+def test_events_are_shared_and_routed_per_channel():
+    rules = RuleStore()
+    rules.add("alice", "AAA", upper=100)
+    rules.add("bob", "AAA", upper=100, lower=50)
+    rules.add("carol", "AAA", upper=150)
+    subscriptions = Subscriptions(rules, {"alice": {"recording": "chat-a", "ntfy": "topic-a"}, "bob": {"recording": ""}})
+
+    by_user = subscriptions.build_alert_events({"AAA": 120.0, "BBB": None})
+    assert set(by_user) == {"alice", "bob"}
+    assert by_user["alice"][0] is by_user["bob"][0]
+    assert subscriptions.routes(by_user) == [
+        ("recording", "chat-a", by_user["alice"]),
+        ("ntfy", "topic-a", by_user["alice"]),
+    ]
+
+    notifier = RecordingNotifier()
+    registry = NotifierRegistry([notifier])
+    # Only the loaded channel is delivered; the ntfy route is skipped
+    assert registry.deliver_routed(subscriptions.routes(by_user)) == 1
+    assert notifier.routed == [("chat-a", by_user["alice"])]
+    assert registry.routed("recording", "chat-a") is registry.routed("recording", "chat-a")
+
+
+def test_fetch_cost_scales_with_symbols_not_users(sqlite_db):
+    """A thousand users on three symbols cost three fetches and one send per user"""
+    db_manager = sqlite_db()
+    for i in range(1000):
+        db_manager.upsert_subscriber(f"user{i}", {"recording": f"chat{i}"})
+        db_manager.upsert_subscription(f"user{i}", ["AAA", "BBB", "CCC"][i % 3], upper=1.0)
+    notifier = RecordingNotifier()
+    provider = CountingProvider({"AAA": 100, "BBB": 50, "CCC": 20}, seed=1)
+
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 500, "lower": 10}},
+        db_manager=db_manager,
+        provider=provider,
+        notifiers=NotifierRegistry([notifier]),
+        metrics=InProcessMetrics()
+    )
+    assert sorted(bot.watchlist) == ["AAA", "BBB", "CCC"]
+    bot.check_prices_and_send_alerts()
+
+    assert sorted(provider.requested) == ["AAA", "BBB", "CCC"]
+    assert sorted(destination for destination, _ in notifier.routed) == sorted(f"chat{i}" for i in range(1000))
+    assert bot.metrics.snapshot()["counters"]["alerts.routed"] == 1000
+
+
+def test_nearest_thresholds_come_from_the_sorted_index():
+    rules = RuleStore()
+    rules.add("alice", "AAA", upper=120, lower=80)
+    rules.add("bob", "AAA", upper=105, lower=95)
+    rules.add("carol", "AAA", upper=150)
+    assert rules.nearest("AAA") == {"upper": 105, "lower": 95}
+    assert rules.nearest("ZZZ") == {"upper": None, "lower": None}
+
+
+def test_subscriber_thresholds_shorten_adaptive_intervals(sqlite_db, monkeypatch):
+    """A subscriber-only ticker near a user's threshold is not left at the maximum interval"""
+    monkeypatch.setattr(alert_bot, "ADAPTIVE_POLLING", True)
+    db_manager = sqlite_db()
+    db_manager.upsert_subscriber("alice", {"recording": "chat-a"})
+    db_manager.upsert_subscription("alice", "BBB", upper=1000.0)
+    db_manager.upsert_subscription("alice", "CCC", upper=50.5)
+    bot = AlertBot(
+        watchlist={},
+        db_manager=db_manager,
+        provider=SyntheticProvider({"BBB": 50, "CCC": 50}, seed=1),
+        notifiers=NotifierRegistry([RecordingNotifier()]),
+        metrics=InProcessMetrics()
+    )
+    for _ in range(30):
+        bot.stock_monitor.record_price("CCC", 50.0)
+        bot.stock_monitor.record_price("CCC", 50.1)
+    bot.check_prices_and_send_alerts()
+
+    assert bot._nearest_thresholds("CCC", bot.watchlist["CCC"]) == {"upper": 50.5, "lower": None}
+    assert bot.scheduler.intervals["CCC"] < alert_bot.ADAPTIVE_MAX_INTERVAL
+
+
+def test_subscription_edits_are_picked_up_without_restart(sqlite_db):
+    db_manager = sqlite_db()
+    db_manager.upsert_subscriber("alice", {"recording": "chat-a"})
+    db_manager.upsert_subscription("alice", "AAA", upper=1.0)
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 500, "lower": 10}},
+        db_manager=db_manager,
+        provider=SyntheticProvider({"AAA": 100, "BBB": 50}, seed=1),
+        notifiers=NotifierRegistry([RecordingNotifier()]),
+        metrics=InProcessMetrics()
+    )
+    bot.sync_subscriptions()
+    assert sorted(bot.watchlist) == ["AAA"]
+
+    editor_db = sqlite_db()
+    editor_db.upsert_subscriber("bob", {"recording": "chat-b"})
+    editor_db.upsert_subscription("bob", "BBB", lower=60.0)
+    bot.sync_subscriptions()
+    assert sorted(bot.watchlist) == ["AAA", "BBB"]
+    assert bot.subscriptions.channels["bob"] == {"recording": "chat-b"}
+    assert "BBB" in bot.scheduler.next_due
+
+    # Dropping the last subscription stops polling the subscriber-only ticker, not the watchlist one
+    editor_db.remove_subscription("bob", "BBB")
+    editor_db.remove_subscription("alice", "AAA")
+    bot.sync_subscriptions()
+    assert sorted(bot.watchlist) == ["AAA"]
+    assert "BBB" not in bot.scheduler.next_due
+
+
+class ScriptedStreamProvider(QuoteProvider):
+    """Streams a fixed list of quotes and then ends"""
+
+    name = "scripted"
+
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    def get_quote(self, ticker):
+        return None
+
+    async def stream(self, tickers, interval=1.0):
+        for quote in self.quotes:
+            if quote.ticker in tickers:
+                yield quote
+
+
+def test_streaming_alerts_subscribers_on_breach(sqlite_db):
+    """In stream mode a subscriber-only ticker is streamed and its users' rules are checked per tick"""
+    db_manager = sqlite_db()
+    db_manager.upsert_subscriber("alice", {"recording": "chat-a"})
+    db_manager.upsert_subscription("alice", "BBB", upper=60.0)
+    notifier = RecordingNotifier()
+    bot = AlertBot(
+        watchlist={},
+        db_manager=db_manager,
+        provider=ScriptedStreamProvider([Quote("BBB", price) for price in (50.0, 61.0, 62.0, 55.0, 63.0)]),
+        notifiers=NotifierRegistry([notifier]),
+        metrics=InProcessMetrics()
+    )
+    asyncio.run(bot.run_streaming())
+
+    assert [(destination, [e.price for e in events]) for destination, events in notifier.routed] == [
+        ("chat-a", [61.0]), ("chat-a", [63.0])
+    ]
+    assert bot.metrics.snapshot()["counters"]["alerts.routed"] == 2
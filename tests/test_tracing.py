@@ -0,0 +1,178 @@
+"""
+Tests for per-cycle tracing
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from benchmarks.support import SQLiteDatabaseManager
+
+from api_alert_system.core import stock_monitor
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.core.models import Quote
+from api_alert_system.core.tracing import (
+    NON_RECORDING_SPAN, FileSpanExporter, InMemorySpanExporter, Tracer, format_trace, load_traces
+)
+from api_alert_system.notifications.base import BaseNotifier
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.base import QuoteProvider
+
+
+class PerTickerProvider(QuoteProvider):
+    """Fetches one ticker at a time and has no price for MISSING"""
+
+    name = "per-ticker"
+
+    def get_quote(self, ticker):
+        return None if ticker == "MISSING" else Quote(ticker, 100.0)
+
+
+class Notifier(BaseNotifier):
+    def __init__(self, name, succeed):
+        super().__init__()
+        self.name = name
+        self.succeed = succeed
+
+    def send_message(self, message):
+        return self.succeed
+
+
+class StubSpan:
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.attributes["exception"] = repr(exception)
+
+    def is_recording(self):
+        return True
+
+
+class OTelStyleTracer:
+    """Has OpenTelemetry's signature, where the second positional argument is the parent context"""
+
+    def __init__(self):
+        self.spans = []
+        self._current = contextvars.ContextVar("stub_span", default=None)
+
+    @contextmanager
+    def start_as_current_span(self, name, context=None, kind=None, attributes=None, links=None,
+                              start_time=None, record_exception=True, set_status_on_exception=True,
+                              end_on_exit=True):
+        span = StubSpan(name, context if context is not None else self._current.get(), attributes)
+        self.spans.append(span)
+        token = self._current.set(span)
+        try:
+            yield span
+        finally:
+            self._current.reset(token)
+
+    def get_current_span(self):
+        return self._current.get() or NON_RECORDING_SPAN
+
+
+def test_spans_nest_and_record_exceptions():
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter)
+    try:
+        with tracer.start_as_current_span("root") as root:
+            with tracer.start_as_current_span("child", attributes={"ticker": "AAA"}):
+                raise ValueError("boom")
+    except ValueError:
+        pass
+
+    child, parent = exporter.get_finished_spans()
+    assert parent is root and child.parent_id == root.span_id and child.trace_id == root.trace_id
+    assert child.status == "ERROR" and child.attributes["exception.message"] == "boom"
+    assert child.attributes["ticker"] == "AAA"
+
+
+def test_disabled_tracer_records_nothing():
+    with Tracer().start_as_current_span("root") as span:
+        span.set_attribute("ignored", True)
+    assert not span.is_recording()
+
+
+def test_poll_cycle_produces_one_trace(tmp_path):
+    """Each cycle is one trace with spans per ticker fetch, DB batch and notifier send"""
+    path = str(tmp_path / "traces.jsonl")
+    tracer = Tracer(FileSpanExporter(path))
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    notifiers = NotifierRegistry([Notifier("good", True), Notifier("bad", False)])
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 50, "lower": 10}, "MISSING": {"upper": 50, "lower": 10}},
+        db_manager=db_manager,
+        provider=PerTickerProvider(),
+        notifiers=notifiers,
+        metrics=InProcessMetrics(),
+        tracer=tracer
+    )
+
+    bot.check_prices_and_send_alerts()
+    bot.check_prices_and_send_alerts()
+    notifiers.close()
+    db_manager.disconnect()
+    tracer.shutdown()
+
+    traces = load_traces(path)
+    assert len(traces) == 2
+    spans = next(iter(traces.values()))
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+
+    (root,) = by_name["poll_cycle"]
+    assert root["parent_span_id"] is None and root["attributes"] == {"tickers": 2, "prices": 1}
+    fetches = {span["attributes"]["ticker"]: span["attributes"]["outcome"] for span in by_name["fetch_ticker"]}
+    assert fetches == {"AAA": "ok", "MISSING": "missing"}
+    assert by_name["db_insert"][0]["attributes"] == {"rows": 1, "outcome": "ok"}
+    sends = {(span["attributes"]["notifier"], span["attributes"]["outcome"]) for span in by_name["notify"]}
+    assert sends == {("good", "ok"), ("bad", "failed")}
+    # Notifier sends run on worker threads but still belong to the cycle's trace
+    stages = {span["span_id"]: span["name"] for span in spans}
+    assert {stages[span["parent_span_id"]] for span in by_name["notify"]} == {"notify_prices", "notify_alerts"}
+
+    tree = format_trace(spans)
+    assert tree.startswith("poll_cycle") and "ticker=MISSING" in tree
+
+
+def test_poll_cycle_nests_under_an_opentelemetry_style_tracer(monkeypatch):
+    """Attributes go by keyword, so an OpenTelemetry tracer doesn't take them for the parent context"""
+    tracer = OTelStyleTracer()
+    monkeypatch.setattr(stock_monitor, "get_current_span", tracer.get_current_span)
+    db_manager = SQLiteDatabaseManager()
+    db_manager.connect()
+    notifiers = NotifierRegistry([Notifier("good", True)])
+    bot = AlertBot(
+        watchlist={"AAA": {"upper": 50, "lower": 10}},
+        db_manager=db_manager,
+        provider=PerTickerProvider(),
+        notifiers=notifiers,
+        metrics=InProcessMetrics(),
+        tracer=tracer
+    )
+
+    bot.check_prices_and_send_alerts()
+    notifiers.close()
+    db_manager.disconnect()
+
+    assert all(span.parent is None or isinstance(span.parent, StubSpan) for span in tracer.spans)
+    by_name = {}
+    for span in tracer.spans:
+        by_name.setdefault(span.name, []).append(span)
+    (root,) = by_name["poll_cycle"]
+    assert root.parent is None and root.attributes == {"tickers": 1, "prices": 1}
+    (fetch,) = by_name["fetch_ticker"]
+    assert fetch.parent.name == "fetch" and fetch.parent.parent is root
+    assert fetch.attributes == {"ticker": "AAA", "provider": "per-ticker", "outcome": "ok"}
+    assert by_name["db_insert"][0].parent is root and by_name["db_insert"][0].attributes["rows"] == 1
+    assert {span.parent.name for span in by_name["notify"]} == {"notify_prices", "notify_alerts"}
+    assert all(span.attributes["notifier"] == "good" and span.attributes["outcome"] == "ok"
+               for span in by_name["notify"])
@@ -0,0 +1,117 @@
+"""
+Tests for the database-backed watchlist and hot reload
+"""
+
+import asyncio
+
+from api_alert_system.core.alert_bot import AlertBot
+from api_alert_system.core.metrics import InProcessMetrics
+from api_alert_system.core.stock_monitor import StockMonitor
+from api_alert_system.core.streaming import StreamingAlertEngine
+from api_alert_system.core.watchlist import WatchlistSync
+from api_alert_system.notifications.registry import NotifierRegistry
+from api_alert_system.providers.synthetic import SyntheticProvider
+from api_alert_system.utils.config import WATCHLIST
+
+
+def test_sync_applies_only_new_edits(sqlite_db):
+    """A second process's edits arrive as changed and removed tickers"""
+    bot_db, editor_db = sqlite_db(), sqlite_db()
+    watchlist = {}
+    sync = WatchlistSync(bot_db, watchlist)
+    assert sync.load(seed={"AAA": {"upper": 110, "lower": 90}, "BBB": {"upper": 60, "lower": 40}})
+    assert set(watchlist) == {"AAA", "BBB"} and sync.version == 1
+    assert sync.poll() == ({}, [])
+
+    assert editor_db.upsert_watchlist_entry("CCC", {"upper": 20, "lower": None})
+    assert editor_db.upsert_watchlist_entry("AAA", {"upper": 120, "lower": 90})
+    assert editor_db.remove_watchlist_entry("BBB")
+    changed, removed = sync.poll()
+    assert changed == {"CCC": {"upper": 20, "lower": None}, "AAA": {"upper": 120, "lower": 90}}
+    assert removed == ["BBB"]
+    assert watchlist == changed and sync.version == 4
+
+    # Re-adding a removed ticker revives it, and a fresh load skips tombstones
+    assert editor_db.upsert_watchlist_entry("BBB", {"upper": 70, "lower": 40})
+    assert sync.poll() == ({"BBB": {"upper": 70, "lower": 40}}, [])
+    fresh = {}
+    assert WatchlistSync(editor_db, fresh).load(seed={"ZZZ": {"upper": 1, "lower": None}})
+    assert fresh == watchlist
+
+
+def test_bot_picks_up_edits_without_restart(sqlite_db):
+    """Tickers added in the database get polled right away; removed ones stop"""
+    bot = AlertBot(
+        db_manager=sqlite_db(),
+        provider=SyntheticProvider(seed=1),
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+    assert bot.watchlist == WATCHLIST and bot.watchlist is not WATCHLIST
+    bot.scheduler.due_tickers(bot.watchlist)
+
+    editor_db = sqlite_db()
+    editor_db.upsert_watchlist_entry("NEW", {"upper": 500, "lower": 10})
+    editor_db.remove_watchlist_entry("AAPL")
+    bot.sync_watchlist()
+
+    assert "NEW" in bot.watchlist and "AAPL" not in bot.watchlist
+    assert "AAPL" not in bot.scheduler.next_due
+    assert bot.scheduler.due_tickers(bot.watchlist) == ["NEW"]
+    assert bot.metrics.snapshot()["counters"]["watchlist.changes"] == 2
+
+
+def test_stream_resubscribes_to_added_tickers():
+    """The engine restarts its provider stream with the new ticker list"""
+    async def scenario():
+        engine = StreamingAlertEngine(StockMonitor(demo_mode=True), {"AAA": {}}, on_alerts=lambda events: None)
+        task = asyncio.create_task(engine.run(SyntheticProvider(seed=1), ["AAA"], interval=0.01))
+        try:
+            while engine.ticks_processed == 0:
+                await asyncio.sleep(0.01)
+            engine.resubscribe(["AAA", "BBB"])
+            for _ in range(200):
+                if "BBB" in engine.latest:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+        return engine
+
+    engine = asyncio.run(scenario())
+    assert engine.tickers == ["AAA", "BBB"] and "BBB" in engine.latest
+
+
+def test_stream_drops_removed_tickers(sqlite_db):
+    """Removing a ticker resubscribes the stream and stops publishing its prices"""
+    db_manager = sqlite_db()
+    db_manager.seed_watchlist({"AAA": {"upper": None, "lower": None}, "BBB": {"upper": None, "lower": None}})
+    bot = AlertBot(
+        db_manager=db_manager,
+        provider=SyntheticProvider(seed=1),
+        notifiers=NotifierRegistry([]),
+        metrics=InProcessMetrics()
+    )
+    published = []
+    bot.stock_monitor.format_price_message = lambda prices, *args, **kwargs: published.append(set(prices))
+
+    async def scenario():
+        engine = StreamingAlertEngine(bot.stock_monitor, bot.watchlist, on_alerts=lambda events: None)
+        bot.stream_engine = engine
+        task = asyncio.create_task(engine.run(SyntheticProvider(seed=1), ["AAA", "BBB"], interval=0.01))
+        try:
+            while "BBB" not in engine.latest:
+                await asyncio.sleep(0.01)
+            sqlite_db().remove_watchlist_entry("BBB")
+            bot.sync_watchlist()
+            await asyncio.sleep(0.05)
+            engine.take_updates()
+            await asyncio.sleep(0.05)
+            await bot._publish_stream_prices(engine)
+        finally:
+            task.cancel()
+        return engine
+
+    engine = asyncio.run(scenario())
+    assert engine.tickers == ["AAA"]
+    assert published == [{"AAA"}]
@@ -0,0 +1,95 @@
+"""
+Tests for the webhook notifier against a local stand-in HTTP server
+"""
+
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api_alert_system.notifications.webhook import SIGNATURE_HEADER, WebhookNotifier, verify_signature
+
+SECRET = "test-secret"
+
+
+@pytest.fixture
+def webhook_server():
+    """Run a local HTTP server that records every request it receives"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, dict(self.headers), body))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", received
+    server.shutdown()
+    server.server_close()
+
+
+def test_events_are_batched_compressed_and_signed(webhook_server):
+    """Each batch is one gzip request signed with the shared secret"""
+    base_url, received = webhook_server
+    notifier = WebhookNotifier([f"{base_url}/hook"], secret=SECRET, batch_size=2)
+
+    events = [{"type": "alert", "ticker": f"T{i}"} for i in range(5)]
+    assert notifier.send_events(events)
+    notifier.close()
+
+    assert len(received) == 3
+    batches = []
+    for path, headers, body in received:
+        assert path == "/hook"
+        assert headers["Content-Encoding"] == "gzip"
+        assert verify_signature(body, SECRET, headers[SIGNATURE_HEADER])
+        batches.append(json.loads(gzip.decompress(body))["events"])
+
+    assert sorted(len(batch) for batch in batches) == [1, 2, 2]
+    assert sorted(event["ticker"] for batch in batches for event in batch) == [f"T{i}" for i in range(5)]
+
+
+def test_events_fan_out_to_every_endpoint(webhook_server):
+    """A batch is delivered once to each configured endpoint"""
+    base_url, received = webhook_server
+    notifier = WebhookNotifier([f"{base_url}/a", f"{base_url}/b"], use_gzip=False)
+
+    assert notifier.send_events([{"type": "alert", "ticker": "AAPL"}])
+    notifier.close()
+
+    assert sorted(path for path, _, _ in received) == ["/a", "/b"]
+    assert json.loads(received[0][2])["events"] == [{"type": "alert", "ticker": "AAPL"}]
+
+
+def test_failed_endpoint_reports_failure(webhook_server):
+    """Delivery fails when an endpoint cannot be reached"""
+    base_url, _ = webhook_server
+    notifier = WebhookNotifier([f"{base_url}/ok", "http://127.0.0.1:9/unreachable"], timeout=1)
+
+    assert not notifier.send_alert("AAPL above 200")
+    notifier.close()
+
+
+def test_each_thread_gets_its_own_session():
+    """Worker threads never share a requests.Session"""
+    notifier = WebhookNotifier(["http://127.0.0.1:9/hook"])
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(notifier._get_session())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 3
+    assert notifier._get_session() is notifier._get_session()
+    notifier.close()
+    assert notifier._sessions == []